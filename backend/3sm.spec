@@ -36,6 +36,10 @@ hidden_imports = (
         "uvicorn.lifespan.on",
         "email.mime.text",
         "email.mime.multipart",
+        # Imported lazily by the ledger export's Parquet format
+        "pyarrow",
+        "pyarrow.parquet",
+        "pyarrow._parquet",
     ]
 )
 
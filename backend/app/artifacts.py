@@ -0,0 +1,136 @@
+"""
+Content-addressed on-disk cache for generated export files (XLSX, PDF).
+
+An artifact's name is a hash of everything that determines its bytes: the
+company, what was exported, the currency and the company's data version (plus
+the scenario config for forecasts). A repeat request for the same pack is a
+file send. Concurrent requests for the same artifact render it once; the
+others wait on a per-key lock and get the finished file. Files are evicted
+least recently used first once the directory exceeds its size budget.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from .database import get_data_dir
+
+# Bump when export layout changes so old artifacts are never served
+ARTIFACT_FORMAT = 1
+
+CACHE_DIR = Path(os.getenv("EXPORT_CACHE_DIR", get_data_dir() / "export_cache"))
+# 0 disables the cache; exports are then rendered per request
+MAX_BYTES = int(float(os.getenv("EXPORT_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+_key_locks: dict = {}
+_key_locks_lock = threading.Lock()
+_evict_lock = threading.Lock()
+
+enabled = MAX_BYTES > 0
+
+
+def artifact_key(**parts) -> str:
+    """Stable hash of the inputs that determine an artifact's contents."""
+    payload = json.dumps({"format": ARTIFACT_FORMAT, **parts}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _path(key: str, suffix: str) -> Path:
+    return CACHE_DIR / f"{key}{suffix}"
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _key_locks_lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def lookup(key: str, suffix: str) -> Optional[Path]:
+    """Path of a cached artifact (marked as recently used), or None."""
+    path = _path(key, suffix)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def get_or_create(key: str, suffix: str, render: Callable) -> Tuple[Path, bool]:
+    """
+    Return (path, was_cached) for an artifact, rendering it on a miss.
+
+    `render(fileobj)` writes the artifact into a binary file. It is written to
+    a temp file in the cache directory and renamed into place, so readers
+    never see a partial artifact.
+    """
+    path = lookup(key, suffix)
+    if path is not None:
+        return path, True
+    try:
+        with _lock_for(key):
+            path = lookup(key, suffix)
+            if path is not None:
+                return path, True
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    render(f)
+                os.replace(tmp_name, _path(key, suffix))
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+            return _path(key, suffix), False
+    finally:
+        with _key_locks_lock:
+            _key_locks.pop(key, None)
+
+
+def temp_path() -> str:
+    """A fresh temp file in the cache directory, for artifacts rendered elsewhere."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    os.close(fd)
+    return tmp_name
+
+
+def adopt(key: str, suffix: str, tmp_name: str) -> Path:
+    """Move a finished temp_path() file into the cache under `key`."""
+    path = _path(key, suffix)
+    os.replace(tmp_name, path)
+    return path
+
+
+def evict(max_bytes: int = None) -> int:
+    """Delete least recently used artifacts until the cache fits `max_bytes`; returns files removed."""
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    if not CACHE_DIR.exists():
+        return 0
+    with _evict_lock:
+        files = []
+        for entry in os.scandir(CACHE_DIR):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, file_path in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                os.unlink(file_path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+
+def remove_stale_temp_files() -> None:
+    """Clear temp files left by renders interrupted by a crash or shutdown."""
+    if CACHE_DIR.exists():
+        for entry in os.scandir(CACHE_DIR):
+            if entry.name.endswith(".tmp"):
+                os.unlink(entry.path)
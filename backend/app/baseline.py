@@ -0,0 +1,71 @@
+"""
+Statistical baseline fitted from a company's monthly history.
+
+Every master account's monthly series is a column of one (months × accounts)
+matrix, so trend and month-of-year seasonality are fitted for all accounts in
+a single least-squares solve and extrapolated with one matrix product.
+"""
+import numpy as np
+
+# Full years of history needed before month-of-year seasonality is fitted
+MIN_SEASONS = 2
+
+
+def month_index(d) -> int:
+    """Months since year 0, so consecutive month-ends differ by exactly 1."""
+    return d.year * 12 + d.month - 1
+
+
+def design_matrix(months: np.ndarray, seasonal: bool) -> np.ndarray:
+    """Regressors: intercept, linear trend and (optionally) 11 month-of-year dummies."""
+    columns = [np.ones(len(months)), months.astype(np.float64)]
+    if seasonal:
+        month_of_year = months % 12
+        columns += [(month_of_year == m).astype(np.float64) for m in range(1, 12)]
+    return np.column_stack(columns)
+
+
+def fit(history: np.ndarray, months: np.ndarray, horizon: int) -> dict:
+    """
+    Fit every column of `history` (months × accounts) and extrapolate `horizon` months.
+
+    `months` holds the month_index of each row. Seasonality is included once
+    there are MIN_SEASONS years of history, a linear trend once there are
+    three months, and with less than that the series mean is carried forward.
+    Returns the method, the (horizon × accounts) forecast and in-sample fitted
+    values.
+    """
+    span = int(months[-1] - months[0]) + 1 if len(months) else 0
+    future = np.arange(1, horizon + 1) + (months[-1] if len(months) else 0)
+
+    if len(months) < 3:
+        level = history.mean(axis=0) if len(months) else np.zeros(history.shape[1])
+        return {
+            "method": "mean",
+            "forecast": np.tile(level, (horizon, 1)),
+            "fitted": np.tile(level, (len(months), 1)),
+        }
+
+    seasonal = span >= 12 * MIN_SEASONS
+    # Centre the trend on the history so the solve stays well conditioned
+    origin = months[0]
+    X = design_matrix(months - origin, seasonal)
+    coefficients, *_ = np.linalg.lstsq(X, history, rcond=None)
+    return {
+        "method": "seasonal_regression" if seasonal else "linear_trend",
+        "forecast": design_matrix(future - origin, seasonal) @ coefficients,
+        "fitted": X @ coefficients,
+    }
+
+
+def r_squared(actual: np.ndarray, fitted: np.ndarray) -> float:
+    """Coefficient of determination of one series (1.0 for a perfectly flat fit)."""
+    residual = ((actual - fitted) ** 2).sum()
+    total = ((actual - actual.mean()) ** 2).sum()
+    return 1.0 if total == 0 else float(1 - residual / total)
+
+
+def growth_curve(previous: float, series: np.ndarray) -> np.ndarray:
+    """Period-over-period growth in basis points, starting from `previous`."""
+    prior = np.concatenate(([previous], series[:-1]))
+    return np.divide(series - prior, np.abs(prior), out=np.zeros(len(series)), where=prior != 0) * 10000
@@ -0,0 +1,120 @@
+"""
+In-process caches for derived financial data.
+
+Everything cached here is keyed on a company's data version: a counter stored
+in `company_data_versions` and bumped by every request that changes the ledger
+(TB upload, period deletion, mapping change). A bump only becomes visible once
+its transaction commits, so a request reading the old ledger can never file
+its result under the new version.
+"""
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from . import models
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry beyond `maxsize`."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard_company(self, company_id: str) -> None:
+        """Drop every entry whose key tuple starts with `company_id`."""
+        with self._lock:
+            for key in [k for k in self._data if k[0] == company_id]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Base-period forecast actuals: (company_id, period_date, data_version) -> dict
+actuals_cache = LRUCache(maxsize=512)
+
+# What-if preview state: (company_id, session_id) -> inputs, drivers, series, per-period states
+preview_sessions = LRUCache(maxsize=64)
+
+# /forecast/statements payloads: (company_id, scenario, data_version, config fingerprint) -> dict
+forecast_cache = LRUCache(maxsize=256)
+
+# Consolidated group arrays: (group_id, group version, member data versions) -> dict.
+# Not per company: a member's bump changes the key, and stale entries age out.
+consolidation_cache = LRUCache(maxsize=32)
+
+# Every cache keyed by (company_id, ...); purged on a data version bump
+COMPANY_CACHES = [actuals_cache, preview_sessions, forecast_cache]
+
+_versions: dict = {}
+_versions_lock = threading.Lock()
+
+
+def get_data_version(db: Session, company_id: str) -> int:
+    """Current committed data version for a company (one PK lookup, then memory)."""
+    version = _versions.get(company_id)
+    if version is None:
+        row = db.get(models.CompanyDataVersion, company_id)
+        version = row.version if row else 0
+        with _versions_lock:
+            _versions.setdefault(company_id, version)
+    return version
+
+
+def bump_data_version(db: Session, company_id: str) -> None:
+    """Mark a company's ledger as changed; takes effect when `db` commits."""
+    row = db.get(models.CompanyDataVersion, company_id)
+    if row is None:
+        row = models.CompanyDataVersion(company_id=company_id, version=0)
+        db.add(row)
+    row.version = (row.version or 0) + 1
+    db.info.setdefault("bumped_data_versions", {})[company_id] = row.version
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_data_versions(session: Session) -> None:
+    bumped = session.info.pop("bumped_data_versions", None)
+    if not bumped:
+        return
+    with _versions_lock:
+        _versions.update(bumped)
+    for company_id in bumped:
+        for company_cache in COMPANY_CACHES:
+            company_cache.discard_company(company_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_data_versions(session: Session) -> None:
+    session.info.pop("bumped_data_versions", None)
@@ -0,0 +1,83 @@
+"""
+Group consolidation of member companies' ledgers.
+
+Members are stacked into one (members × periods × accounts) activity tensor
+(debit-positive cents, one column per master account plus unmapped), so
+statement totals for the group and for every member are masked sums and
+cumulative sums over whole arrays:
+
+- every member is consolidated in full
+- intercompany accounts are eliminated from both sides; if the two sides do
+  not mirror each other, the residual is reported as an intercompany
+  difference instead of unbalancing the group
+- the non-owned share of each member's net income and equity is non-controlling
+  interest (NCI); the parent's share is the rest
+- members reporting in another currency are translated first (app.fx); their
+  translation adjustment is an extra equity column and is split with NCI too
+"""
+import numpy as np
+
+from .fx import CTA_CODE
+from .models import AccountCategory
+
+
+def statement_lines(activity: np.ndarray, accounts: list) -> dict:
+    """
+    Statement totals for (..., periods, accounts) activity; leading axes are kept.
+
+    `accounts` are (code, category) per column, code None for unmapped.
+    Income statement lines are for the month, balance sheet lines inception to
+    date, with the same signs as the statement endpoints.
+    """
+    def mask(predicate):
+        return np.array([predicate(code, category) for code, category in accounts], dtype=bool)
+
+    def month(predicate):
+        return activity[..., mask(predicate)].sum(axis=-1)
+
+    def to_date(values):
+        return np.cumsum(values, axis=-1)
+
+    revenue = -month(lambda code, category: category == AccountCategory.REVENUE)
+    expenses = month(lambda code, category: category == AccountCategory.EXPENSE)
+    net_income = revenue - expenses
+    return {
+        "revenue": revenue,
+        "expenses": expenses,
+        "net_income": net_income,
+        "assets": to_date(month(lambda code, category: category == AccountCategory.ASSET)),
+        "liabilities": -to_date(month(lambda code, category: category == AccountCategory.LIABILITY)),
+        # Un-closed P&L sits in equity, as on the balance sheet endpoint
+        "equity": -to_date(month(lambda code, category: category == AccountCategory.EQUITY)) + to_date(net_income),
+        "cash": to_date(month(lambda code, category: code == "1000")),
+        "unmapped": to_date(month(lambda code, category: code is None)),
+        # Part of equity above (credit-positive); zero unless members were translated
+        "cta": -to_date(month(lambda code, category: code == CTA_CODE)),
+    }
+
+
+def consolidate(activity: np.ndarray, accounts: list, ownership: np.ndarray, eliminated: np.ndarray) -> dict:
+    """
+    Group statements from member activity.
+
+    `activity` is (members × periods × accounts) in the group currency,
+    `ownership` the parent's share of each member (0-1) and `eliminated` the
+    (periods × accounts) intercompany activity removed from the sum. Returns
+    the group's statement_lines plus NCI splits, eliminations by statement
+    line and the members' own lines (members × periods).
+    """
+    members = statement_lines(activity, accounts)
+    group = statement_lines(activity.sum(axis=0) - eliminated, accounts)
+    removed = statement_lines(eliminated, accounts)
+
+    minority = (1 - ownership)[:, None]
+    group["nci_net_income"] = (minority * members["net_income"]).sum(axis=0)
+    group["nci_equity"] = (minority * members["equity"]).sum(axis=0)
+    group["parent_net_income"] = group["net_income"] - group["nci_net_income"]
+    group["parent_equity"] = group["equity"] - group["nci_equity"]
+    # Mirrored pairs net to zero; anything left is an unmatched intercompany balance
+    group["intercompany_difference"] = np.cumsum(eliminated.sum(axis=-1))
+    group["is_balanced"] = (
+        group["assets"] - group["liabilities"] - group["equity"] + group["unmapped"] + group["intercompany_difference"]
+    ) == 0
+    return {"group": group, "eliminations": removed, "members": members}
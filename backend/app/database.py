@@ -1,20 +1,20 @@
 import os
 import sys
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 
-def get_db_path() -> str:
+def get_data_dir() -> Path:
     """
-    Returns the path to the SQLite database file.
+    Directory for files the backend writes next to its database.
 
-    - In development (plain Python): uses ./threestatement.db (relative to CWD).
-    - When bundled with PyInstaller: stores the DB in the user's app-data directory
-      so it is writable and persists across app updates.
-        Linux:   ~/.local/share/3-statement-modeler/threestatement.db
-        Windows: %APPDATA%/3-statement-modeler/threestatement.db
+    - In development (plain Python): the current working directory.
+    - When bundled with PyInstaller: the user's app-data directory, so it is
+      writable and persists across app updates.
+        Linux:   ~/.local/share/3-statement-modeler
+        Windows: %APPDATA%/3-statement-modeler
     """
     if getattr(sys, "frozen", False):
         # Running inside a PyInstaller bundle — use a writable user data dir
@@ -23,7 +23,19 @@ def get_db_path() -> str:
         else:
             data_dir = Path.home() / ".local" / "share" / "3-statement-modeler"
         data_dir.mkdir(parents=True, exist_ok=True)
-        return f"sqlite:///{data_dir / 'threestatement.db'}"
+        return data_dir
+    return Path(".")
+
+
+def get_db_path() -> str:
+    """
+    Returns the path to the SQLite database file.
+
+    - In development (plain Python): uses ./threestatement.db (relative to CWD).
+    - When bundled with PyInstaller: threestatement.db in get_data_dir().
+    """
+    if getattr(sys, "frozen", False):
+        return f"sqlite:///{get_data_dir() / 'threestatement.db'}"
 
     # Development: use the environment variable or fall back to local file
     return os.getenv("DATABASE_URL", "sqlite:///./threestatement.db")
@@ -40,6 +52,30 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def add_missing_columns(bind=engine) -> None:
+    """
+    Add columns that exist on the models but not in an existing database.
+
+    `create_all` only creates missing tables, so databases created by an older
+    version would otherwise fail on new columns. Only additive changes are
+    handled; new columns must carry a scalar default.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(bind.dialect)}"
+                default = column.default.arg if column.default is not None and column.default.is_scalar else None
+                if default is not None:
+                    ddl += f" NOT NULL DEFAULT {int(default) if isinstance(default, bool) else repr(default)}"
+                conn.execute(text(ddl))
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -0,0 +1,100 @@
+"""
+In-process publish/subscribe of company change events, streamed to clients
+over Server-Sent Events (routers/events.py).
+
+Writers call `queue_event(db, ...)` alongside their data version bump; the
+event is published only once the transaction commits, like the bump itself,
+so a client refetching on an event always reads the new ledger. Request
+handlers run in worker threads while subscribers wait on the event loop, so
+events are handed over with `loop.call_soon_threadsafe`.
+
+Event payload: {"id", "type", "company_id", "periods": [...], ...extra}
+- period_uploaded: the uploaded month and every later one (balances are cumulative)
+- period_deleted: the deleted month and every later one
+- mappings_changed: every period
+- forecast_updated: the scenario whose config or base period changed
+- resync: the subscriber fell behind and should refetch everything
+"""
+import asyncio
+import itertools
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from . import cache  # noqa: F401 - its after_commit cache purge must run before events go out
+
+# Events buffered per subscriber before it is told to resync
+QUEUE_SIZE = 100
+
+_subscribers: dict = {}   # company_id -> {queue: loop}
+_subscribers_lock = threading.Lock()
+_ids = itertools.count(1)
+
+
+def subscribe(company_id: str) -> asyncio.Queue:
+    """Register a queue on the running event loop for a company's events."""
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    with _subscribers_lock:
+        _subscribers.setdefault(company_id, {})[queue] = asyncio.get_running_loop()
+    return queue
+
+
+def unsubscribe(company_id: str, queue: asyncio.Queue) -> None:
+    with _subscribers_lock:
+        queues = _subscribers.get(company_id, {})
+        queues.pop(queue, None)
+        if not queues:
+            _subscribers.pop(company_id, None)
+
+
+def subscriber_count(company_id: str = None) -> int:
+    with _subscribers_lock:
+        if company_id is not None:
+            return len(_subscribers.get(company_id, {}))
+        return sum(len(queues) for queues in _subscribers.values())
+
+
+def _offer(queue: asyncio.Queue, message: dict) -> None:
+    """Runs on the subscriber's loop. A full queue is replaced by a single resync."""
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({"id": message["id"], "type": "resync", "company_id": message["company_id"], "periods": []})
+
+
+def publish(company_id: str, event_type: str, periods=(), **extra) -> None:
+    """Send an event to every current subscriber of `company_id`; safe from any thread."""
+    message = {
+        "id": next(_ids),
+        "type": event_type,
+        "company_id": company_id,
+        "periods": [str(p) for p in periods],
+        **extra,
+    }
+    with _subscribers_lock:
+        targets = list(_subscribers.get(company_id, {}).items())
+    for queue, loop in targets:
+        try:
+            loop.call_soon_threadsafe(_offer, queue, message)
+        except RuntimeError:
+            # Loop already closed (server shutting down)
+            pass
+
+
+def queue_event(db: Session, company_id: str, event_type: str, periods=(), **extra) -> None:
+    """Publish an event when `db` commits; dropped if it rolls back."""
+    db.info.setdefault("pending_events", []).append((company_id, event_type, list(periods), extra))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for company_id, event_type, periods, extra in session.info.pop("pending_events", ()):
+        publish(company_id, event_type, periods, **extra)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop("pending_events", None)
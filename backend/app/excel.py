@@ -0,0 +1,122 @@
+"""
+Write-only XLSX rendering for statement exports.
+
+Routers gather statement data into plain sheet specs; this module turns them
+into a workbook with openpyxl's write-only mode. Rows are streamed to disk as
+they are appended, and every cell refers to a named style registered once per
+workbook, so memory stays flat however many periods or sheets are exported.
+Specs are plain dicts and lists, so they can also be rendered in a worker
+process.
+
+A sheet spec:
+
+    {
+        "title": "Income Statement",          # tab name
+        "heading": "Financial Report - ...",  # merged title row
+        "columns": ["Metric", "2024-01-31"],  # header row
+        "rows": [("Revenue", [1234.5], False), ("Net Income", [99.0], True)],
+        "value_width": 22,                    # width of the value columns
+    }
+"""
+import tempfile
+from datetime import date
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Workbooks up to this size stay in memory; larger ones spill to a temp file
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+
+LABEL_WIDTH = 45
+
+# Standard Excel Accounting format; the currency symbol is filled in per workbook
+ACCOUNTING_FORMAT_TEMPLATE = '_("{symbol}"* #,##0_);_("{symbol}"* (#,##0);_("{symbol}"* "-"_);_(@_)'
+
+
+def _named_styles(symbol: str) -> list:
+    number_format = ACCOUNTING_FORMAT_TEMPLATE.format(symbol=symbol)
+    header = dict(
+        font=Font(bold=True, size=12, color="FFFFFF"),
+        fill=PatternFill(start_color="1E293B", end_color="1E293B", fill_type="solid"),
+        border=Border(bottom=Side(style="thin", color="CCCCCC")),
+    )
+    return [
+        NamedStyle("export_title", font=Font(bold=True, size=16, color="333333"),
+                   alignment=Alignment(horizontal="left", vertical="center")),
+        NamedStyle("export_header", **header),
+        NamedStyle("export_header_value", alignment=Alignment(horizontal="center", wrap_text=True, vertical="center"), **header),
+        NamedStyle("export_header_date", number_format="yyyy-mm-dd",
+                   alignment=Alignment(horizontal="center", wrap_text=True, vertical="center"), **header),
+        NamedStyle("export_label"),
+        NamedStyle("export_label_total", font=Font(bold=True)),
+        NamedStyle("export_value", number_format=number_format),
+        NamedStyle("export_value_total", number_format=number_format, font=Font(bold=True)),
+    ]
+
+
+def _styled(ws, value, style: str) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+def render_workbook(sheets: list, symbol: str, fileobj) -> None:
+    """Write `sheets` (see module docstring) as an XLSX into the binary file `fileobj`."""
+    wb = openpyxl.Workbook(write_only=True)
+    for style in _named_styles(symbol):
+        wb.add_named_style(style)
+
+    for spec in sheets:
+        ws = wb.create_sheet(spec["title"])
+        columns = spec["columns"]
+        # Layout must be set before the first row is written
+        ws.column_dimensions["A"].width = LABEL_WIDTH
+        for col_idx in range(2, len(columns) + 1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = spec.get("value_width", 22)
+        ws.row_dimensions[1].height = 25
+        ws.merged_cells.add(f"A1:{get_column_letter(max(len(columns), 1))}1")
+        ws.freeze_panes = "B3"
+
+        ws.append([_styled(ws, spec["heading"], "export_title")])
+        ws.append([_styled(ws, columns[0], "export_header")]
+                  + [_styled(ws, c, "export_header_date" if isinstance(c, date) else "export_header_value")
+                     for c in columns[1:]])
+        for label, values, is_total in spec["rows"]:
+            value_style = "export_value_total" if is_total else "export_value"
+            ws.append([_styled(ws, label, "export_label_total" if is_total else "export_label")]
+                      + [_styled(ws, v, value_style) for v in values])
+
+    wb.save(fileobj)
+
+
+def render_to_path(sheets: list, symbol: str, path: str) -> str:
+    """render_workbook into a file; top-level so a process pool can run it."""
+    with open(path, "wb") as f:
+        render_workbook(sheets, symbol, f)
+    return path
+
+
+def spool(render) -> tempfile.SpooledTemporaryFile:
+    """Run `render(fileobj)` into a spooled temp file, rewound and ready to stream."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        render(spooled)
+    except Exception:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled
+
+
+def iter_chunks(fileobj, chunk_size: int = CHUNK_BYTES):
+    """Yield a file in chunks and close it once exhausted (or abandoned)."""
+    try:
+        while chunk := fileobj.read(chunk_size):
+            yield chunk
+    finally:
+        fileobj.close()
@@ -0,0 +1,97 @@
+"""
+Currency translation of monthly ledger activity.
+
+Rates are stored per currency pair and month as integers scaled by
+RATE_SCALE: a closing (period-end) rate and an average rate. Translation
+works on whole (..., periods × accounts) arrays:
+
+- assets, liabilities and unmapped balances at the closing rate of each month
+- revenue, expenses and equity movements at the month's average rate (the
+  average stands in for the historical rate of equity transactions)
+- the cumulative translation adjustment (CTA) is whatever keeps the
+  translated ledger in balance; it is reported as its own equity line
+
+Results are rounded to whole cents, and the CTA is taken after rounding, so
+a ledger that balances locally still balances exactly after translation.
+"""
+import numpy as np
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from . import models
+from .models import AccountCategory
+
+RATE_SCALE = 100_000_000
+
+# Master code of the pseudo-account the translation adjustment is booked to
+CTA_CODE = "CTA"
+
+# Activity translated at the average rate; everything else is a balance at closing
+FLOW_CATEGORIES = (AccountCategory.REVENUE, AccountCategory.EXPENSE, AccountCategory.EQUITY)
+
+
+def to_scaled(rate: float) -> int:
+    return int(round(rate * RATE_SCALE))
+
+
+def from_scaled(rate: int) -> float:
+    return rate / RATE_SCALE
+
+
+def rate_table(db: Session, pairs: set) -> dict:
+    """
+    Stored rates for (from, to) currency pairs, in one query.
+
+    Returns {(from, to): {period_date: (closing, average)}} as floats. A pair
+    stored the other way round is inverted.
+    """
+    pairs = {(src, dst) for src, dst in pairs if src != dst}
+    table = {pair: {} for pair in pairs}
+    if not pairs:
+        return table
+    wanted = pairs | {(dst, src) for src, dst in pairs}
+    rows = db.query(models.FxRate).filter(or_(*(
+        and_(models.FxRate.base_currency == base, models.FxRate.quote_currency == quote)
+        for base, quote in sorted(wanted)
+    ))).all()
+    for row in rows:
+        closing, average = from_scaled(row.closing_rate), from_scaled(row.average_rate)
+        if (row.base_currency, row.quote_currency) in pairs:
+            table[(row.base_currency, row.quote_currency)][row.period_date] = (closing, average)
+        inverse = (row.quote_currency, row.base_currency)
+        # A directly stored rate wins over an inverted one
+        if inverse in pairs and row.period_date not in table[inverse]:
+            table[inverse][row.period_date] = (1 / closing, 1 / average)
+    return table
+
+
+def rate_arrays(table: dict, src: str, dst: str, periods: list) -> tuple:
+    """(closing, average) float arrays over `periods`; NaN where no rate is stored."""
+    if src == dst:
+        ones = np.ones(len(periods))
+        return ones, ones
+    rates = table.get((src, dst), {})
+    closing = np.array([rates.get(p, (np.nan, np.nan))[0] for p in periods])
+    average = np.array([rates.get(p, (np.nan, np.nan))[1] for p in periods])
+    return closing, average
+
+
+def translate(activity: np.ndarray, accounts: list, closing: np.ndarray, average: np.ndarray) -> tuple:
+    """
+    Translate (..., periods, accounts) activity with (..., periods) rates.
+
+    `accounts` are (code, category) per column. Returns the translated
+    activity and the CTA movement per period, both int64 cents.
+    """
+    flow = np.array([category in FLOW_CATEGORIES for _, category in accounts], dtype=bool)
+    translated = np.empty(activity.shape, dtype=np.float64)
+    translated[..., flow] = activity[..., flow] * average[..., None]
+    balances = np.cumsum(activity[..., ~flow], axis=-2) * closing[..., None]
+    translated[..., ~flow] = np.diff(balances, axis=-2, prepend=0.0)
+    translated = np.round(translated).astype(np.int64)
+
+    # A locally unbalanced ledger stays unbalanced by its translated difference
+    local_imbalance = np.cumsum(activity.sum(axis=-1), axis=-1) * closing
+    imbalance = np.round(np.diff(local_imbalance, axis=-1, prepend=0.0)).astype(np.int64)
+    cta = imbalance - translated.sum(axis=-1)
+    return translated, cta
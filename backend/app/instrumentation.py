@@ -0,0 +1,241 @@
+"""
+Per-request latency and SQL instrumentation.
+
+Enabled with METRICS_ENABLED=1; when it is off (and app.profiling, which
+reuses the SQL hooks, is too) nothing below is installed, so requests and
+queries run exactly as before. When on:
+
+- `RequestMetricsMiddleware` (plain ASGI, so streamed responses still
+  stream) puts a RequestStats in a context variable for each HTTP request.
+  Sync endpoints run in worker threads with a copy of the context, so the
+  same object sees every query the request makes.
+- SQLAlchemy cursor hooks add each statement's count and duration to it, and
+  an ORM hook counts rows returned (streamed `yield_per` results excepted).
+- When the response finishes, the totals are added to per-route counters,
+  served as Prometheus text on /metrics, and sent as a `Server-Timing`
+  header (app, db) on the response itself.
+"""
+import contextvars
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+ENABLED = os.getenv("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
+
+# Request latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    """What one request has done so far."""
+
+    __slots__ = ("started", "queries", "sql_seconds", "rows", "closed", "statements")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.rows = 0
+        # Set once the response is sent; later queries (background tasks) are not counted
+        self.closed = False
+        # (offset, seconds, SQL, executemany) per statement when a caller asks for them (app.profiling)
+        self.statements = None
+
+
+current_request: contextvars.ContextVar = contextvars.ContextVar("current_request", default=None)
+
+
+class _RouteMetrics:
+    __slots__ = ("requests", "errors", "seconds", "buckets", "queries", "sql_seconds", "rows")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.rows = 0
+
+
+_routes: dict = {}   # (method, route template) -> _RouteMetrics
+_routes_lock = threading.Lock()
+
+
+def record(method: str, route: str, status_code: int, stats: RequestStats) -> float:
+    """Fold a finished request into the per-route totals; returns its duration in seconds."""
+    elapsed = time.perf_counter() - stats.started
+    with _routes_lock:
+        metrics = _routes.get((method, route))
+        if metrics is None:
+            metrics = _routes[(method, route)] = _RouteMetrics()
+        metrics.requests += 1
+        metrics.errors += status_code >= 500
+        metrics.seconds += elapsed
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                metrics.buckets[i] += 1
+        metrics.queries += stats.queries
+        metrics.sql_seconds += stats.sql_seconds
+        metrics.rows += stats.rows
+    return elapsed
+
+
+def server_timing(elapsed: float, stats: RequestStats) -> str:
+    return (
+        f'app;dur={elapsed * 1000:.1f}, '
+        f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.queries} queries, {stats.rows} rows"'
+    )
+
+
+# ── SQLAlchemy hooks ──────────────────────────────────────────────────────────
+
+# Start times live on the execution context, which is discarded with the
+# statement even when it raises, so nothing is left on pooled connections.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = context._query_start
+    elapsed = time.perf_counter() - started
+    stats = current_request.get()
+    if stats is not None and not stats.closed:
+        stats.queries += 1
+        stats.sql_seconds += elapsed
+        if stats.statements is not None:
+            stats.statements.append((started - stats.started, elapsed, statement, executemany))
+
+
+def _count_rows(orm_execute_state):
+    """Buffer a select's rows to count them; streamed results are left alone."""
+    stats = current_request.get()
+    if stats is None or stats.closed or not orm_execute_state.is_select:
+        return None
+    options = orm_execute_state.execution_options
+    if options.get("yield_per") or options.get("stream_results"):
+        return None
+    frozen = orm_execute_state.invoke_statement().freeze()
+    stats.rows += len(frozen.data)
+    return frozen()
+
+
+def install(engine) -> None:
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Session, "do_orm_execute", _count_rows)
+
+
+# ── ASGI middleware ───────────────────────────────────────────────────────────
+
+class RequestMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Handlers have run by now (streamed bodies may add more SQL later)
+                elapsed = time.perf_counter() - stats.started
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(elapsed, stats).encode()))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                await send(message)
+                _finish(scope, status_code, stats)
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # Errors, or a client that went away before the body finished
+            _finish(scope, status_code, stats)
+            current_request.reset(token)
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths share one label so scanners cannot grow the metric set
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+def _finish(scope, status_code: int, stats: RequestStats) -> None:
+    if stats.closed:
+        return
+    stats.closed = True
+    record(scope["method"], _route_template(scope), status_code, stats)
+
+
+# ── Prometheus exposition ─────────────────────────────────────────────────────
+
+def _labels(**labels) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _snapshot(metrics: _RouteMetrics) -> dict:
+    return {slot: getattr(metrics, slot) for slot in metrics.__slots__} | {"buckets": list(metrics.buckets)}
+
+
+def render_prometheus(caches: dict) -> str:
+    """Text exposition format: per-route request, SQL and row counters plus cache hit rates."""
+    with _routes_lock:
+        routes = sorted(
+            ((method, route, _snapshot(m)) for (method, route), m in _routes.items()),
+            key=lambda item: (item[1], item[0])
+        )
+
+    lines = [
+        "# HELP tsm_http_requests_total HTTP requests by route.",
+        "# TYPE tsm_http_requests_total counter",
+    ]
+    lines += [f"tsm_http_requests_total{_labels(method=m, route=r)} {v['requests']}" for m, r, v in routes]
+    lines += [
+        "# HELP tsm_http_request_errors_total HTTP 5xx responses by route.",
+        "# TYPE tsm_http_request_errors_total counter",
+    ]
+    lines += [f"tsm_http_request_errors_total{_labels(method=m, route=r)} {v['errors']}" for m, r, v in routes]
+    lines += [
+        "# HELP tsm_http_request_duration_seconds Request latency by route.",
+        "# TYPE tsm_http_request_duration_seconds histogram",
+    ]
+    for m, r, v in routes:
+        for bound, count in zip(LATENCY_BUCKETS, v["buckets"]):
+            lines.append(f"tsm_http_request_duration_seconds_bucket{_labels(method=m, route=r, le=bound)} {count}")
+        lines.append(f"tsm_http_request_duration_seconds_bucket{_labels(method=m, route=r, le='+Inf')} {v['requests']}")
+        lines.append(f"tsm_http_request_duration_seconds_sum{_labels(method=m, route=r)} {v['seconds']:.6f}")
+        lines.append(f"tsm_http_request_duration_seconds_count{_labels(method=m, route=r)} {v['requests']}")
+    for name, key, help_text in (
+        ("tsm_sql_statements_total", "queries", "SQL statements executed while serving the route."),
+        ("tsm_sql_duration_seconds_total", "sql_seconds", "Time spent in SQL while serving the route."),
+        ("tsm_sql_rows_total", "rows", "Rows returned to the route by SQL selects."),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for m, r, v in routes:
+            value = f"{v[key]:.6f}" if isinstance(v[key], float) else v[key]
+            lines.append(f"{name}{_labels(method=m, route=r)} {value}")
+
+    lines += ["# HELP tsm_cache_hits_total In-process cache hits.", "# TYPE tsm_cache_hits_total counter"]
+    lines += [f"tsm_cache_hits_total{_labels(cache=name)} {c.hits}" for name, c in sorted(caches.items())]
+    lines += ["# HELP tsm_cache_misses_total In-process cache misses.", "# TYPE tsm_cache_misses_total counter"]
+    lines += [f"tsm_cache_misses_total{_labels(cache=name)} {c.misses}" for name, c in sorted(caches.items())]
+    lines += ["# HELP tsm_cache_entries In-process cache size.", "# TYPE tsm_cache_entries gauge"]
+    lines += [f"tsm_cache_entries{_labels(cache=name)} {len(c)}" for name, c in sorted(caches.items())]
+    return "\n".join(lines) + "\n"
+
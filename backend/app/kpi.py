@@ -0,0 +1,110 @@
+"""
+Precomputed dashboard KPI series (models.KpiSeries).
+
+One row per company and uploaded period holds the month's revenue, EBITDA and
+net income and the inception-to-date cash balance, with the same sign
+conventions as the statement endpoints. Ledger writes call `refresh` in the
+same transaction as their data version bump:
+
+- TB upload of a month: that month and every later one (cash is cumulative)
+- period deletion: the deleted month onward
+- mapping change or reset: every month
+
+Each refresh is one grouped query plus one running cash total.
+"""
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import case
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from . import models
+
+
+def _period_totals(db: Session, company_id: str, since: Optional[date]) -> list:
+    """(period, revenue, expenses, cash activity) per month, raw debit-positive sums."""
+    master = models.MasterChartOfAccount
+    balance = models.TrialBalanceEntry.balance
+    query = db.query(
+        models.ReportingPeriod.period_date,
+        func.sum(case((master.category == models.AccountCategory.REVENUE, balance), else_=0)),
+        func.sum(case((master.category == models.AccountCategory.EXPENSE, balance), else_=0)),
+        func.sum(case((master.account_code == "1000", balance), else_=0)),
+    ).select_from(models.ReportingPeriod).outerjoin(
+        models.TrialBalanceEntry,
+        models.TrialBalanceEntry.reporting_period_id == models.ReportingPeriod.id
+    ).outerjoin(
+        models.AccountMapping,
+        models.TrialBalanceEntry.company_account_id == models.AccountMapping.company_account_id
+    ).outerjoin(
+        master,
+        models.AccountMapping.master_account_id == master.id
+    ).filter(models.ReportingPeriod.company_id == company_id)
+    if since is not None:
+        query = query.filter(models.ReportingPeriod.period_date >= since)
+    return query.group_by(models.ReportingPeriod.period_date).order_by(models.ReportingPeriod.period_date).all()
+
+
+def _opening_cash(db: Session, company_id: str, since: Optional[date]) -> int:
+    """Cash balance carried in from the stored series before `since`."""
+    if since is None:
+        return 0
+    row = db.query(models.KpiSeries.cash_cents).filter(
+        models.KpiSeries.company_id == company_id,
+        models.KpiSeries.period_date < since
+    ).order_by(models.KpiSeries.period_date.desc()).first()
+    return row[0] if row else 0
+
+
+def refresh(db: Session, company_id: str, since: Optional[date] = None) -> list:
+    """
+    Recompute the series from `since` (None = every period), flushed with the
+    caller's transaction. Returns the periods touched, including removed ones.
+    """
+    db.flush()
+    cash = _opening_cash(db, company_id, since)
+    existing = db.query(models.KpiSeries).filter(models.KpiSeries.company_id == company_id)
+    if since is not None:
+        existing = existing.filter(models.KpiSeries.period_date >= since)
+    rows = {row.period_date: row for row in existing}
+    touched = set(rows)
+
+    for period_date, revenue_raw, expense_raw, cash_activity in _period_totals(db, company_id, since):
+        revenue_raw, expense_raw = revenue_raw or 0, expense_raw or 0
+        cash += cash_activity or 0
+        touched.add(period_date)
+        row = rows.pop(period_date, None)
+        if row is None:
+            row = models.KpiSeries(company_id=company_id, period_date=period_date)
+            db.add(row)
+        row.revenue_cents = revenue_raw * -1
+        # EBITDA for actuals: revenue less all expenses, as the dashboard has always shown it
+        row.ebitda_cents = revenue_raw * -1 - expense_raw
+        row.net_income_cents = (revenue_raw + expense_raw) * -1
+        row.cash_cents = cash
+
+    # Periods that no longer exist
+    for row in rows.values():
+        db.delete(row)
+    db.flush()
+    return sorted(touched)
+
+
+def backfill(db: Session) -> None:
+    """Build the series for companies with uploads but none stored (databases predating the table)."""
+    missing = db.query(models.ReportingPeriod.company_id).outerjoin(
+        models.KpiSeries,
+        models.KpiSeries.company_id == models.ReportingPeriod.company_id
+    ).filter(models.KpiSeries.id.is_(None)).distinct().all()
+    for (company_id,) in missing:
+        refresh(db, company_id)
+    if missing:
+        db.commit()
+
+
+def series(db: Session, company_id: str) -> list:
+    """Stored series in period order (one indexed range read)."""
+    return db.query(models.KpiSeries).filter(
+        models.KpiSeries.company_id == company_id
+    ).order_by(models.KpiSeries.period_date).all()
@@ -1,17 +1,21 @@
+import math
 import os
 import sys
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 
-from . import models
-from .database import engine, SessionLocal
-from .routers import companies, master_coa, trial_balances, mappings, statements, periods, forecast, export, dashboard
+from . import artifacts, cache, instrumentation, kpi, models, profiling, slow_queries
+from .database import engine, SessionLocal, add_missing_columns
+from .routers import companies, master_coa, trial_balances, mappings, statements, periods, forecast, export, batch_export, ledger, dashboard, events, consolidation, fx_rates, debug
 
 models.Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
 
 # Standardize: Always ensure at least one company exists on startup
 def init_db():
@@ -47,10 +51,14 @@ def init_db():
         if db.query(models.Company).count() == 0:
             db.add(models.Company(name="Acme Corp", fiscal_year_end=12, currency="USD"))
             db.commit()
+
+        # 3. Build KPI series for databases created before the table existed
+        kpi.backfill(db)
     finally:
         db.close()
 
 init_db()
+artifacts.remove_stale_temp_files()
 
 app = FastAPI(
     title="Automated 3-Statement Modeler",
@@ -77,7 +85,33 @@ app.include_router(statements.router)
 app.include_router(periods.router)
 app.include_router(forecast.router)
 app.include_router(export.router)
+app.include_router(batch_export.router)
+app.include_router(ledger.router)
 app.include_router(dashboard.router)
+app.include_router(events.router)
+app.include_router(consolidation.router)
+app.include_router(fx_rates.router)
+app.include_router(debug.router)
+
+# Opt-in latency / SQL metrics (METRICS_ENABLED=1) and per-request profiling
+# (PROFILING_ENABLED=1); nothing is hooked in otherwise. Metrics wrap profiling
+# so a profiled request is still counted.
+if instrumentation.ENABLED or profiling.ENABLED:
+    instrumentation.install(engine)
+if profiling.ENABLED:
+    profiling.install(app)
+if instrumentation.ENABLED:
+    app.add_middleware(instrumentation.RequestMetricsMiddleware)
+# Slow-query log (SLOW_QUERY_MS=<threshold>); /debug/slow-queries reads it
+if slow_queries.ENABLED:
+    slow_queries.install(engine)
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """FastAPI's default 422, but echoed non-finite floats (Infinity, 1e400) are sent as strings."""
+    errors = jsonable_encoder(exc.errors(), custom_encoder={float: lambda v: v if math.isfinite(v) else str(v)})
+    return JSONResponse(status_code=422, content={"detail": errors})
 
 
 @app.get("/health")
@@ -86,6 +120,22 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text exposition of per-route latency, SQL and cache counters."""
+    if not instrumentation.ENABLED:
+        return PlainTextResponse("Metrics are disabled; set METRICS_ENABLED=1.\n", status_code=404)
+    return PlainTextResponse(
+        instrumentation.render_prometheus({
+            "actuals": cache.actuals_cache,
+            "forecast": cache.forecast_cache,
+            "preview_sessions": cache.preview_sessions,
+            "consolidation": cache.consolidation_cache,
+        }),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.get("/api-info")
 def read_root():
     return {"status": "ok", "message": "3-Statement Modeler API is running."}
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Integer, BigInteger, Boolean, ForeignKey, Date, DateTime, Enum, UniqueConstraint
+from sqlalchemy import Column, String, Integer, BigInteger, Boolean, ForeignKey, Date, DateTime, Enum, LargeBinary, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -148,4 +148,111 @@ class ForecastConfig(Base):
     # Working capital driver
     wc_pct_of_revenue = Column(Integer, nullable=False, default=1000)   # 1000 = 10.00%
 
+    # Financing drivers
+    interest_rate_pct = Column(Integer, nullable=False, default=0)      # annual, on average term debt
+    debt_repayment_cents = Column(BigInteger, nullable=False, default=0)  # scheduled per period
+    revolver_limit_cents = Column(BigInteger, nullable=False, default=0)  # 0 = no revolver facility
+    revolver_rate_pct = Column(Integer, nullable=False, default=0)      # annual, on average drawn balance
+    min_cash_cents = Column(BigInteger, nullable=False, default=0)      # revolver draws below this
+
+    # Per-period overrides for any driver above, packed by projection.pack_curves
+    # (int64 basis points / cents per month). Months past a curve use the scalar.
+    driver_curves = Column(LargeBinary, nullable=True)
+
+    # Rolling scenarios rebase onto each newly uploaded month:
+    # "window" keeps num_periods, "fiscal_year" projects to the next fiscal year end
+    rolling_mode = Column(String, nullable=True)
+
+    company = relationship("Company")
+
+
+class CompanyDataVersion(Base):
+    __tablename__ = "company_data_versions"
+
+    # Bumped whenever a company's ledger changes (TB upload, period deletion,
+    # mapping change) so caches keyed on it never serve stale statements.
+    company_id = Column(String, ForeignKey("companies.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class KpiSeries(Base):
+    __tablename__ = "kpi_series"
+    __table_args__ = (
+        UniqueConstraint("company_id", "period_date", name="uix_kpi_company_period"),
+    )
+
+    # Dashboard headline figures per uploaded period, maintained by app.kpi
+    # whenever the ledger changes so the dashboard never re-derives statements.
+    id = Column(String, primary_key=True, default=generate_uuid)
+    company_id = Column(String, ForeignKey("companies.id"), nullable=False)
+    period_date = Column(Date, nullable=False)
+    revenue_cents = Column(BigInteger, nullable=False, default=0)
+    ebitda_cents = Column(BigInteger, nullable=False, default=0)
+    net_income_cents = Column(BigInteger, nullable=False, default=0)
+    cash_cents = Column(BigInteger, nullable=False, default=0)   # inception to date
+
+
+class ConsolidationGroup(Base):
+    __tablename__ = "consolidation_groups"
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    name = Column(String, nullable=False)
+    parent_company_id = Column(String, ForeignKey("companies.id"), nullable=False)
+    # Bumped on every membership or elimination change; part of the consolidation cache key
+    version = Column(Integer, nullable=False, default=0)
+
+    parent_company = relationship("Company")
+    members = relationship(
+        "ConsolidationMember", back_populates="group", cascade="all, delete-orphan",
+        order_by="ConsolidationMember.company_id"
+    )
+    intercompany_pairs = relationship("IntercompanyPair", back_populates="group", cascade="all, delete-orphan")
+
+
+class ConsolidationMember(Base):
+    __tablename__ = "consolidation_members"
+    __table_args__ = (
+        UniqueConstraint("group_id", "company_id", name="uix_group_member"),
+    )
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    group_id = Column(String, ForeignKey("consolidation_groups.id"), nullable=False)
+    company_id = Column(String, ForeignKey("companies.id"), nullable=False)
+    # Parent's ownership in basis points (10000 = wholly owned); the rest is non-controlling interest
+    ownership_pct = Column(Integer, nullable=False, default=10000)
+
+    group = relationship("ConsolidationGroup", back_populates="members")
     company = relationship("Company")
+
+
+class IntercompanyPair(Base):
+    __tablename__ = "intercompany_pairs"
+
+    # Two members' accounts that mirror each other (e.g. a receivable from and a
+    # payable to a fellow member). Both are eliminated on consolidation; by
+    # import account number, so re-uploaded accounts keep matching.
+    id = Column(String, primary_key=True, default=generate_uuid)
+    group_id = Column(String, ForeignKey("consolidation_groups.id"), nullable=False)
+    company_id = Column(String, ForeignKey("companies.id"), nullable=False)
+    account_number = Column(String, nullable=False)
+    counterparty_company_id = Column(String, ForeignKey("companies.id"), nullable=False)
+    counterparty_account_number = Column(String, nullable=False)
+
+    group = relationship("ConsolidationGroup", back_populates="intercompany_pairs")
+
+
+class FxRate(Base):
+    __tablename__ = "fx_rates"
+    __table_args__ = (
+        UniqueConstraint("base_currency", "quote_currency", "period_date", name="uix_fx_pair_period"),
+    )
+
+    # 1 base = rate quote, as integers scaled by fx.RATE_SCALE (100000000 = 1.0)
+    id = Column(String, primary_key=True, default=generate_uuid)
+    base_currency = Column(String, nullable=False)
+    quote_currency = Column(String, nullable=False)
+    period_date = Column(Date, nullable=False)
+    closing_rate = Column(BigInteger, nullable=False)   # period end, for balances
+    average_rate = Column(BigInteger, nullable=False)   # period average, for activity
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
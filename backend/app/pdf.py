@@ -0,0 +1,210 @@
+"""
+Dependency-free PDF rendering for statement packs.
+
+Renders the same sheet specs as app.excel (see its module docstring) as
+landscape tables in the standard Helvetica fonts, so nothing has to be
+embedded or installed and rendering works fully offline. Wide period ranges
+are split into column pages that repeat the label column, and long statements
+continue onto further pages with the header repeated.
+"""
+import time
+import zlib
+
+PAGE_WIDTH = 792   # US Letter landscape, in points
+PAGE_HEIGHT = 612
+MARGIN = 36
+LABEL_WIDTH = 190
+VALUE_WIDTH = 68
+ROW_HEIGHT = 14
+FONT_SIZE = 8
+HEADER_HEIGHT = 26
+TITLE_HEIGHT = 44
+
+VALUE_COLUMNS_PER_PAGE = (PAGE_WIDTH - 2 * MARGIN - LABEL_WIDTH) // VALUE_WIDTH
+ROWS_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN - TITLE_HEIGHT - HEADER_HEIGHT - ROW_HEIGHT) // ROW_HEIGHT
+
+HEADER_FILL = "0.118 0.161 0.231"   # #1E293B, as on the Excel header row
+RULE_GRAY = "0.8"
+
+# Helvetica advance widths (1/1000 em) for printable ASCII; Helvetica-Bold
+# shares the digit and punctuation widths used by the right-aligned numbers
+_WIDTHS = dict(zip(
+    " !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~",
+    [278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278]
+    + [556] * 10
+    + [278, 278, 584, 584, 584, 556, 1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556,
+       833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556, 333,
+       556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556, 556, 556, 333, 500, 278,
+       556, 500, 722, 500, 500, 500, 334, 260, 334, 584],
+))
+# Glyphs outside the PDF standard encoding get a plain-text stand-in
+_SUBSTITUTIONS = {"Δ ": "Change in ", "Δ": "Change", "–": "-", "—": "-"}
+
+
+def text_width(text: str, size: float = FONT_SIZE, bold: bool = False) -> float:
+    width = sum(_WIDTHS.get(ch, 556) for ch in text) * size / 1000
+    return width * 1.06 if bold else width
+
+
+def format_amount(value) -> str:
+    """Whole currency units in accounting style: 1,234 / (1,234) / -."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    rounded = round(value)
+    if rounded == 0:
+        return "-"
+    return f"({-rounded:,})" if rounded < 0 else f"{rounded:,}"
+
+
+def _clean(text) -> str:
+    text = str(text)
+    for old, new in _SUBSTITUTIONS.items():
+        text = text.replace(old, new)
+    return text
+
+
+def _pdf_string(text: str) -> bytes:
+    raw = _clean(text).encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _fit(text: str, width: float, bold: bool) -> str:
+    """Truncate `text` with an ellipsis-like '..' so it fits `width`."""
+    text = _clean(text)
+    if text_width(text, bold=bold) <= width:
+        return text
+    while text and text_width(text + "..", bold=bold) > width:
+        text = text[:-1]
+    return text + ".."
+
+
+class _Page:
+    """Content stream builder for one page."""
+
+    def __init__(self):
+        self.ops = []
+
+    def text(self, x: float, y: float, text: str, bold: bool = False, size: float = FONT_SIZE, gray: str = None):
+        self.ops.append(
+            f"BT {gray or '0'} g /{'F2' if bold else 'F1'} {size} Tf {x:.2f} {y:.2f} Td ".encode()
+            + _pdf_string(text) + b" Tj ET"
+        )
+
+    def right_text(self, right: float, y: float, text: str, bold: bool = False, size: float = FONT_SIZE, gray: str = None):
+        self.text(right - text_width(text, size, bold), y, text, bold, size, gray)
+
+    def rect(self, x: float, y: float, w: float, h: float, fill: str):
+        self.ops.append(f"{fill} rg {x:.2f} {y:.2f} {w:.2f} {h:.2f} re f 0 g".encode())
+
+    def rule(self, x1: float, x2: float, y: float, gray: str = RULE_GRAY, width: float = 0.5):
+        self.ops.append(f"{gray} G {width} w {x1:.2f} {y:.2f} m {x2:.2f} {y:.2f} l S 0 G".encode())
+
+    def stream(self) -> bytes:
+        return b"\n".join(self.ops)
+
+
+def _table_pages(spec: dict, symbol: str) -> list:
+    """Lay out one sheet spec as pages: column chunks × row chunks."""
+    columns = spec["columns"]
+    value_headers = [str(c) for c in columns[1:]]
+    rows = spec["rows"]
+    column_chunks = [
+        range(start, min(start + VALUE_COLUMNS_PER_PAGE, len(value_headers)))
+        for start in range(0, max(len(value_headers), 1), VALUE_COLUMNS_PER_PAGE)
+    ]
+    row_chunks = [rows[start:start + ROWS_PER_PAGE] for start in range(0, max(len(rows), 1), ROWS_PER_PAGE)]
+
+    pages = []
+    for c_idx, col_range in enumerate(column_chunks):
+        for r_idx, row_chunk in enumerate(row_chunks):
+            page = _Page()
+            top = PAGE_HEIGHT - MARGIN
+            page.text(MARGIN, top - 14, _fit(spec["heading"], PAGE_WIDTH - 2 * MARGIN, True), bold=True, size=13)
+            notes = [f"Amounts in {symbol}"]
+            if len(column_chunks) > 1:
+                notes.append(f"Columns {col_range.start + 1}-{col_range.stop} of {len(value_headers)}")
+            if r_idx:
+                notes.append("continued")
+            page.text(MARGIN, top - 30, " | ".join(notes), size=8, gray="0.4")
+
+            # Header band, wrapping "Forecast\n2024-01-31" style labels onto two lines
+            header_top = top - TITLE_HEIGHT
+            table_right = MARGIN + LABEL_WIDTH + VALUE_WIDTH * len(col_range)
+            page.rect(MARGIN, header_top - HEADER_HEIGHT, table_right - MARGIN, HEADER_HEIGHT, HEADER_FILL)
+            page.text(MARGIN + 4, header_top - 16, str(columns[0]), bold=True, gray="1")
+            for slot, col in enumerate(col_range):
+                right = MARGIN + LABEL_WIDTH + VALUE_WIDTH * (slot + 1) - 4
+                lines = value_headers[col].split("\n")[:2]
+                for line_no, line in enumerate(lines):
+                    y = header_top - (16 if len(lines) == 1 else 11 + 9 * line_no)
+                    page.right_text(right, y, _fit(line, VALUE_WIDTH - 6, True), bold=True, size=7.5, gray="1")
+
+            y = header_top - HEADER_HEIGHT - ROW_HEIGHT + 4
+            for label, values, is_total in row_chunk:
+                if is_total:
+                    page.rule(MARGIN, table_right, y + ROW_HEIGHT - 3, gray="0.5")
+                page.text(MARGIN + 4, y, _fit(label, LABEL_WIDTH - 8, is_total), bold=is_total)
+                for slot, col in enumerate(col_range):
+                    value = values[col] if col < len(values) else None
+                    right = MARGIN + LABEL_WIDTH + VALUE_WIDTH * (slot + 1) - 4
+                    page.right_text(right, y, format_amount(value), bold=is_total)
+                page.rule(MARGIN, table_right, y - 4)
+                y -= ROW_HEIGHT
+            pages.append(page)
+    return pages
+
+
+def render_pdf(sheets: list, symbol: str, fileobj) -> dict:
+    """
+    Write `sheets` as a PDF into the binary file `fileobj`.
+
+    Returns render metrics: page count, bytes written and elapsed milliseconds.
+    """
+    started = time.perf_counter()
+    pages = [page for spec in sheets for page in _table_pages(spec, symbol)]
+    total = len(pages)
+    for number, page in enumerate(pages, start=1):
+        page.right_text(PAGE_WIDTH - MARGIN, MARGIN - 14, f"Page {number} of {total}", size=7, gray="0.4")
+
+    # Objects: 1 catalog, 2 page tree, 3-4 fonts, then a page + content stream per page
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        (b"<< /Type /Pages /Kids [" + b" ".join(f"{5 + 2 * i} 0 R".encode() for i in range(total))
+         + f"] /Count {total} >>".encode()),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    for i, page in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {6 + 2 * i} 0 R >>".encode()
+        )
+        content = zlib.compress(page.stream(), 6)
+        objects.append(
+            f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode() + content + b"\nendstream"
+        )
+
+    written = 0
+
+    def write(data: bytes):
+        nonlocal written
+        fileobj.write(data)
+        written += len(data)
+
+    write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(written)
+        write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref_at = written
+    write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    write(b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets))
+    write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode())
+
+    return {
+        "pages": total,
+        "bytes": written,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
@@ -0,0 +1,226 @@
+"""
+On-demand profiling of single requests.
+
+Off unless PROFILING_ENABLED=1. Then a request sent with an `X-Profile: 1`
+header or a `profile=1` query parameter runs its endpoint under cProfile and
+leaves two files in PROFILE_DIR (default <data dir>/profiles), named by the
+id returned in the response's `X-Profile-Id` header:
+
+- `<id>.prof`: the raw profile, for `python -m pstats` or snakeviz
+- `<id>.json`: the request, its timings, the slowest functions and every
+  SQL statement it issued with its duration (via app.instrumentation's
+  hooks). Statements are kept without their parameters, so the file shows
+  query shapes and counts but no ledger data and can go on a ticket as is.
+
+cProfile only sees the thread it runs on, so the endpoint function itself is
+wrapped: a sync endpoint is profiled in its worker thread, an async one on
+the event loop. Dependency setup, response serialization and streamed bodies
+fall outside the profile but inside the request's total time and SQL log.
+One request is profiled at a time; a flagged request arriving meanwhile is
+served normally, and only the newest PROFILE_KEEP captures are kept.
+"""
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import pstats
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from fastapi.routing import APIRoute
+
+from . import instrumentation
+from .database import get_data_dir
+
+ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", get_data_dir() / "profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+# Functions listed in the JSON summary, by cumulative time
+TOP_FUNCTIONS = 40
+
+_FLAG_VALUES = ("1", "true", "yes")
+
+# Profiles collected by the endpoint wrapper for the request being captured
+_profiles: contextvars.ContextVar = contextvars.ContextVar("profiles", default=None)
+_capture_lock = threading.Lock()
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _requested(scope) -> bool:
+    for name, value in scope.get("headers", []):
+        if name == b"x-profile" and value.decode("latin-1").strip().lower() in _FLAG_VALUES:
+            return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return any(value.lower() in _FLAG_VALUES for value in query.get("profile", []))
+
+
+def _profile_id() -> str:
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{secrets.token_hex(4)}"
+
+
+def _top_functions(stats: pstats.Stats) -> list:
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+    return [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "own_ms": round(own * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, own, cumulative, _) in rows
+    ]
+
+
+def _sql_summary(statements: list) -> dict:
+    by_statement = {}
+    for _, seconds, sql, _ in statements:
+        entry = by_statement.setdefault(sql, {"sql": sql, "count": 0, "total_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += seconds * 1000
+    repeated = sorted(by_statement.values(), key=lambda e: e["total_ms"], reverse=True)
+    return {
+        "count": len(statements),
+        "total_ms": round(sum(seconds for _, seconds, _, _ in statements) * 1000, 3),
+        # Same SQL text run many times is usually a per-row lookup (N+1)
+        "by_statement": [{**e, "total_ms": round(e["total_ms"], 3)} for e in repeated],
+        "statements": [
+            {"at_ms": round(offset * 1000, 3), "ms": round(seconds * 1000, 3), "sql": sql, "executemany": many}
+            for offset, seconds, sql, many in statements
+        ],
+    }
+
+
+def _prune() -> None:
+    captures = sorted(PROFILE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in captures[PROFILE_KEEP:]:
+        stale.unlink(missing_ok=True)
+        stale.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def _write(profile_id: str, scope, status_code: int, started_at: datetime, elapsed: float, profiles: list, stats) -> None:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    summary = None
+    if profiles:
+        summary = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            summary.add(profile)
+        summary.dump_stats(str(PROFILE_DIR / f"{profile_id}.prof"))
+
+    route = getattr(scope.get("route"), "path", None)
+    capture = {
+        "id": profile_id,
+        "method": scope["method"],
+        "route": route,
+        "path": scope["path"],
+        "status": status_code,
+        "started_at": started_at.isoformat(timespec="milliseconds"),
+        "duration_ms": round(elapsed * 1000, 3),
+        "profiled_ms": round(summary.total_tt * 1000, 3) if summary else None,
+        "top_functions": _top_functions(summary) if summary else [],
+        "sql": _sql_summary(stats.statements),
+    }
+    with open(PROFILE_DIR / f"{profile_id}.json", "w") as f:
+        json.dump(capture, f, indent=2)
+    _prune()
+
+
+# ── Endpoint wrapping ─────────────────────────────────────────────────────────
+
+def _profiled(call, is_coroutine: bool):
+    """Run `call` under a fresh cProfile when the current request is being captured."""
+    if is_coroutine:
+        @functools.wraps(call)
+        async def wrapper(*args, **kwargs):
+            profiles = _profiles.get()
+            if profiles is None:
+                return await call(*args, **kwargs)
+            profile = cProfile.Profile()
+            profiles.append(profile)
+            profile.enable()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                profile.disable()
+    else:
+        @functools.wraps(call)
+        def wrapper(*args, **kwargs):
+            profiles = _profiles.get()
+            if profiles is None:
+                return call(*args, **kwargs)
+            profile = cProfile.Profile()
+            profiles.append(profile)
+            profile.enable()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                profile.disable()
+    return wrapper
+
+
+def install(app) -> None:
+    """Wrap every API route's endpoint and add the capture middleware; call after routers are included."""
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            # FastAPI reads dependant.call per request; its sync/async flag was fixed at startup
+            route.dependant.call = _profiled(route.dependant.call, route.dependant.is_coroutine_callable)
+    app.add_middleware(ProfilingMiddleware)
+
+
+# ── ASGI middleware ───────────────────────────────────────────────────────────
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested(scope):
+            return await self.app(scope, receive, send)
+        if not _capture_lock.acquire(blocking=False):
+            return await self.app(scope, receive, send)
+        try:
+            await self._capture(scope, receive, send)
+        finally:
+            _capture_lock.release()
+
+    async def _capture(self, scope, receive, send):
+        profile_id = _profile_id()
+        started_at = datetime.now(timezone.utc)
+        # Share the metrics middleware's stats when it is on, else start our own
+        stats = instrumentation.current_request.get()
+        stats_token = None
+        if stats is None:
+            stats = instrumentation.RequestStats()
+            stats_token = instrumentation.current_request.set(stats)
+        stats.statements = []
+        profiles = []
+        profiles_token = _profiles.set(profiles)
+        status_code = 500
+        finished = None
+
+        async def send_with_id(message):
+            nonlocal status_code, finished
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished = time.perf_counter()
+                # Background tasks run after this; keep their queries out, as the metrics do
+                stats.closed = True
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            elapsed = (finished or time.perf_counter()) - started
+            _profiles.reset(profiles_token)
+            if stats_token is not None:
+                instrumentation.current_request.reset(stats_token)
+            _write(profile_id, scope, status_code, started_at, elapsed, profiles, stats)
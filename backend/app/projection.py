@@ -0,0 +1,395 @@
+"""
+Vectorized projection engine shared by the forecast endpoints.
+
+Every driver is broadcast to a (paths, periods) array, so a single pass over the
+projected months evaluates one saved scenario, a Monte Carlo run or a whole
+sensitivity grid with the same arithmetic. Values stay in the units stored on
+ForecastConfig: basis points for ratios and cents for amounts.
+
+The model is fully integrated: every balance sheet bucket is rolled forward from
+the base period's inception-to-date balances, term debt amortizes on schedule
+and an optional revolver draws whenever cash would fall below the minimum. The
+revolver interest ↔ cash circularity is solved per period by fixed-point
+iteration, vectorized across paths.
+"""
+import struct
+
+import numpy as np
+
+from .models import AccountCategory, CashFlowCategory
+
+# Drivers in the order they appear on ForecastConfig
+DRIVER_FIELDS = (
+    "revenue_growth_pct",
+    "cogs_pct_of_revenue",
+    "opex_growth_pct",
+    "tax_rate_pct",
+    "capex_cents",
+    "da_cents",
+    "wc_pct_of_revenue",
+    "interest_rate_pct",
+    "debt_repayment_cents",
+    "revolver_limit_cents",
+    "revolver_rate_pct",
+    "min_cash_cents",
+)
+
+# Drivers stored as basis points (500 = 5.00%); the rest are cents
+BASIS_POINT_DRIVERS = {
+    "revenue_growth_pct",
+    "cogs_pct_of_revenue",
+    "opex_growth_pct",
+    "tax_rate_pct",
+    "wc_pct_of_revenue",
+    "interest_rate_pct",
+    "revolver_rate_pct",
+}
+
+# Balance sheet buckets rolled forward by the engine
+BALANCE_BUCKETS = (
+    "cash",
+    "working_capital_assets",
+    "working_capital_liabilities",
+    "fixed_assets",
+    "accumulated_depreciation",
+    "other_assets",
+    "term_debt",
+    "other_liabilities",
+    "contributed_equity",
+    "retained_earnings",
+    "unmapped",
+)
+
+# Per-period series produced by project(), keyed as in the /statements payload.
+# Balance sheet amounts are presented with assets, liabilities and equity positive.
+OUTPUT_KEYS = (
+    "revenue_cents",
+    "cogs_cents",
+    "gross_profit_cents",
+    "opex_cents",
+    "ebitda_cents",
+    "ebit_cents",
+    "interest_cents",
+    "ebt_cents",
+    "tax_cents",
+    "net_income_cents",
+    "da_cents",
+    "delta_wc_cents",
+    "net_cash_from_operations_cents",
+    "capex_cents",
+    "net_cash_from_investing_cents",
+    "debt_repayment_cents",
+    "revolver_draw_cents",
+    "net_cash_from_financing_cents",
+    "net_change_in_cash_cents",
+    "beginning_cash_cents",
+    "ending_cash_cents",
+    "net_wc_cents",
+    "working_capital_assets_cents",
+    "fixed_assets_cents",
+    "accumulated_depreciation_cents",
+    "other_assets_cents",
+    "total_assets_cents",
+    "term_debt_cents",
+    "revolver_cents",
+    "working_capital_liabilities_cents",
+    "other_liabilities_cents",
+    "total_liabilities_cents",
+    "contributed_equity_cents",
+    "retained_earnings_cents",
+    "total_equity_cents",
+    "unmapped_balance_cents",
+    "balance_check_cents",
+    "circularity_iterations",
+    "circularity_converged",
+)
+
+# Revolver interest is re-solved until it moves by no more than this many cents
+CIRCULARITY_TOLERANCE = 1
+CIRCULARITY_MAX_ITERATIONS = 50
+
+
+# Longest per-period driver curve accepted (ten years of months)
+MAX_CURVE_PERIODS = 120
+
+# Curve record header: driver index into DRIVER_FIELDS, number of int64 values
+_CURVE_HEADER = struct.Struct("<BH")
+
+
+def pack_curves(curves: dict):
+    """
+    Pack per-period driver curves into one blob for ForecastConfig.driver_curves.
+
+    Each curve is stored as a small header followed by its values as
+    little-endian int64 (basis points or cents, like the scalar drivers), so
+    unpacking is a zero-copy view per driver. Returns None for no curves.
+    """
+    parts = []
+    for field, values in curves.items():
+        if not len(values):
+            continue
+        parts.append(_CURVE_HEADER.pack(DRIVER_FIELDS.index(field), len(values)))
+        parts.append(np.asarray(values, dtype="<i8").tobytes())
+    return b"".join(parts) or None
+
+
+def unpack_curves(blob) -> dict:
+    """Inverse of pack_curves: driver name -> read-only int64 array."""
+    curves = {}
+    offset = 0
+    while blob and offset < len(blob):
+        index, count = _CURVE_HEADER.unpack_from(blob, offset)
+        offset += _CURVE_HEADER.size
+        curves[DRIVER_FIELDS[index]] = np.frombuffer(blob, dtype="<i8", count=count, offset=offset)
+        offset += count * 8
+    return curves
+
+
+def config_drivers(config, num_periods: int = None) -> dict:
+    """
+    Read the driver values off a ForecastConfig (or any object with the same fields).
+
+    Drivers with a per-period curve come back as a (num_periods,) row: the
+    curve for the months it covers and the scalar driver after that.
+    """
+    drivers = {field: getattr(config, field) for field in DRIVER_FIELDS}
+    num_periods = config.num_periods if num_periods is None else num_periods
+    for field, curve in unpack_curves(getattr(config, "driver_curves", None)).items():
+        row = np.full(num_periods, float(drivers[field]))
+        covered = min(len(curve), num_periods)
+        row[:covered] = curve[:covered]
+        drivers[field] = row
+    return drivers
+
+
+def balance_bucket(account_code, category, cash_flow_category) -> str:
+    """Which engine bucket a master account's balance rolls forward in (None code = unmapped)."""
+    if account_code is None:
+        return "unmapped"
+    if account_code == "1000":
+        return "cash"
+    if category in (AccountCategory.REVENUE, AccountCategory.EXPENSE):
+        return "retained_earnings"   # un-closed P&L accumulates into retained earnings
+    if category == AccountCategory.ASSET:
+        if cash_flow_category == CashFlowCategory.OPERATING:
+            return "working_capital_assets"
+        if cash_flow_category == CashFlowCategory.INVESTING:
+            return "fixed_assets"
+        if cash_flow_category == CashFlowCategory.NON_CASH:
+            return "accumulated_depreciation"
+        return "other_assets"
+    if category == AccountCategory.LIABILITY:
+        if cash_flow_category == CashFlowCategory.OPERATING:
+            return "working_capital_liabilities"
+        if cash_flow_category == CashFlowCategory.FINANCING:
+            return "term_debt"
+        return "other_liabilities"
+    if cash_flow_category == CashFlowCategory.NON_CASH:
+        return "retained_earnings"
+    return "contributed_equity"
+
+
+def driver_matrix(value, paths: int, periods: int) -> np.ndarray:
+    """
+    Broadcast a driver to a (paths, periods) float array.
+
+    Accepts a scalar (same value everywhere), a (paths, 1) column (one value
+    per path), a (periods,) row (one value per projected month) or a full
+    (paths, periods) matrix.
+    """
+    return np.broadcast_to(np.asarray(value, dtype=np.float64), (paths, periods))
+
+
+def project(actuals: dict, drivers: dict, num_periods: int, paths: int = 1, keys=None,
+            start: int = 0, state: dict = None, states: list = None, out: dict = None) -> dict:
+    """
+    Run the monthly projection for `paths` driver sets at once.
+
+    `actuals` is the base-period snapshot from forecast._get_actuals and
+    `drivers` maps DRIVER_FIELDS to anything driver_matrix accepts. Returns a
+    dict of (paths, num_periods) arrays for the requested `keys` (all of
+    OUTPUT_KEYS by default). Amounts are truncated toward zero at the same steps
+    as the original integer model so a single path reproduces it exactly.
+
+    To resume part-way, pass `start` with the `state` captured after period
+    `start - 1` and an `out` already holding the earlier periods; only periods
+    from `start` on are computed. If `states` is a list, the carry state after
+    each computed period is appended to it.
+    """
+    shape = (paths, num_periods)
+    keys = OUTPUT_KEYS if keys is None else tuple(keys)
+    d = {field: driver_matrix(drivers[field], paths, num_periods) for field in DRIVER_FIELDS}
+
+    revenue_growth = d["revenue_growth_pct"] / 10000.0
+    cogs_pct = d["cogs_pct_of_revenue"] / 10000.0
+    opex_growth = d["opex_growth_pct"] / 10000.0
+    tax_rate = d["tax_rate_pct"] / 10000.0
+    wc_pct = d["wc_pct_of_revenue"] / 10000.0
+    capex = d["capex_cents"]
+    da = d["da_cents"]
+    # Annual rates applied monthly; interest accrues on the average balance
+    debt_rate = d["interest_rate_pct"] / 10000.0 / 12 / 2
+    revolver_rate = d["revolver_rate_pct"] / 10000.0 / 12 / 2
+    repayment_due = d["debt_repayment_cents"]
+    revolver_limit = d["revolver_limit_cents"]
+    min_cash = d["min_cash_cents"]
+
+    if out is None:
+        out = {key: np.empty(shape) for key in keys}
+
+    # Balance sheet buckets, debit-positive like the trial balance
+    opening = actuals.get("balances", {})
+    bucket = {name: np.full(paths, float(opening.get(name, 0))) for name in BALANCE_BUCKETS}
+    # Net working capital moves are split between its asset and liability sides
+    # in proportion to their gross base balances
+    wc_gross = np.abs(bucket["working_capital_assets"]) + np.abs(bucket["working_capital_liabilities"])
+    wc_asset_share = np.divide(
+        np.abs(bucket["working_capital_assets"]), wc_gross, out=np.ones(paths), where=wc_gross != 0
+    )
+    wc_assets_base = bucket["working_capital_assets"]
+    wc_base = bucket["working_capital_assets"] + bucket["working_capital_liabilities"]
+
+    if state is None:
+        term_debt = -bucket["term_debt"]    # outstanding, credit-positive
+        revolver = np.zeros(paths)          # the revolver is a projected facility
+        prev_revenue = np.full(paths, float(actuals["revenue"]))
+        prev_opex = np.full(paths, float(actuals["expenses"]))
+        prev_wc = np.full(paths, float(actuals["net_wc"]))
+        ending_cash = np.full(paths, float(actuals["cash"]))
+    else:
+        bucket = dict(state["bucket"])
+        term_debt = state["term_debt"]
+        revolver = state["revolver"]
+        prev_revenue = state["prev_revenue"]
+        prev_opex = state["prev_opex"]
+        prev_wc = state["prev_wc"]
+        ending_cash = state["ending_cash"]
+
+    for n in range(start, num_periods):
+        # ── Income Statement (operating) ──────────────────────────────────────
+        revenue = np.trunc(prev_revenue * (1 + revenue_growth[:, n]))
+        cogs = np.trunc(revenue * cogs_pct[:, n])
+        gross_profit = revenue - cogs
+        opex = np.trunc(prev_opex * (1 + opex_growth[:, n]))
+        ebitda = gross_profit - opex
+        ebit = ebitda - da[:, n]
+
+        # ── Term debt schedule ────────────────────────────────────────────────
+        repayment = np.minimum(repayment_due[:, n], np.maximum(term_debt, 0))
+        term_debt_close = term_debt - repayment
+        term_interest = np.trunc((term_debt + term_debt_close) * debt_rate[:, n])
+
+        net_wc = np.trunc(revenue * wc_pct[:, n])
+        delta_wc = net_wc - prev_wc
+        beginning_cash = ending_cash
+        headroom = np.maximum(revolver_limit[:, n] - revolver, 0)
+
+        # ── Revolver circularity: interest → net income → cash → draw → interest
+        revolver_interest = np.trunc(2 * revolver * revolver_rate[:, n])
+        iterations = np.zeros(paths)
+        unsettled = np.ones(paths, dtype=bool)
+        for _ in range(CIRCULARITY_MAX_ITERATIONS):
+            iterations += unsettled
+            interest = term_interest + revolver_interest
+            ebt = ebit - interest
+            tax = np.trunc(np.maximum(ebt, 0) * tax_rate[:, n])
+            net_income = ebt - tax
+            cfo = net_income + da[:, n] - delta_wc
+            cash_before_revolver = beginning_cash + cfo - capex[:, n] - repayment
+            draw = np.minimum(np.maximum(min_cash[:, n] - cash_before_revolver, 0), headroom)
+            paydown = np.minimum(np.maximum(cash_before_revolver - min_cash[:, n], 0), revolver)
+            revolver_close = revolver + draw - paydown
+            solved = np.trunc((revolver + revolver_close) * revolver_rate[:, n])
+            unsettled = np.abs(solved - revolver_interest) > CIRCULARITY_TOLERANCE
+            if not unsettled.any():
+                break
+            revolver_interest = np.where(unsettled, solved, revolver_interest)
+
+        # ── Cash Flow ─────────────────────────────────────────────────────────
+        cfi = -capex[:, n]
+        cff = draw - paydown - repayment
+        net_change = cfo + cfi + cff
+        ending_cash = beginning_cash + net_change
+
+        # ── Balance Sheet ─────────────────────────────────────────────────────
+        bucket["cash"] = ending_cash
+        bucket["working_capital_assets"] = wc_assets_base + np.trunc((net_wc - wc_base) * wc_asset_share)
+        bucket["working_capital_liabilities"] = net_wc - bucket["working_capital_assets"]
+        bucket["fixed_assets"] = bucket["fixed_assets"] + capex[:, n]
+        bucket["accumulated_depreciation"] = bucket["accumulated_depreciation"] - da[:, n]
+        bucket["retained_earnings"] = bucket["retained_earnings"] - net_income
+        term_debt = term_debt_close
+        revolver = revolver_close
+
+        total_assets = (
+            ending_cash + bucket["working_capital_assets"] + bucket["fixed_assets"]
+            + bucket["accumulated_depreciation"] + bucket["other_assets"]
+        )
+        total_liabilities = (
+            term_debt + revolver
+            - bucket["working_capital_liabilities"] - bucket["other_liabilities"]
+        )
+        total_equity = -(bucket["contributed_equity"] + bucket["retained_earnings"])
+
+        step = {
+            "revenue_cents": revenue,
+            "cogs_cents": cogs,
+            "gross_profit_cents": gross_profit,
+            "opex_cents": opex,
+            "ebitda_cents": ebitda,
+            "ebit_cents": ebit,
+            "interest_cents": interest,
+            "ebt_cents": ebt,
+            "tax_cents": tax,
+            "net_income_cents": net_income,
+            "da_cents": da[:, n],
+            "delta_wc_cents": -delta_wc,   # flip sign: WC increase = CF outflow
+            "net_cash_from_operations_cents": cfo,
+            "capex_cents": cfi,
+            "net_cash_from_investing_cents": cfi,
+            "debt_repayment_cents": -repayment,
+            "revolver_draw_cents": draw - paydown,
+            "net_cash_from_financing_cents": cff,
+            "net_change_in_cash_cents": net_change,
+            "beginning_cash_cents": beginning_cash,
+            "ending_cash_cents": ending_cash,
+            "net_wc_cents": net_wc,
+            "working_capital_assets_cents": bucket["working_capital_assets"],
+            "fixed_assets_cents": bucket["fixed_assets"],
+            "accumulated_depreciation_cents": bucket["accumulated_depreciation"],
+            "other_assets_cents": bucket["other_assets"],
+            "total_assets_cents": total_assets,
+            "term_debt_cents": term_debt,
+            "revolver_cents": revolver,
+            "working_capital_liabilities_cents": -bucket["working_capital_liabilities"],
+            "other_liabilities_cents": -bucket["other_liabilities"],
+            "total_liabilities_cents": total_liabilities,
+            "contributed_equity_cents": -bucket["contributed_equity"],
+            "retained_earnings_cents": -bucket["retained_earnings"],
+            "total_equity_cents": total_equity,
+            "unmapped_balance_cents": bucket["unmapped"],
+            # Zero when assets + unmapped = liabilities + equity (the actuals identity)
+            "balance_check_cents": total_assets + bucket["unmapped"] - total_liabilities - total_equity,
+            "circularity_iterations": iterations,
+            # 1 when the revolver interest settled within CIRCULARITY_MAX_ITERATIONS
+            "circularity_converged": ~unsettled,
+        }
+        for key in keys:
+            out[key][:, n] = step[key]
+
+        prev_revenue = revenue
+        prev_opex = opex
+        prev_wc = net_wc
+
+        if states is not None:
+            states.append({
+                "bucket": dict(bucket),
+                "term_debt": term_debt,
+                "revolver": revolver,
+                "prev_revenue": prev_revenue,
+                "prev_opex": prev_opex,
+                "prev_wc": prev_wc,
+                "ending_cash": ending_cash,
+            })
+
+    return out
@@ -0,0 +1,156 @@
+"""
+Financial ratio suite computed over a company's whole monthly history.
+
+Input is the (periods × master accounts) activity matrix from
+forecast.query_history. Account columns are summed into statement lines with
+boolean masks, balances are inception-to-date cumulative sums, and every
+ratio is an array operation across all periods at once. Undefined values
+(zero denominators, too little history for a trailing window) are NaN.
+"""
+import calendar
+
+import numpy as np
+
+from .models import AccountCategory
+
+# Trailing window for annualised ratios and for cash burn
+LTM_MONTHS = 12
+BURN_MONTHS = 3
+
+# name -> unit; the order is the response order
+RATIOS = {
+    "revenue_growth_pct": "pct",
+    "revenue_growth_yoy_pct": "pct",
+    "gross_margin_pct": "pct",
+    "opex_ratio_pct": "pct",
+    "ebitda_margin_pct": "pct",
+    "net_margin_pct": "pct",
+    "current_ratio": "x",
+    "quick_ratio": "x",
+    "cash_ratio": "x",
+    "working_capital_cents": "cents",
+    "dso_days": "days",
+    "dio_days": "days",
+    "dpo_days": "days",
+    "cash_conversion_cycle_days": "days",
+    "debt_to_equity": "x",
+    "liabilities_to_assets": "x",
+    "net_debt_to_ebitda_ltm": "x",
+    "return_on_equity_ltm_pct": "pct",
+    "asset_turnover_ltm": "x",
+    "net_change_in_cash_cents": "cents",
+    "cash_burn_cents": "cents",
+    "runway_months": "months",
+}
+DECIMALS = {"pct": 2, "x": 2, "days": 1, "months": 1, "cents": 0}
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    numerator, denominator = np.broadcast_arrays(
+        np.asarray(numerator, dtype=np.float64), np.asarray(denominator, dtype=np.float64)
+    )
+    return np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan), where=denominator != 0)
+
+
+def _change(series: np.ndarray, lag: int) -> np.ndarray:
+    """Growth over `lag` periods as a fraction; NaN until `lag` periods exist."""
+    out = np.full(series.shape, np.nan)
+    if len(series) > lag:
+        out[lag:] = _divide(series[lag:] - series[:-lag], np.abs(series[:-lag]))
+    return out
+
+
+def _trailing_sum(series: np.ndarray, window: int) -> np.ndarray:
+    """Sum of the last `window` periods; NaN until a full window exists."""
+    out = np.full(series.shape, np.nan)
+    if len(series) >= window:
+        running = np.concatenate([[0.0], np.cumsum(series)])
+        out[window - 1:] = running[window:] - running[:-window]
+    return out
+
+
+def compute(periods: list, accounts: list, history: np.ndarray) -> dict:
+    """
+    Every ratio in RATIOS as a float array over `periods`.
+
+    `accounts` are (code, name, category, sub_category, bucket) tuples for the
+    columns of `history`; amounts are debit-positive cents, as in the TB.
+    """
+    def columns(predicate):
+        return np.array([predicate(a) for a in accounts], dtype=bool)
+
+    def code(account_code):
+        return columns(lambda a: a[0] == account_code)
+
+    def category(account_category):
+        return columns(lambda a: a[2] == account_category)
+
+    activity = history.reshape(len(periods), len(accounts))
+    balance = np.cumsum(activity, axis=0)
+
+    # Monthly P&L, sign-flipped so revenue and costs read positive
+    revenue = -activity[:, category(AccountCategory.REVENUE)].sum(axis=1)
+    expenses = activity[:, category(AccountCategory.EXPENSE)].sum(axis=1)
+    cogs = activity[:, category(AccountCategory.EXPENSE) & columns(lambda a: a[3] == "COGS")].sum(axis=1)
+    # D&A is the month's credit to accumulated depreciation
+    depreciation = -activity[:, columns(lambda a: a[4] == "accumulated_depreciation")].sum(axis=1)
+    net_income = revenue - expenses
+    ebitda = net_income + depreciation
+
+    # Inception-to-date balances: assets debit-positive, liabilities and equity credit-positive
+    assets = balance[:, category(AccountCategory.ASSET)].sum(axis=1)
+    liabilities = -balance[:, category(AccountCategory.LIABILITY)].sum(axis=1)
+    # Un-closed P&L sits in equity, as on the balance sheet endpoint
+    equity = -balance[:, category(AccountCategory.EQUITY)].sum(axis=1) + np.cumsum(net_income)
+    current_assets = balance[:, columns(lambda a: a[3] == "Current Assets")].sum(axis=1)
+    current_liabilities = -balance[:, columns(lambda a: a[3] == "Current Liabilities")].sum(axis=1)
+    cash = balance[:, code("1000")].sum(axis=1)
+    receivables = balance[:, code("1100")].sum(axis=1)
+    inventory = balance[:, code("1200")].sum(axis=1)
+    payables = -balance[:, code("2000")].sum(axis=1)
+    term_debt = -balance[:, columns(lambda a: a[4] == "term_debt")].sum(axis=1)
+
+    days = np.array([calendar.monthrange(p.year, p.month)[1] for p in periods], dtype=np.float64)
+    dso = _divide(receivables, revenue) * days
+    dio = _divide(inventory, cogs) * days
+    dpo = _divide(payables, cogs) * days
+
+    net_change_in_cash = np.diff(cash, prepend=0.0)
+    # Average monthly outflow over the trailing window; zero while cash is growing
+    burn = np.maximum(-_trailing_sum(net_change_in_cash, BURN_MONTHS) / BURN_MONTHS, 0)
+    # Undefined (None) when the company is not burning cash
+    runway = _divide(cash, np.where(burn > 0, burn, 0))
+
+    return {
+        "revenue_growth_pct": _change(revenue, 1) * 100,
+        "revenue_growth_yoy_pct": _change(revenue, 12) * 100,
+        "gross_margin_pct": _divide(revenue - cogs, revenue) * 100,
+        "opex_ratio_pct": _divide(expenses - cogs, revenue) * 100,
+        "ebitda_margin_pct": _divide(ebitda, revenue) * 100,
+        "net_margin_pct": _divide(net_income, revenue) * 100,
+        "current_ratio": _divide(current_assets, current_liabilities),
+        "quick_ratio": _divide(current_assets - inventory, current_liabilities),
+        "cash_ratio": _divide(cash, current_liabilities),
+        "working_capital_cents": current_assets - current_liabilities,
+        "dso_days": dso,
+        "dio_days": dio,
+        "dpo_days": dpo,
+        "cash_conversion_cycle_days": dso + dio - dpo,
+        "debt_to_equity": _divide(liabilities, equity),
+        "liabilities_to_assets": _divide(liabilities, assets),
+        "net_debt_to_ebitda_ltm": _divide(term_debt - cash, _trailing_sum(ebitda, LTM_MONTHS)),
+        "return_on_equity_ltm_pct": _divide(_trailing_sum(net_income, LTM_MONTHS), equity) * 100,
+        "asset_turnover_ltm": _divide(_trailing_sum(revenue, LTM_MONTHS), assets),
+        "net_change_in_cash_cents": net_change_in_cash,
+        "cash_burn_cents": burn,
+        "runway_months": runway,
+    }
+
+
+def to_json(values: np.ndarray, unit: str) -> list:
+    """Round for display; NaN and infinities become None."""
+    rounded = np.round(values, DECIMALS[unit])
+    finite = np.isfinite(rounded)
+    if unit == "cents":
+        return [int(v) if ok else None for v, ok in zip(rounded, finite)]
+    return [float(v) if ok else None for v, ok in zip(rounded, finite)]
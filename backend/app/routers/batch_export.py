@@ -0,0 +1,294 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timezone
+from typing import List, Optional
+from pydantic import BaseModel
+import os
+import re
+import threading
+import time
+import uuid
+import zipfile
+
+from .. import artifacts, excel, models
+from ..database import SessionLocal, get_db
+from .export import (
+    actuals_key_parts, actuals_sheets, currency_symbol, export_filename,
+    forecast_key_parts, forecast_sheets, require_statements,
+)
+from .forecast import get_forecast_statements
+from .statements import get_income_statement, get_balance_sheet, get_cash_flow
+
+router = APIRouter(
+    prefix="/api/v1/exports/batch",
+    tags=["Export"]
+)
+
+# Worker processes for workbook rendering; 0 renders in the job thread
+BATCH_WORKERS = int(os.getenv("BATCH_EXPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+BATCH_DIR = artifacts.CACHE_DIR / "batches"
+# Finished archives, and the job records that point at them, are kept this long for download
+BATCH_RETENTION_SECONDS = 24 * 3600
+
+# Job status: job_id -> dict (see _new_job)
+export_jobs = {}
+_jobs_lock = threading.Lock()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# ── Pydantic schemas (local, lightweight) ─────────────────────────────────────
+
+class BatchExportIn(BaseModel):
+    company_ids: List[str] = []          # empty = every company
+    scenarios: Optional[List[str]] = None  # None = every configured scenario
+    include_forecasts: bool = True
+    include_actuals: bool = True
+    periods: Optional[List[date]] = None   # actuals periods; None = all uploaded
+    include_is: bool = True
+    include_bs: bool = True
+    include_cf: bool = True
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+        return _pool
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next batch starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _folder_name(name: str) -> str:
+    return re.sub(r"[^\w\- ]+", "_", name).strip() or "Company"
+
+def _prune_expired() -> None:
+    """Remove archives and finished job records older than BATCH_RETENTION_SECONDS."""
+    cutoff = time.time() - BATCH_RETENTION_SECONDS
+    with _jobs_lock:
+        for job_id in [j for j, job in export_jobs.items() if job["_finished"] and job["_finished"] < cutoff]:
+            del export_jobs[job_id]
+    if not BATCH_DIR.exists():
+        return
+    for entry in os.scandir(BATCH_DIR):
+        if entry.stat().st_mtime < cutoff:
+            os.unlink(entry.path)
+
+def _plan(db: Session, payload: BatchExportIn) -> list:
+    """Every workbook the job will produce: (company, kind, scenario or periods)."""
+    query = db.query(models.Company)
+    if payload.company_ids:
+        query = query.filter(models.Company.id.in_(payload.company_ids))
+    companies = query.order_by(models.Company.name).all()
+    missing = set(payload.company_ids) - {c.id for c in companies}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Companies not found: {', '.join(sorted(missing))}")
+
+    company_ids = [c.id for c in companies]
+    scenarios = {}
+    for company_id, scenario in db.query(models.ForecastConfig.company_id, models.ForecastConfig.scenario_name).filter(
+        models.ForecastConfig.company_id.in_(company_ids),
+        models.ForecastConfig.base_period.isnot(None)
+    ).order_by(models.ForecastConfig.scenario_name):
+        scenarios.setdefault(company_id, []).append(scenario)
+    uploaded = {}
+    if payload.include_actuals and payload.periods is None:
+        for company_id, period_date in db.query(models.ReportingPeriod.company_id, models.ReportingPeriod.period_date).filter(
+            models.ReportingPeriod.company_id.in_(company_ids)
+        ).order_by(models.ReportingPeriod.period_date):
+            uploaded.setdefault(company_id, []).append(period_date)
+
+    items = []
+    for company in companies:
+        if payload.include_actuals:
+            period_list = payload.periods if payload.periods is not None else uploaded.get(company.id, [])
+            if period_list:
+                items.append((company, "actuals", period_list))
+        if payload.include_forecasts:
+            configured = scenarios.get(company.id, [])
+            wanted = configured if payload.scenarios is None else [s for s in payload.scenarios if s in configured]
+            items.extend((company, "forecast", scenario) for scenario in wanted)
+    return items
+
+def _gather(db: Session, company, kind: str, target, flags: tuple):
+    """Statement data for one workbook as (key_parts, filename, sheets) or None if empty."""
+    if kind == "actuals":
+        sheets = actuals_sheets(
+            target,
+            get_income_statement(company.id, target, db) if flags[0] else [],
+            get_balance_sheet(company.id, target, db) if flags[1] else [],
+            get_cash_flow(company.id, target, db) if flags[2] else [],
+            *flags,
+        )
+        filename = export_filename(*flags, "Actuals", full="Full_Financial_Report_Actuals")
+        return actuals_key_parts(db, company, target, *flags), filename, sheets
+
+    data = get_forecast_statements(company.id, target, db)
+    if not data.get("projections"):
+        return None
+    filename = export_filename(*flags, target.capitalize(), full=f"Full_Forecast_{target.capitalize()}")
+    return forecast_key_parts(db, company, target, *flags), filename, forecast_sheets(data, target, *flags)
+
+def _new_job(total: int) -> dict:
+    return {
+        "job_id": uuid.uuid4().hex,
+        "status": "queued",
+        "total": total,
+        "completed": 0,
+        "cached": 0,
+        "skipped": 0,
+        "errors": [],
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "finished_at": None,
+        "elapsed_ms": None,
+        "archive_path": None,
+        "_finished": None,   # epoch seconds, for expiry
+    }
+
+def run_batch_export(job: dict, payload: BatchExportIn) -> None:
+    """
+    Build the job's ZIP.
+
+    Statement data is gathered here (the DB session cannot cross processes);
+    sheet specs are rendered in the process pool, and each finished workbook
+    is written into the archive as it completes. If a worker dies, the pool is
+    discarded and the remaining workbooks are rendered in this thread. Workbooks already in the
+    artifact cache are copied straight in, and new ones are added to it.
+    """
+    started = time.perf_counter()
+    job["status"] = "running"
+    flags = (payload.include_is, payload.include_bs, payload.include_cf)
+    BATCH_DIR.mkdir(parents=True, exist_ok=True)
+    archive_path = BATCH_DIR / f"{job['job_id']}.zip"
+    db = SessionLocal()
+    try:
+        # XLSX files are already deflated, so they are stored as-is
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_STORED) as archive:
+
+            def add_rendered(key, arcname, label, tmp_name, render_result):
+                try:
+                    render_result()
+                    archive.write(tmp_name, arcname)
+                    if artifacts.enabled:
+                        artifacts.adopt(key, ".xlsx", tmp_name)
+                    else:
+                        os.unlink(tmp_name)
+                    job["completed"] += 1
+                except Exception as exc:
+                    job["errors"].append({"item": label, "error": str(exc)})
+                    if os.path.exists(tmp_name):
+                        os.unlink(tmp_name)
+
+            pending = {}
+            used_names = set()
+            pool = _get_pool() if BATCH_WORKERS > 0 else None
+            for company, kind, target in _plan(db, payload):
+                label = f"{company.name} / {'Actuals' if kind == 'actuals' else target}"
+                try:
+                    gathered = _gather(db, company, kind, target, flags)
+                except Exception as exc:
+                    job["errors"].append({"item": label, "error": str(exc)})
+                    continue
+                if gathered is None:
+                    job["skipped"] += 1
+                    continue
+                key_parts, filename, sheets = gathered
+                key = artifacts.artifact_key(**key_parts)
+                arcname = f"{_folder_name(company.name)}/{filename}"
+                # Scenario names differing only in case map to the same file name
+                stem, n = arcname[:-len(".xlsx")], 2
+                while arcname in used_names:
+                    arcname, n = f"{stem}_{n}.xlsx", n + 1
+                used_names.add(arcname)
+                cached = artifacts.lookup(key, ".xlsx") if artifacts.enabled else None
+                if cached is not None:
+                    archive.write(cached, arcname)
+                    job["completed"] += 1
+                    job["cached"] += 1
+                    continue
+                tmp_name = artifacts.temp_path()
+                args = (sheets, currency_symbol(company), tmp_name)
+                if pool is not None:
+                    try:
+                        pending[pool.submit(excel.render_to_path, *args)] = (key, arcname, label, tmp_name, args)
+                        continue
+                    except BrokenProcessPool:
+                        _discard_pool(pool)
+                        pool = None
+                add_rendered(key, arcname, label, tmp_name, lambda: excel.render_to_path(*args))
+
+            # Archive workbooks in the order they finish rendering
+            for future in as_completed(pending):
+                key, arcname, label, tmp_name, args = pending[future]
+                render = future.result
+                if isinstance(future.exception(), BrokenProcessPool):
+                    if pool is not None:
+                        _discard_pool(pool)
+                        pool = None
+                    render = lambda args=args: excel.render_to_path(*args)
+                add_rendered(key, arcname, label, tmp_name, render)
+        job["archive_path"] = str(archive_path)
+        job["status"] = "completed" if job["completed"] or not job["errors"] else "failed"
+    except Exception as exc:
+        job["status"] = "failed"
+        job["errors"].append({"item": None, "error": str(exc)})
+    finally:
+        db.close()
+        job["finished_at"] = datetime.now(timezone.utc).isoformat()
+        job["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        job["_finished"] = time.time()
+        artifacts.evict()
+
+def _job_status(job: dict) -> dict:
+    view = {k: v for k, v in job.items() if k not in ("archive_path", "_finished")}
+    view["download_url"] = f"{router.prefix}/{job['job_id']}/download" if job["status"] == "completed" else None
+    return view
+
+# ── Endpoints ─────────────────────────────────────────────────────────────────
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+def start_batch_export(payload: BatchExportIn, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Queue an export of companies × scenarios (and actuals) into one ZIP."""
+    require_statements(payload.include_is, payload.include_bs, payload.include_cf)
+    if not (payload.include_forecasts or payload.include_actuals):
+        raise HTTPException(status_code=400, detail="Select forecasts, actuals or both to export.")
+    items = _plan(db, payload)
+    if not items:
+        raise HTTPException(status_code=400, detail="Nothing to export for the selected companies.")
+
+    _prune_expired()
+    job = _new_job(len(items))
+    with _jobs_lock:
+        export_jobs[job["job_id"]] = job
+    background_tasks.add_task(run_batch_export, job, payload)
+    return _job_status(job)
+
+@router.get("/{job_id}")
+def get_batch_export(job_id: str):
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return _job_status(job)
+
+@router.get("/{job_id}/download")
+def download_batch_export(job_id: str):
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job["status"] != "completed" or not job["archive_path"] or not os.path.exists(job["archive_path"]):
+        raise HTTPException(status_code=409, detail=f"Export job is {job['status']}.")
+    return FileResponse(
+        job["archive_path"],
+        media_type="application/zip",
+        filename=f"Batch_Export_{job['created_at'][:10]}.zip"
+    )
@@ -0,0 +1,346 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.sql import func
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel, Field
+import time
+import numpy as np
+
+from .. import cache, consolidation, fx, models
+from ..database import get_db
+
+router = APIRouter(
+    prefix="/api/v1/consolidation-groups",
+    tags=["Consolidation"]
+)
+
+# ── Pydantic schemas (local, lightweight) ─────────────────────────────────────
+
+class MemberIn(BaseModel):
+    company_id: str
+    ownership_pct: int = Field(10000, ge=1, le=10000)   # basis points: 10000 = wholly owned
+
+class IntercompanyPairIn(BaseModel):
+    company_id: str
+    account_number: str
+    counterparty_company_id: str
+    counterparty_account_number: str
+
+class ConsolidationGroupIn(BaseModel):
+    name: str
+    parent_company_id: str
+    # The parent is always a wholly owned member; listing it is optional
+    members: List[MemberIn] = []
+    intercompany_pairs: List[IntercompanyPairIn] = []
+
+class MemberOut(MemberIn):
+    model_config = {"from_attributes": True}
+
+class IntercompanyPairOut(IntercompanyPairIn):
+    model_config = {"from_attributes": True}
+
+class ConsolidationGroupOut(BaseModel):
+    id: str
+    name: str
+    parent_company_id: str
+    version: int
+    members: List[MemberOut]
+    intercompany_pairs: List[IntercompanyPairOut]
+    model_config = {"from_attributes": True}
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _get_group(db: Session, group_id: str) -> models.ConsolidationGroup:
+    group = db.query(models.ConsolidationGroup).options(
+        selectinload(models.ConsolidationGroup.members),
+        selectinload(models.ConsolidationGroup.intercompany_pairs),
+    ).filter(models.ConsolidationGroup.id == group_id).first()
+    if not group:
+        raise HTTPException(status_code=404, detail="Consolidation group not found")
+    return group
+
+def _apply(db: Session, group: models.ConsolidationGroup, payload: ConsolidationGroupIn) -> None:
+    """Validate `payload` and replace the group's name, members and eliminations with it."""
+    members = {m.company_id: m.ownership_pct for m in payload.members}
+    if len(members) != len(payload.members):
+        raise HTTPException(status_code=400, detail="A company can only be a member once.")
+    if members.setdefault(payload.parent_company_id, 10000) != 10000:
+        raise HTTPException(status_code=400, detail="The parent company must be wholly owned (10000 bp).")
+    found = {row[0] for row in db.query(models.Company.id).filter(models.Company.id.in_(members))}
+    missing = set(members) - found
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Companies not found: {', '.join(sorted(missing))}")
+    for pair in payload.intercompany_pairs:
+        if pair.company_id not in members or pair.counterparty_company_id not in members:
+            raise HTTPException(status_code=400, detail="Intercompany pairs must be between group members.")
+        if pair.company_id == pair.counterparty_company_id:
+            raise HTTPException(status_code=400, detail="An intercompany pair needs two different members.")
+
+    group.name = payload.name
+    group.parent_company_id = payload.parent_company_id
+    group.members = [
+        models.ConsolidationMember(company_id=company_id, ownership_pct=pct) for company_id, pct in members.items()
+    ]
+    group.intercompany_pairs = [models.IntercompanyPair(**pair.model_dump()) for pair in payload.intercompany_pairs]
+    group.version = (group.version or 0) + 1
+
+def _query_member_activity(db: Session, company_ids: List[str]) -> list:
+    """Monthly activity of every member by master account (None = unmapped), in one grouped query."""
+    master = models.MasterChartOfAccount
+    return db.query(
+        models.CompanyAccount.company_id,
+        models.ReportingPeriod.period_date,
+        master.account_code,
+        master.category,
+        func.sum(models.TrialBalanceEntry.balance),
+    ).select_from(models.TrialBalanceEntry).join(
+        models.CompanyAccount,
+        models.TrialBalanceEntry.company_account_id == models.CompanyAccount.id
+    ).join(
+        models.ReportingPeriod,
+        models.TrialBalanceEntry.reporting_period_id == models.ReportingPeriod.id
+    ).outerjoin(
+        models.AccountMapping,
+        models.CompanyAccount.id == models.AccountMapping.company_account_id
+    ).outerjoin(
+        master,
+        models.AccountMapping.master_account_id == master.id
+    ).filter(
+        models.CompanyAccount.company_id.in_(company_ids)
+    ).group_by(models.CompanyAccount.company_id, models.ReportingPeriod.period_date, master.id).all()
+
+def _query_intercompany_activity(db: Session, accounts: set) -> list:
+    """Monthly activity of the paired intercompany accounts, as (company, period, master code, cents)."""
+    if not accounts:
+        return []
+    master = models.MasterChartOfAccount
+    return db.query(
+        models.CompanyAccount.company_id,
+        models.ReportingPeriod.period_date,
+        master.account_code,
+        func.sum(models.TrialBalanceEntry.balance),
+    ).select_from(models.TrialBalanceEntry).join(
+        models.CompanyAccount,
+        models.TrialBalanceEntry.company_account_id == models.CompanyAccount.id
+    ).join(
+        models.ReportingPeriod,
+        models.TrialBalanceEntry.reporting_period_id == models.ReportingPeriod.id
+    ).outerjoin(
+        models.AccountMapping,
+        models.CompanyAccount.id == models.AccountMapping.company_account_id
+    ).outerjoin(
+        master,
+        models.AccountMapping.master_account_id == master.id
+    ).filter(or_(*(
+        and_(models.CompanyAccount.company_id == company_id, models.CompanyAccount.import_account_number == number)
+        for company_id, number in sorted(accounts)
+    ))).group_by(models.CompanyAccount.id, models.ReportingPeriod.period_date).all()
+
+def _consolidate_group(db: Session, group: models.ConsolidationGroup, currencies: dict, currency: str, rates: dict) -> dict:
+    """Consolidated arrays in `currency` for every period the members have uploaded."""
+    member_ids = [m.company_id for m in group.members]
+    rows = _query_member_activity(db, member_ids)
+    ic_accounts = {(p.company_id, p.account_number) for p in group.intercompany_pairs}
+    ic_accounts |= {(p.counterparty_company_id, p.counterparty_account_number) for p in group.intercompany_pairs}
+    ic_rows = _query_intercompany_activity(db, ic_accounts)
+
+    periods = sorted({row[1] for row in rows})
+    period_index = {d: i for i, d in enumerate(periods)}
+    member_index = {company_id: i for i, company_id in enumerate(member_ids)}
+    accounts, account_index = [], {}
+    for _, _, code, category, _ in rows:
+        if code not in account_index:
+            account_index[code] = len(accounts)
+            accounts.append((code, category))
+
+    activity = np.zeros((len(member_ids), len(periods), len(accounts)), dtype=np.int64)
+    for company_id, period_date, code, _, total in rows:
+        activity[member_index[company_id], period_index[period_date], account_index[code]] += total or 0
+    eliminated = np.zeros(activity.shape, dtype=np.int64)
+    for company_id, period_date, code, total in ic_rows:
+        eliminated[member_index[company_id], period_index[period_date], account_index[code]] += total or 0
+
+    if any(currencies[company_id] != currency for company_id in member_ids):
+        activity, eliminated, accounts = _translate_members(
+            activity, eliminated, accounts, periods, [currencies[c] for c in member_ids], currency, rates
+        )
+
+    ownership = np.array([m.ownership_pct / 10000 for m in group.members])
+    return {"periods": periods, **consolidation.consolidate(activity, accounts, ownership, eliminated.sum(axis=0))}
+
+def _translate_members(activity, eliminated, accounts, periods, member_currencies, currency, rates) -> tuple:
+    """Translate each member into `currency` and add the CTA column; 400 if a needed rate is missing."""
+    closing = np.empty(activity.shape[:2])
+    average = np.empty(activity.shape[:2])
+    for j, member_currency in enumerate(member_currencies):
+        closing[j], average[j] = fx.rate_arrays(rates, member_currency, currency, periods)
+
+    # Rates are needed from each member's first uploaded month on
+    active = np.cumsum(np.abs(activity).sum(axis=-1), axis=-1) > 0
+    missing = active & (np.isnan(closing) | np.isnan(average))
+    if missing.any():
+        gaps = sorted({(member_currencies[j], periods[i]) for j, i in zip(*np.nonzero(missing))})
+        listed = ", ".join(f"{src}/{currency} {p}" for src, p in gaps[:6]) + (" ..." if len(gaps) > 6 else "")
+        raise HTTPException(status_code=400, detail=f"Missing FX rates: {listed}")
+    closing, average = np.nan_to_num(closing), np.nan_to_num(average)
+
+    translated, cta = fx.translate(activity, accounts, closing, average)
+    eliminated, _ = fx.translate(eliminated, accounts, closing, average)
+    accounts = accounts + [(fx.CTA_CODE, models.AccountCategory.EQUITY)]
+    translated = np.concatenate([translated, cta[..., None]], axis=-1)
+    eliminated = np.concatenate([eliminated, np.zeros(cta.shape, dtype=np.int64)[..., None]], axis=-1)
+    return translated, eliminated, accounts
+
+def _cents(values: np.ndarray, i: int) -> int:
+    return int(round(float(values[i])))
+
+# ── Endpoints ─────────────────────────────────────────────────────────────────
+
+@router.get("", response_model=List[ConsolidationGroupOut])
+def list_groups(db: Session = Depends(get_db)):
+    return db.query(models.ConsolidationGroup).options(
+        selectinload(models.ConsolidationGroup.members),
+        selectinload(models.ConsolidationGroup.intercompany_pairs),
+    ).order_by(models.ConsolidationGroup.name).all()
+
+@router.post("", response_model=ConsolidationGroupOut, status_code=status.HTTP_201_CREATED)
+def create_group(payload: ConsolidationGroupIn, db: Session = Depends(get_db)):
+    group = models.ConsolidationGroup()
+    _apply(db, group, payload)
+    db.add(group)
+    db.commit()
+    return _get_group(db, group.id)
+
+@router.get("/{group_id}", response_model=ConsolidationGroupOut)
+def get_group(group_id: str, db: Session = Depends(get_db)):
+    return _get_group(db, group_id)
+
+@router.put("/{group_id}", response_model=ConsolidationGroupOut)
+def update_group(group_id: str, payload: ConsolidationGroupIn, db: Session = Depends(get_db)):
+    group = _get_group(db, group_id)
+    _apply(db, group, payload)
+    db.commit()
+    return _get_group(db, group_id)
+
+@router.delete("/{group_id}")
+def delete_group(group_id: str, db: Session = Depends(get_db)):
+    db.delete(_get_group(db, group_id))
+    db.commit()
+    return {"status": "success", "message": "Consolidation group deleted."}
+
+@router.get("/{group_id}/statements")
+def get_consolidated_statements(
+    group_id: str,
+    periods: Optional[List[date]] = Query(None),
+    currency: Optional[str] = None,
+    include_members: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Consolidated income statement and balance sheet with eliminations and NCI.
+
+    All members are consolidated in full; `periods` defaults to every month
+    any member has uploaded. Amounts are in `currency` (default: the parent's);
+    members reporting in another currency are translated with the stored FX
+    rates. Results are cached until the group, a member's ledger or a rate
+    changes.
+    """
+    started = time.perf_counter()
+    group = _get_group(db, group_id)
+    companies = {
+        c.id: c for c in db.query(models.Company).filter(models.Company.id.in_([m.company_id for m in group.members]))
+    }
+    currencies = {company_id: (company.currency or "USD").upper() for company_id, company in companies.items()}
+    currency = (currency or currencies[group.parent_company_id]).upper()
+    rates = fx.rate_table(db, {(member_currency, currency) for member_currency in currencies.values()})
+
+    key = (
+        group.id, group.version, currency,
+        tuple((m.company_id, currencies[m.company_id], cache.get_data_version(db, m.company_id)) for m in group.members),
+        tuple(sorted((pair, tuple(sorted(by_period.items()))) for pair, by_period in rates.items())),
+    )
+    result = cache.consolidation_cache.get(key)
+    was_cached = result is not None
+    if result is None:
+        result = _consolidate_group(db, group, currencies, currency, rates)
+        cache.consolidation_cache.put(key, result)
+
+    index = {d: i for i, d in enumerate(result["periods"])}
+    wanted = sorted(set(periods)) if periods else result["periods"]
+    unknown = [str(p) for p in wanted if p not in index]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"No member has uploaded: {', '.join(unknown)}")
+    g, removed, members = result["group"], result["eliminations"], result["members"]
+
+    response = {
+        "group_id": group.id,
+        "name": group.name,
+        "currency": currency,
+        "members": [
+            {
+                "company_id": m.company_id,
+                "name": companies[m.company_id].name,
+                "currency": currencies[m.company_id],
+                "ownership_pct": m.ownership_pct,
+            }
+            for m in group.members
+        ],
+        "income_statement": [
+            {
+                "period": str(p),
+                "total_revenues_cents": _cents(g["revenue"], index[p]),
+                "total_expenses_cents": _cents(g["expenses"], index[p]),
+                "net_income_cents": _cents(g["net_income"], index[p]),
+                "nci_net_income_cents": _cents(g["nci_net_income"], index[p]),
+                "parent_net_income_cents": _cents(g["parent_net_income"], index[p]),
+            }
+            for p in wanted
+        ],
+        "balance_sheet": [
+            {
+                "period": str(p),
+                "total_assets_cents": _cents(g["assets"], index[p]),
+                "total_liabilities_cents": _cents(g["liabilities"], index[p]),
+                "total_equity_cents": _cents(g["equity"], index[p]),
+                "nci_equity_cents": _cents(g["nci_equity"], index[p]),
+                "parent_equity_cents": _cents(g["parent_equity"], index[p]),
+                "cash_cents": _cents(g["cash"], index[p]),
+                "cta_cents": _cents(g["cta"], index[p]),
+                "unmapped_balance_cents": _cents(g["unmapped"], index[p]),
+                "intercompany_difference_cents": _cents(g["intercompany_difference"], index[p]),
+                "is_balanced_equation": bool(g["is_balanced"][index[p]]),
+            }
+            for p in wanted
+        ],
+        "eliminations": [
+            {
+                "period": str(p),
+                "revenues_cents": _cents(removed["revenue"], index[p]),
+                "expenses_cents": _cents(removed["expenses"], index[p]),
+                "assets_cents": _cents(removed["assets"], index[p]),
+                "liabilities_cents": _cents(removed["liabilities"], index[p]),
+            }
+            for p in wanted
+        ],
+    }
+    if include_members:
+        response["member_statements"] = [
+            {
+                "company_id": m.company_id,
+                "periods": [
+                    {
+                        "period": str(p),
+                        "total_revenues_cents": _cents(members["revenue"][j], index[p]),
+                        "net_income_cents": _cents(members["net_income"][j], index[p]),
+                        "total_assets_cents": _cents(members["assets"][j], index[p]),
+                        "total_equity_cents": _cents(members["equity"][j], index[p]),
+                    }
+                    for p in wanted
+                ],
+            }
+            for j, m in enumerate(group.members)
+        ]
+    response["cached"] = was_cached
+    response["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return response
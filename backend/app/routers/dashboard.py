@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import date
-from typing import List, Dict, Any
+from typing import Optional
+import time
+import numpy as np
 
+from .. import kpi, ratios
 from ..database import get_db
-from .statements import get_income_statement, get_cash_flow
-from .forecast import get_forecast_statements
-from .periods import get_periods
+from .forecast import get_forecast_statements, query_history
 
 router = APIRouter(
     prefix="/api/v1/companies/{company_id}/dashboard",
@@ -15,47 +16,26 @@ router = APIRouter(
 
 @router.get("/summary")
 def get_dashboard_summary(company_id: str, scenario: str = "base", db: Session = Depends(get_db)):
-    # 1. Get historical periods
-    historical_dates = get_periods(company_id, db)
-    historical_dates.sort()
- 
-    # 2. Fetch Statements
-    is_actuals = get_income_statement(company_id, historical_dates, db)
-    cf_actuals = get_cash_flow(company_id, historical_dates, db)
+    # Actuals: precomputed per period, maintained on every ledger change (see app.kpi)
+    results = [
+        {
+            "period": str(row.period_date),
+            "revenue": row.revenue_cents,
+            "ebitda": row.ebitda_cents,
+            "net_income": row.net_income_cents,
+            "cash": row.cash_cents,
+            "type": "actual"
+        }
+        for row in kpi.series(db, company_id)
+    ]
 
-    # 3. Fetch Forecast (Dynamic Scenario)
-    projections = []
+    # Forecast (dynamic scenario, served from the forecast cache); a scenario
+    # that cannot be projected leaves the dashboard showing actuals only
     try:
-        forecast_data = get_forecast_statements(company_id, scenario, db)
-        projections = forecast_data.get("projections", [])
-    except:
-        pass
-
-    results = []
-
-    # Map Actuals
-    for is_entry in is_actuals:
-        p_str = is_entry["period"]
-        revenue = is_entry.get("total_revenues_cents", 0)
-        expenses = is_entry.get("total_expenses_cents", 0)
-        net_income = is_entry.get("net_income_cents", 0)
-        
-        # EBITDA for actuals: Rev - Expenses (Approximate for MVP)
-        ebitda = revenue - expenses
-        
-        cf_entry = next((c for c in cf_actuals if c["period"] == p_str), {})
-        ending_cash = cf_entry.get("ending_cash_cents", 0)
+        projections = get_forecast_statements(company_id, scenario, db).get("projections", [])
+    except HTTPException:
+        projections = []
 
-        results.append({
-            "period": p_str,
-            "revenue": revenue,
-            "ebitda": ebitda,
-            "net_income": net_income,
-            "cash": ending_cash,
-            "type": "actual"
-        })
-
-    # Map Forecasts
     for p in projections:
         results.append({
             "period": p["period"],
@@ -67,3 +47,26 @@ def get_dashboard_summary(company_id: str, scenario: str = "base", db: Session =
         })
 
     return results
+
+@router.get("/ratios")
+def get_financial_ratios(
+    company_id: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    """Margins, working capital days, liquidity, leverage and cash runway for every period.
+
+    Computed from the full history (balances and trailing windows need it),
+    then limited to `start`..`end`. See app.ratios for definitions.
+    """
+    started = time.perf_counter()
+    periods, accounts, history = query_history(db, company_id, end)
+    values = ratios.compute(periods, accounts, history)
+    keep = np.array([start is None or p >= start for p in periods], dtype=bool)
+    return {
+        "periods": [str(p) for p, k in zip(periods, keep) if k],
+        "units": ratios.RATIOS,
+        "ratios": {name: ratios.to_json(values[name][keep], unit) for name, unit in ratios.RATIOS.items()},
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
@@ -0,0 +1,44 @@
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from .. import slow_queries
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["Debug"]
+)
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _require_slow_query_log() -> None:
+    if not slow_queries.ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Slow-query log is disabled; set SLOW_QUERY_MS to a threshold in milliseconds."
+        )
+
+
+# ── Endpoints ─────────────────────────────────────────────────────────────────
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    order_by: Literal["total_ms", "max_ms", "count"] = "total_ms",
+    limit: int = Query(20, ge=1, le=500),
+):
+    """Statements over the slow-query threshold since startup, grouped by shape, worst first."""
+    _require_slow_query_log()
+    return {
+        "threshold_ms": slow_queries.THRESHOLD_MS,
+        "log_path": str(slow_queries.LOG_PATH),
+        "queries": slow_queries.worst(order_by, limit),
+    }
+
+
+@router.delete("/slow-queries")
+def reset_slow_queries():
+    """Clear the in-process totals; the log file is kept."""
+    _require_slow_query_log()
+    slow_queries.reset()
+    return {"status": "success"}
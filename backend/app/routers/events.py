@@ -0,0 +1,53 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+import asyncio
+import json
+
+from .. import events, models
+from ..database import SessionLocal
+
+router = APIRouter(
+    prefix="/api/v1/companies/{company_id}/events",
+    tags=["Events"]
+)
+
+# A comment line keeps idle connections (and proxies in between) open
+KEEPALIVE_SECONDS = 15
+# EventSource reconnect delay after a dropped connection
+RETRY_MS = 3000
+
+def _format_event(message: dict) -> str:
+    return f"id: {message['id']}\nevent: {message['type']}\ndata: {json.dumps(message)}\n\n"
+
+async def _event_stream(request: Request, company_id: str):
+    queue = events.subscribe(company_id)
+    try:
+        yield f"retry: {RETRY_MS}\n: connected\n\n"
+        while not await request.is_disconnected():
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield _format_event(message)
+    finally:
+        events.unsubscribe(company_id, queue)
+
+@router.get("")
+def stream_company_events(company_id: str, request: Request):
+    """
+    Server-Sent Events stream of a company's data changes.
+
+    Each event names what changed and the affected periods (see app.events),
+    so clients refetch only those slices instead of polling every statement.
+    """
+    # Short-lived session: a request-scoped one would hold a connection for the stream's lifetime
+    with SessionLocal() as db:
+        found = db.get(models.Company, company_id) is not None
+    if not found:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return StreamingResponse(
+        _event_stream(request, company_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
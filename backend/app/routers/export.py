@@ -1,14 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import date
-import io
-import openpyxl
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from typing import Callable, List
+import time
 
+from .. import artifacts, cache, excel, models, pdf
 from ..database import get_db
-from .forecast import get_forecast_statements
+from .forecast import config_fingerprint, get_forecast_statements
 from .statements import get_income_statement, get_balance_sheet, get_cash_flow
 
 router = APIRouter(
@@ -16,331 +15,342 @@ router = APIRouter(
     tags=["Export"]
 )
 
-# Shared styles
-bold_font = Font(bold=True)
-header_font = Font(bold=True, size=12, color="FFFFFF")
-title_font = Font(bold=True, size=16, color="333333")
-right_align = Alignment(horizontal="right")
-center_align = Alignment(horizontal="center", wrap_text=True, vertical="center")
-bottom_border = Border(bottom=Side(style='thin', color="CCCCCC"))
-all_border = Border(bottom=Side(style='thin', color="EEEEEE"), top=Side(style='thin', color="EEEEEE"))
-header_fill = PatternFill(start_color="1E293B", end_color="1E293B", fill_type="solid")
-# Standard Excel Accounting format template
-# We'll replace the $ with the actual currency symbol at runtime
-ACCOUNTING_FORMAT_TEMPLATE = '_("{symbol}"* #,##0_);_("{symbol}"* (#,##0);_("{symbol}"* "-"_);_(@_)'
-
-def add_title(sheet, title_text, col_span):
-    sheet.append([title_text])
-    sheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=col_span)
-    cell = sheet.cell(row=1, column=1)
-    cell.font = title_font
-    cell.alignment = Alignment(horizontal="left", vertical="center")
-    sheet.row_dimensions[1].height = 25
-
-def add_header(sheet, columns):
-    sheet.append(columns)
-    row = sheet.max_row
-    for cell in sheet[row]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.border = bottom_border
-        if cell.column > 1:
-            cell.alignment = center_align
-
-def format_row(sheet, row_idx, symbol="$", is_bold=False):
-    for cell in sheet[row_idx]:
-        if cell.column > 1:
-            cell.number_format = ACCOUNTING_FORMAT_TEMPLATE.format(symbol=symbol)
-        if is_bold:
-            cell.font = bold_font
+STATEMENT_FILE_NAMES = {
+    "IS": "Income_Statement",
+    "BS": "Balance_Sheet",
+    "CF": "Cash_Flow"
+}
 
-@router.get("/excel")
-def export_forecast_excel(
-    company_id: str, 
-    scenario: str = "base", 
-    include_is: bool = True,
-    include_bs: bool = True,
-    include_cf: bool = True,
-    db: Session = Depends(get_db)
-):
-    from ..models import Company
-    company = db.query(Company).filter(Company.id == company_id).first()
+# Export format -> (media type, renderer taking (sheets, symbol, fileobj))
+EXPORT_FORMATS = {
+    "xlsx": (excel.XLSX_MEDIA_TYPE, excel.render_workbook),
+    "pdf": ("application/pdf", pdf.render_pdf),
+}
+
+def _get_company(db: Session, company_id: str):
+    company = db.query(models.Company).filter(models.Company.id == company_id).first()
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
-    
-    currency_symbol = company.currency if company.currency != "USD" else "$"
+    return company
 
-    # 1. Fetch data dictionary from the existing forecasting engine
-    data = get_forecast_statements(company_id, scenario, db)
-    
-    actuals = data.get("actuals", {})
-    projections = data.get("projections", [])
-    if not projections:
-        raise HTTPException(status_code=400, detail="No projection data found to export.")
+def currency_symbol(company) -> str:
+    return company.currency if company.currency != "USD" else "$"
+
+def export_filename(include_is: bool, include_bs: bool, include_cf: bool, suffix: str, full: str, fmt: str = "xlsx") -> str:
+    """Descriptive file name from the statements selected for export (`full` has no extension)."""
+    flags = {"IS": include_is, "BS": include_bs, "CF": include_cf}
+    selected = [STATEMENT_FILE_NAMES[s] for s in ["IS", "BS", "CF"] if flags[s]]
+    if len(selected) == 3:
+        return f"{full}.{fmt}"
+    return f"{'_'.join(selected)}_{suffix}.{fmt}"
+
+def require_statements(include_is: bool, include_bs: bool, include_cf: bool) -> None:
+    if not (include_is or include_bs or include_cf):
+        raise HTTPException(status_code=400, detail="Select at least one statement to export.")
+
+def export_response(
+    key_parts: dict, suffix: str, media_type: str, filename: str,
+    render: Callable, background_tasks: BackgroundTasks
+):
+    """
+    Serve an export from the artifact cache, rendering it on a miss.
 
+    `key_parts` must cover everything the file depends on; `render(fileobj)`
+    only runs (and only queries statements) when there is no cached copy.
+    Freshly rendered responses report X-Data-Ms (statement queries, when
+    `render` returns "data_ms"), X-Render-Ms (the rest) and X-Render-Pages
+    when the renderer counts pages.
+    """
+    headers = {}
+
+    def timed_render(fileobj):
+        started = time.perf_counter()
+        metrics = render(fileobj) or {}
+        total_ms = (time.perf_counter() - started) * 1000
+        data_ms = metrics.get("data_ms", 0.0)
+        if "data_ms" in metrics:
+            headers["X-Data-Ms"] = f"{data_ms:.1f}"
+        headers["X-Render-Ms"] = f"{total_ms - data_ms:.1f}"
+        if "pages" in metrics:
+            headers["X-Render-Pages"] = str(metrics["pages"])
+
+    if not artifacts.enabled:
+        spooled = excel.spool(timed_render)
+        headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return StreamingResponse(excel.iter_chunks(spooled), media_type=media_type, headers=headers)
+    path, was_cached = artifacts.get_or_create(artifacts.artifact_key(**key_parts), suffix, timed_render)
+    if not was_cached:
+        background_tasks.add_task(artifacts.evict)
+    headers["X-Export-Cache"] = "hit" if was_cached else "miss"
+    return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
+
+def forecast_key_parts(
+    db: Session, company, scenario: str, include_is: bool, include_bs: bool, include_cf: bool, fmt: str = "xlsx"
+) -> dict:
+    """Artifact cache key inputs for a forecast export."""
+    config = db.query(models.ForecastConfig).filter(
+        models.ForecastConfig.company_id == company.id,
+        models.ForecastConfig.scenario_name == scenario
+    ).first()
+    return {
+        "kind": f"forecast_{fmt}",
+        "company_id": company.id,
+        "scenario": scenario,
+        "statements": [include_is, include_bs, include_cf],
+        "currency": company.currency,
+        "data_version": cache.get_data_version(db, company.id),
+        "config": config_fingerprint(config) if config else None,
+    }
+
+def actuals_key_parts(
+    db: Session, company, period_list: List[date], include_is: bool, include_bs: bool, include_cf: bool, fmt: str = "xlsx"
+) -> dict:
+    """Artifact cache key inputs for an actuals export."""
+    return {
+        "kind": f"actuals_{fmt}",
+        "company_id": company.id,
+        "periods": period_list,
+        "statements": [include_is, include_bs, include_cf],
+        "currency": company.currency,
+        "data_version": cache.get_data_version(db, company.id),
+    }
+
+# ── Sheet builders (plain data, rendered by app.excel) ───────────────────────
+
+def forecast_sheets(data: dict, scenario: str, include_is: bool, include_bs: bool, include_cf: bool) -> list:
+    """Sheet specs for a /forecast/statements payload."""
+    actuals = data.get("actuals", {})
+    projections = data["projections"]
     base_period = data["base_period"]
-    
+
     # Header row: 'Metric', 'Actuals (Date)', 'Forecast (Date1)', 'Forecast (Date2)'...
-    headers = ["Metric", f"Actuals\n{base_period}"]
-    for p in projections:
-        headers.append(f"Forecast\n{p['period']}")
-
-    # 2. Setup Workbook
-    wb = openpyxl.Workbook()
-    # Remove default sheet
-    wb.remove(wb.active)
-    total_cols = len(headers)
-    
-    # ── INCOME STATEMENT ──
+    columns = ["Metric", f"Actuals\n{base_period}"] + [f"Forecast\n{p['period']}" for p in projections]
+
+    def r(actual_cents, key, flip_sign=False):
+        sign = -1 if flip_sign else 1
+        return [actual_cents / 100.0] + [sign * p[key] / 100.0 for p in projections]
+
+    def sheet(title, rows):
+        return {
+            "title": title,
+            "heading": f"Automated 3-Statement Modeler - {title} ({scenario.capitalize()} Scenario)",
+            "columns": columns,
+            "rows": rows,
+            "value_width": 22,
+        }
+
+    sheets = []
     if include_is:
-        ws_is = wb.create_sheet("Income Statement")
-        add_title(ws_is, f"Automated 3-Statement Modeler - Income Statement ({scenario.capitalize()} Scenario)", total_cols)
-        add_header(ws_is, headers)
-        ws_is.freeze_panes = "B3"
-        
-        def r(actual_val, key, flip_sign=False):
-            row = [actual_val]
-            for p in projections:
-                val = p[key] / 100.0  # Convert cents to dollars
-                row.append(-val if flip_sign else val)
-            return row
-
-        ws_is.append(["Revenue"] + r(actuals.get("revenue_cents", 0) / 100.0, "revenue_cents"))
-        ws_is.append(["COGS"] + r(-(actuals.get("revenue_cents", 0)*0 / 100.0), "cogs_cents", flip_sign=True)) # Just ensuring logic
-        ws_is.append(["Gross Profit"] + r(0, "gross_profit_cents"))
-        format_row(ws_is, ws_is.max_row, symbol=currency_symbol, is_bold=True)
-        
-        ws_is.append(["Operating Expenses"] + r(-(actuals.get("expenses_cents", 0) / 100.0), "opex_cents", flip_sign=True))
-        ws_is.append(["EBITDA"] + r(0, "ebitda_cents"))
-        format_row(ws_is, ws_is.max_row, symbol=currency_symbol, is_bold=True)
-        
-        ws_is.append(["D&A"] + r(0, "da_cents", flip_sign=True))
-        ws_is.append(["EBIT"] + r(0, "ebit_cents"))
-        format_row(ws_is, ws_is.max_row, symbol=currency_symbol, is_bold=True)
-        
-        ws_is.append(["Tax"] + r(0, "tax_cents", flip_sign=True))
-        ws_is.append(["Net Income"] + r(actuals.get("net_income_cents", 0) / 100.0, "net_income_cents"))
-        format_row(ws_is, ws_is.max_row, symbol=currency_symbol, is_bold=True)
-    
-    # ── BALANCE SHEET (Placeholder for now, but following the pattern) ──
+        sheets.append(sheet("Income Statement", [
+            ("Revenue", r(actuals.get("revenue_cents", 0), "revenue_cents"), False),
+            ("COGS", r(0, "cogs_cents", flip_sign=True), False),
+            ("Gross Profit", r(0, "gross_profit_cents"), True),
+            ("Operating Expenses", r(-actuals.get("expenses_cents", 0), "opex_cents", flip_sign=True), False),
+            ("EBITDA", r(0, "ebitda_cents"), True),
+            ("D&A", r(0, "da_cents", flip_sign=True), False),
+            ("EBIT", r(0, "ebit_cents"), True),
+            ("Interest", r(0, "interest_cents", flip_sign=True), False),
+            ("Tax", r(0, "tax_cents", flip_sign=True), False),
+            ("Net Income", r(actuals.get("net_income_cents", 0), "net_income_cents"), True),
+        ]))
+
     if include_bs:
-        ws_bs = wb.create_sheet("Balance Sheet")
-        add_title(ws_bs, f"Automated 3-Statement Modeler - Balance Sheet ({scenario.capitalize()} Scenario)", total_cols)
-        add_header(ws_bs, headers)
-        ws_bs.freeze_panes = "B3"
-        # Since we don't have full BS projection metrics in the engine yet, we'll just add headers and a note
-        ws_bs.append(["Total Assets", 0] + [0]*len(projections))
-        ws_bs.append(["Total Liabilities", 0] + [0]*len(projections))
-        ws_bs.append(["Total Equity", 0] + [0]*len(projections))
-        format_row(ws_bs, ws_bs.max_row, is_bold=True)
-    
-    # ── CASH FLOW STATEMENT ──
+        lines = data.get("balance_sheet_lines", [])
+        rows = []
+        sections = [
+            ("assets", "Total Assets", "total_assets_cents"),
+            ("liabilities", "Total Liabilities", "total_liabilities_cents"),
+            ("equity", "Total Equity", "total_equity_cents"),
+        ]
+        for section, total_label, total_key in sections:
+            for line in lines:
+                if line["section"] == section:
+                    rows.append((line["name"], [line["base_cents"] / 100.0] + [v / 100.0 for v in line["projected_cents"]], False))
+            rows.append((total_label, r(actuals.get(total_key, 0), total_key), True))
+        rows.append(("Unmapped Balances", r(actuals.get("unmapped_balance_cents", 0), "unmapped_balance_cents"), False))
+        sheets.append(sheet("Balance Sheet", rows))
+
     if include_cf:
-        ws_cf = wb.create_sheet("Cash Flow")
-        add_title(ws_cf, f"Automated 3-Statement Modeler - Cash Flow ({scenario.capitalize()} Scenario)", total_cols)
-        add_header(ws_cf, headers)
-        ws_cf.freeze_panes = "B3"
-        
-        # Internal helper for CF rows
-        def r_cf(actual_val, key, flip_sign=False):
-            row = [actual_val]
-            for p in projections:
-                val = p[key] / 100.0
-                row.append(-val if flip_sign else val)
-            return row
-    
-        ws_cf.append(["Net Income"] + r_cf(actuals.get("net_income_cents", 0) / 100.0, "net_income_cf_cents"))
-        ws_cf.append(["D&A (Add-back)"] + r_cf(0, "da_cents"))
-        ws_cf.append(["Δ Net Working Capital"] + r_cf(0, "delta_wc_cents"))
-        ws_cf.append(["Cash from Operations"] + r_cf(0, "net_cash_from_operations_cents"))
-        format_row(ws_cf, ws_cf.max_row, is_bold=True)
-        
-        ws_cf.append(["CapEx"] + r_cf(0, "capex_cents"))
-        ws_cf.append(["Cash from Investing"] + r_cf(0, "net_cash_from_investing_cents"))
-        format_row(ws_cf, ws_cf.max_row, is_bold=True)
-        
-        ws_cf.append(["Cash from Financing"] + r_cf(0, "net_cash_from_financing_cents"))
-        format_row(ws_cf, ws_cf.max_row, is_bold=True)
-        
-        ws_cf.append(["Net Change in Cash"] + r_cf(0, "net_change_in_cash_cents"))
-        ws_cf.append(["Beginning Cash"] + r_cf(actuals.get("cash_cents", 0) / 100.0, "beginning_cash_cents"))
-        ws_cf.append(["Ending Cash"] + r_cf(actuals.get("cash_cents", 0) / 100.0, "ending_cash_cents"))
-        format_row(ws_cf, ws_cf.max_row, is_bold=True)
-
-    # Clean up column widths
-    for ws in wb.worksheets:
-        ws.column_dimensions['A'].width = 45 # Even wider for "Automated 3-Statement Modeler..."
-        for col_idx in range(2, total_cols + 1):
-            ws.column_dimensions[get_column_letter(col_idx)].width = 22
-
-    # 3. Stream back to client
-    stream = io.BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-    
-    # Construct descriptive filename
-    mapping = {
-        "IS": "Income_Statement",
-        "BS": "Balance_Sheet",
-        "CF": "Cash_Flow"
-    }
-    selected = [mapping[s] for s in ["IS", "BS", "CF"] if (include_is if s=="IS" else include_bs if s=="BS" else include_cf)]
-    
-    if not selected:
-        filename = f"Forecast_{scenario.capitalize()}.xlsx"
-    elif len(selected) == 3:
-        filename = f"Full_Forecast_{scenario.capitalize()}.xlsx"
-    else:
-        filename = f"{'_'.join(selected)}_{scenario.capitalize()}.xlsx"
-
-    headers_response = {
-        'Content-Disposition': f'attachment; filename="{filename}"'
-    }
-    
-    return StreamingResponse(
-        stream, 
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers=headers_response
-    )
+        sheets.append(sheet("Cash Flow", [
+            ("Net Income", r(actuals.get("net_income_cents", 0), "net_income_cf_cents"), False),
+            ("D&A (Add-back)", r(0, "da_cents"), False),
+            ("Δ Net Working Capital", r(0, "delta_wc_cents"), False),
+            ("Cash from Operations", r(0, "net_cash_from_operations_cents"), True),
+            ("CapEx", r(0, "capex_cents"), False),
+            ("Cash from Investing", r(0, "net_cash_from_investing_cents"), True),
+            ("Debt Repayment", r(0, "debt_repayment_cents"), False),
+            ("Revolver Draw / (Repayment)", r(0, "revolver_draw_cents"), False),
+            ("Cash from Financing", r(0, "net_cash_from_financing_cents"), True),
+            ("Net Change in Cash", r(0, "net_change_in_cash_cents"), False),
+            ("Beginning Cash", r(actuals.get("cash_cents", 0), "beginning_cash_cents"), False),
+            ("Ending Cash", r(actuals.get("cash_cents", 0), "ending_cash_cents"), True),
+        ]))
+    return sheets
 
-@router.get("/actuals/excel")
-def export_actuals_excel(
-    company_id: str, 
-    periods: str,  # Comma-separated periods
-    include_is: bool = True,
-    include_bs: bool = True,
-    include_cf: bool = True,
-    db: Session = Depends(get_db)
-):
-    from ..models import Company
-    company = db.query(Company).filter(Company.id == company_id).first()
-    if not company:
-        raise HTTPException(status_code=404, detail="Company not found")
-    
-    currency_symbol = company.currency if company.currency != "USD" else "$"
+def actuals_sheets(
+    period_list: List[date], is_data: list, bs_data: list, cf_data: list,
+    include_is: bool, include_bs: bool, include_cf: bool
+) -> list:
+    """Sheet specs for the actuals statements over `period_list`."""
+    columns = ["Metric"] + period_list
+    keys = [str(p) for p in period_list]
 
-    # Convert string periods to date objects
-    try:
-        period_list = [date.fromisoformat(p) for p in periods.split(",")]
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid period format. Expected ISO (YYYY-MM-DD)")
-    
-    # Fetch Data
-    is_data = get_income_statement(company_id, period_list, db)
-    bs_data = get_balance_sheet(company_id, period_list, db)
-    cf_data = get_cash_flow(company_id, period_list, db)
-    
-    # Header row
-    headers = ["Metric"] + period_list
-    
-    wb = openpyxl.Workbook()
-    wb.remove(wb.active) # remove default
-    total_cols = len(headers)
-    
+    def pivot(data, metrics, flipped=(), totals=None):
+        # Index each statement by period once instead of scanning per metric
+        by_period = {item["period"]: item for item in data}
+        rows = []
+        for label, key in metrics:
+            sign = -1 if key in flipped else 1
+            values = [sign * by_period[p][key] / 100.0 if p in by_period else 0 for p in keys]
+            rows.append((label, values, totals is None or label in totals))
+        return rows
+
+    def sheet(title, rows):
+        return {
+            "title": title,
+            "heading": f"Financial Report - {title} (Actuals)",
+            "columns": columns,
+            "rows": rows,
+            "value_width": 15,
+        }
+
+    sheets = []
     if include_is:
-        ws = wb.create_sheet("Income Statement")
-        add_title(ws, "Financial Report - Income Statement (Actuals)", total_cols)
-        add_header(ws, headers)
-        ws.freeze_panes = "B3"
-        
-        # We need to pivot the data by metric
-        metrics = [
+        # Flip sign for expenses to show in brackets
+        sheets.append(sheet("Income Statement", pivot(is_data, [
             ("Total Revenues", "total_revenues_cents"),
             ("Total Operating Expenses", "total_expenses_cents"),
-            ("Net Income", "net_income_cents")
-        ]
-        
-        for label, key in metrics:
-            row = [label]
-            for p in periods.split(","):
-                # Find the period data
-                p_data = next((item for item in is_data if item["period"] == p), None)
-                val = (p_data[key] / 100.0) if p_data else 0
-                # Flip sign for expenses to show in brackets
-                if key == "total_expenses_cents": val = -val
-                row.append(val)
-            ws.append(row)
-            format_row(ws, ws.max_row, is_bold=(label == "Net Income"))
+            ("Net Income", "net_income_cents"),
+        ], flipped=("total_expenses_cents",), totals=("Net Income",))))
 
     if include_bs:
-        ws = wb.create_sheet("Balance Sheet")
-        add_title(ws, "Financial Report - Balance Sheet (Actuals)", total_cols)
-        add_header(ws, headers)
-        ws.freeze_panes = "B3"
-        
-        metrics = [
+        # Flip sign for Liabilities and Equity (Credits) to show in brackets
+        sheets.append(sheet("Balance Sheet", pivot(bs_data, [
             ("Total Assets", "total_assets_cents"),
             ("Total Liabilities", "total_liabilities_cents"),
-            ("Total Equity", "total_equity_cents")
-        ]
-        
-        for label, key in metrics:
-            row = [label]
-            for p in periods.split(","):
-                p_data = next((item for item in bs_data if item["period"] == p), None)
-                val = (p_data[key] / 100.0) if p_data else 0
-                # Flip sign for Liabilities and Equity (Credits) to show in brackets
-                if key in ["total_liabilities_cents", "total_equity_cents"]: val = -val
-                row.append(val)
-            ws.append(row)
-            format_row(ws, ws.max_row, symbol=currency_symbol, is_bold=True)
+            ("Total Equity", "total_equity_cents"),
+        ], flipped=("total_liabilities_cents", "total_equity_cents"))))
 
     if include_cf:
-        ws = wb.create_sheet("Cash Flow")
-        add_title(ws, "Financial Report - Cash Flow (Actuals)", total_cols)
-        add_header(ws, headers)
-        ws.freeze_panes = "B3"
-        
-        metrics = [
+        sheets.append(sheet("Cash Flow", pivot(cf_data, [
             ("Net Income", "net_income_cents"),
             ("Depreciation & Non-Cash", "non_cash_adjustments_cents"),
             ("Changes in Working Capital", "operating_wc_delta_cents"),
             ("Net Cash from Ops", "net_cash_from_operations_cents"),
             ("Net Cash from Investing", "net_cash_from_investing_cents"),
             ("Net Cash from Financing", "net_cash_from_financing_cents"),
-            ("End Balance Cash", "ending_cash_cents")
-        ]
-        
-        for label, key in metrics:
-            row = [label]
-            for p in periods.split(","):
-                p_data = next((item for item in cf_data if item["period"] == p), None)
-                val = (p_data[key] / 100.0) if p_data else 0
-                row.append(val)
-            ws.append(row)
-            format_row(ws, ws.max_row, is_bold=(label in ["Net Cash from Ops", "End Balance Cash"]))
-
-    # Clean up
-    for ws in wb.worksheets:
-        ws.column_dimensions['A'].width = 45
-        for col_idx in range(2, total_cols + 1):
-            ws.column_dimensions[get_column_letter(col_idx)].width = 15
-
-    stream = io.BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-    
-    # Construct descriptive filename
-    mapping = {
-        "IS": "Income_Statement",
-        "BS": "Balance_Sheet",
-        "CF": "Cash_Flow"
-    }
-    selected = [mapping[s] for s in ["IS", "BS", "CF"] if (include_is if s=="IS" else include_bs if s=="BS" else include_cf)]
-    
-    if not selected:
-        filename = "Financial_Statements_Actuals.xlsx"
-    elif len(selected) == 3:
-        filename = "Full_Financial_Report_Actuals.xlsx"
-    else:
-        filename = f"{'_'.join(selected)}_Actuals.xlsx"
-
-    headers_response = {
-        'Content-Disposition': f'attachment; filename="{filename}"'
-    }
-    
-    return StreamingResponse(
-        stream, 
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers=headers_response
+            ("End Balance Cash", "ending_cash_cents"),
+        ], totals=("Net Cash from Ops", "End Balance Cash"))))
+    return sheets
+
+def parse_periods(periods: str) -> List[date]:
+    try:
+        return [date.fromisoformat(p) for p in periods.split(",")]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid period format. Expected ISO (YYYY-MM-DD)")
+
+# ── Endpoints ─────────────────────────────────────────────────────────────────
+
+def _export_forecast(
+    fmt: str, background_tasks: BackgroundTasks, company_id: str, scenario: str,
+    include_is: bool, include_bs: bool, include_cf: bool, db: Session
+):
+    company = _get_company(db, company_id)
+    require_statements(include_is, include_bs, include_cf)
+    media_type, writer = EXPORT_FORMATS[fmt]
+
+    def render(fileobj):
+        started = time.perf_counter()
+        # Fetch data dictionary from the existing forecasting engine
+        data = get_forecast_statements(company_id, scenario, db)
+        if not data.get("projections"):
+            raise HTTPException(status_code=400, detail="No projection data found to export.")
+        sheets = forecast_sheets(data, scenario, include_is, include_bs, include_cf)
+        data_ms = (time.perf_counter() - started) * 1000
+        return {**(writer(sheets, currency_symbol(company), fileobj) or {}), "data_ms": data_ms}
+
+    filename = export_filename(
+        include_is, include_bs, include_cf, scenario.capitalize(),
+        full=f"Full_Forecast_{scenario.capitalize()}", fmt=fmt,
+    )
+    key_parts = forecast_key_parts(db, company, scenario, include_is, include_bs, include_cf, fmt)
+    return export_response(key_parts, f".{fmt}", media_type, filename, render, background_tasks)
+
+def _export_actuals(
+    fmt: str, background_tasks: BackgroundTasks, company_id: str, periods: str,
+    include_is: bool, include_bs: bool, include_cf: bool, db: Session
+):
+    company = _get_company(db, company_id)
+    require_statements(include_is, include_bs, include_cf)
+    period_list = parse_periods(periods)
+    media_type, writer = EXPORT_FORMATS[fmt]
+
+    def render(fileobj):
+        started = time.perf_counter()
+        # Only query the statements that are exported
+        sheets = actuals_sheets(
+            period_list,
+            get_income_statement(company_id, period_list, db) if include_is else [],
+            get_balance_sheet(company_id, period_list, db) if include_bs else [],
+            get_cash_flow(company_id, period_list, db) if include_cf else [],
+            include_is, include_bs, include_cf,
+        )
+        data_ms = (time.perf_counter() - started) * 1000
+        return {**(writer(sheets, currency_symbol(company), fileobj) or {}), "data_ms": data_ms}
+
+    filename = export_filename(
+        include_is, include_bs, include_cf, "Actuals",
+        full="Full_Financial_Report_Actuals", fmt=fmt,
     )
+    key_parts = actuals_key_parts(db, company, period_list, include_is, include_bs, include_cf, fmt)
+    return export_response(key_parts, f".{fmt}", media_type, filename, render, background_tasks)
+
+@router.get("/excel")
+def export_forecast_excel(
+    background_tasks: BackgroundTasks,
+    company_id: str,
+    scenario: str = "base",
+    include_is: bool = True,
+    include_bs: bool = True,
+    include_cf: bool = True,
+    db: Session = Depends(get_db)
+):
+    return _export_forecast("xlsx", background_tasks, company_id, scenario, include_is, include_bs, include_cf, db)
+
+@router.get("/pdf")
+def export_forecast_pdf(
+    background_tasks: BackgroundTasks,
+    company_id: str,
+    scenario: str = "base",
+    include_is: bool = True,
+    include_bs: bool = True,
+    include_cf: bool = True,
+    db: Session = Depends(get_db)
+):
+    """Forecast statement pack as a PDF; wide projections continue across column pages."""
+    return _export_forecast("pdf", background_tasks, company_id, scenario, include_is, include_bs, include_cf, db)
+
+@router.get("/actuals/excel")
+def export_actuals_excel(
+    background_tasks: BackgroundTasks,
+    company_id: str,
+    periods: str,  # Comma-separated periods
+    include_is: bool = True,
+    include_bs: bool = True,
+    include_cf: bool = True,
+    db: Session = Depends(get_db)
+):
+    return _export_actuals("xlsx", background_tasks, company_id, periods, include_is, include_bs, include_cf, db)
+
+@router.get("/actuals/pdf")
+def export_actuals_pdf(
+    background_tasks: BackgroundTasks,
+    company_id: str,
+    periods: str,  # Comma-separated periods
+    include_is: bool = True,
+    include_bs: bool = True,
+    include_cf: bool = True,
+    db: Session = Depends(get_db)
+):
+    """Actuals statement pack as a PDF; wide period ranges continue across column pages."""
+    return _export_actuals("pdf", background_tasks, company_id, periods, include_is, include_bs, include_cf, db)
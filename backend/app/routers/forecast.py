@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from datetime import date
+from types import SimpleNamespace
+import time
 from dateutil.relativedelta import relativedelta
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+import numpy as np
 
-from .. import models
+from .. import baseline, cache, events, models, projection
 from ..database import get_db
 
 router = APIRouter(
@@ -18,7 +21,7 @@ router = APIRouter(
 class ForecastConfigIn(BaseModel):
     scenario_name: str = "base"
     base_period: Optional[date] = None
-    num_periods: int = 3
+    num_periods: int = Field(3, ge=1, le=projection.MAX_CURVE_PERIODS)
     revenue_growth_pct: int = 500    # basis points: 500 = 5.00%
     cogs_pct_of_revenue: int = 6000
     opex_growth_pct: int = 300
@@ -26,98 +29,558 @@ class ForecastConfigIn(BaseModel):
     capex_cents: int = 0
     da_cents: int = 0
     wc_pct_of_revenue: int = 1000
+    interest_rate_pct: int = 0       # annual, on average term debt
+    debt_repayment_cents: int = 0    # scheduled repayment per period
+    revolver_limit_cents: int = 0    # 0 = no revolver facility
+    revolver_rate_pct: int = 0       # annual, on average drawn balance
+    min_cash_cents: int = 0          # revolver draws to keep cash at or above this
+    # Per-period values for any driver above, month 1 first; later months use the scalar
+    driver_curves: Dict[str, List[int]] = {}
+    # Rebase onto each new upload: keep num_periods, or project to the fiscal year end
+    rolling_mode: Optional[Literal["window", "fiscal_year"]] = None
+
+    @field_validator("driver_curves")
+    @classmethod
+    def check_curves(cls, curves):
+        for field, values in curves.items():
+            if field not in projection.DRIVER_FIELDS:
+                raise ValueError(f"Unknown driver: {field}")
+            if len(values) > projection.MAX_CURVE_PERIODS:
+                raise ValueError(f"{field} curve is longer than {projection.MAX_CURVE_PERIODS} periods")
+        return curves
 
 class ForecastConfigOut(ForecastConfigIn):
     id: str
     company_id: str
+    num_periods: int = 3   # rows saved before the bound still load
     model_config = {"from_attributes": True}
 
-# ── Helpers ───────────────────────────────────────────────────────────────────
+    @field_validator("driver_curves", mode="before")
+    @classmethod
+    def unpack_curves(cls, curves):
+        if curves is None or isinstance(curves, bytes):
+            return {field: values.tolist() for field, values in projection.unpack_curves(curves).items()}
+        return curves
+
+class PreviewIn(ForecastConfigIn):
+    # Reuse the previous preview's per-period state so only changed months are recomputed
+    session_id: Optional[str] = None
+
+class DriverDistribution(BaseModel):
+    """Distribution for one driver, in its stored units (basis points or cents)."""
+    distribution: Literal["fixed", "normal", "uniform", "triangular"] = "normal"
+    mean: Optional[float] = Field(None, allow_inf_nan=False)  # normal / fixed; defaults to the saved config value
+    std: float = Field(0, ge=0, allow_inf_nan=False)
+    low: Optional[float] = Field(None, allow_inf_nan=False)   # uniform / triangular
+    high: Optional[float] = Field(None, allow_inf_nan=False)
+    mode: Optional[float] = Field(None, allow_inf_nan=False)  # triangular; defaults to the saved config value
+    per_period: bool = False       # draw a new value every month instead of once per path
+
+    @model_validator(mode="after")
+    def check_bounds(self):
+        if self.distribution in ("uniform", "triangular"):
+            if self.low is None or self.high is None or self.low > self.high:
+                raise ValueError(f"{self.distribution} distribution needs low <= high.")
+            if self.mode is not None and not self.low <= self.mode <= self.high:
+                raise ValueError("Triangular mode must lie between low and high.")
+        return self
+
+class SimulationIn(BaseModel):
+    scenario: str = "base"
+    num_paths: int = Field(10000, ge=100, le=100000)
+    num_periods: Optional[int] = Field(None, ge=1, le=120)  # defaults to the saved horizon
+    seed: Optional[int] = None
+    drivers: Dict[str, DriverDistribution] = {}
 
-def _bp(basis_points: int) -> float:
-    """Convert stored basis points to a decimal ratio (500 → 0.05)."""
-    return basis_points / 10000.0
+# Outputs that sensitivity tables and goal-seek can read off a projection
+OutputMetric = Literal[
+    "ending_cash", "cumulative_net_income", "cumulative_revenue",
+    "revenue", "ebitda", "net_income",
+]
+
+class SensitivityAxis(BaseModel):
+    driver: str
+    values: List[float] = Field(..., min_length=1, max_length=200)
+
+class SensitivityIn(BaseModel):
+    scenario: str = "base"
+    x: SensitivityAxis
+    y: Optional[SensitivityAxis] = None
+    output: OutputMetric = "ending_cash"
+    period: Optional[int] = Field(None, ge=1)  # 1-based projected month; defaults to the last
+    tornado_pct: float = Field(10, gt=0, le=100)
+
+# Period-row fields compared across scenarios by /compare
+COMPARE_FIELDS = (
+    "revenue_cents", "gross_profit_cents", "ebitda_cents", "net_income_cents",
+    "net_cash_from_operations_cents", "ending_cash_cents", "net_wc_cents",
+)
+
+class GoalSeekIn(BaseModel):
+    scenario: str = "base"
+    driver: str
+    output: OutputMetric = "ending_cash"
+    # "min"/"max" apply the constraint to every month up to `period`; "at" to that month only
+    aggregate: Literal["at", "min", "max"] = "min"
+    period: Optional[int] = Field(None, ge=1)
+    constraint: Literal[">=", "<=", "=="] = ">="
+    target_cents: int = 0
+    low: Optional[float] = None    # search bracket, in the driver's stored units
+    high: Optional[float] = None
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
 
 def _get_actuals(db: Session, company_id: str, period: date) -> dict:
-    """Pull actual IS line-items for a given period from the DB."""
+    """Base-period actuals, memoized per company ledger version."""
+    key = (company_id, period, cache.get_data_version(db, company_id))
+    actuals = cache.actuals_cache.get(key)
+    if actuals is None:
+        actuals = _query_actuals(db, company_id, period)
+        cache.actuals_cache.put(key, actuals)
+    return dict(actuals)
+
+def _query_actuals(db: Session, company_id: str, period: date) -> dict:
+    """
+    Pull base-period actuals from the DB in one grouped query.
+
+    Returns the base month's revenue and expenses, inception-to-date cash and
+    net working capital (debit-positive), the inception-to-date balance of every
+    projection bucket, and the balance sheet account lines behind them.
+    """
+    from sqlalchemy import case
     from sqlalchemy.sql import func
 
-    def sumby(categories, period_start, period_end):
-        return db.query(func.sum(models.TrialBalanceEntry.balance)).join(
-            models.CompanyAccount,
-            models.TrialBalanceEntry.company_account_id == models.CompanyAccount.id
-        ).join(
-            models.AccountMapping,
-            models.CompanyAccount.id == models.AccountMapping.company_account_id
-        ).join(
-            models.MasterChartOfAccount,
-            models.AccountMapping.master_account_id == models.MasterChartOfAccount.id
-        ).join(
-            models.ReportingPeriod,
-            models.TrialBalanceEntry.reporting_period_id == models.ReportingPeriod.id
-        ).filter(
-            models.CompanyAccount.company_id == company_id,
-            models.ReportingPeriod.period_date >= period_start,
-            models.ReportingPeriod.period_date <= period_end,
-            models.MasterChartOfAccount.category.in_(categories)
-        ).scalar() or 0
-
-    # Cash = last actual period's cash (account_code "1000"), inception-to-date
-    from sqlalchemy.sql import func as f2
-    cash_result = db.query(f2.sum(models.TrialBalanceEntry.balance)).join(
+    master = models.MasterChartOfAccount
+    rows = db.query(
+        master.account_code,
+        master.name,
+        master.category,
+        master.cash_flow_category,
+        func.sum(models.TrialBalanceEntry.balance).label("itd"),
+        func.sum(case(
+            (models.ReportingPeriod.period_date == period, models.TrialBalanceEntry.balance),
+            else_=0
+        )).label("mtd"),
+    ).select_from(models.TrialBalanceEntry).join(
         models.CompanyAccount,
         models.TrialBalanceEntry.company_account_id == models.CompanyAccount.id
-    ).join(
-        models.AccountMapping,
-        models.CompanyAccount.id == models.AccountMapping.company_account_id
-    ).join(
-        models.MasterChartOfAccount,
-        models.AccountMapping.master_account_id == models.MasterChartOfAccount.id
     ).join(
         models.ReportingPeriod,
         models.TrialBalanceEntry.reporting_period_id == models.ReportingPeriod.id
+    ).outerjoin(
+        models.AccountMapping,
+        models.CompanyAccount.id == models.AccountMapping.company_account_id
+    ).outerjoin(
+        master,
+        models.AccountMapping.master_account_id == master.id
     ).filter(
         models.CompanyAccount.company_id == company_id,
-        models.ReportingPeriod.period_date <= period,
-        models.MasterChartOfAccount.account_code == "1000"
-    ).scalar() or 0
+        models.ReportingPeriod.period_date <= period
+    ).group_by(master.id).order_by(master.account_code).all()
 
-    revenue_raw = sumby([models.AccountCategory.REVENUE], period, period)
-    expense_raw = sumby([models.AccountCategory.EXPENSE], period, period)
+    revenue_raw = 0
+    expense_raw = 0
+    balances = {bucket: 0 for bucket in projection.BALANCE_BUCKETS}
+    lines = []
+    for code, name, category, cf_category, itd, mtd in rows:
+        itd, mtd = itd or 0, mtd or 0
+        if category == models.AccountCategory.REVENUE:
+            revenue_raw += mtd
+        elif category == models.AccountCategory.EXPENSE:
+            expense_raw += mtd
+        bucket = projection.balance_bucket(code, category, cf_category)
+        balances[bucket] += itd
+        if category in (models.AccountCategory.ASSET, models.AccountCategory.LIABILITY, models.AccountCategory.EQUITY):
+            lines.append({
+                "account_code": code,
+                "name": name,
+                "category": category.value,
+                "bucket": bucket,
+                "balance": itd,
+            })
 
     # Revenue credits are negative in TB; flip to positive for display
-    revenue = revenue_raw * -1
-    expenses = expense_raw  # expenses are positive debits
+    return {
+        "revenue": revenue_raw * -1,
+        "expenses": expense_raw,  # expenses are positive debits
+        # Working capital = operating current assets (excl cash) + current liabilities, as a debit balance
+        "net_wc": balances["working_capital_assets"] + balances["working_capital_liabilities"],
+        "cash": balances["cash"],
+        "balances": balances,
+        "lines": lines,
+    }
 
-    # Working capital = current assets (excl cash) + current liabilities
-    wc_assets = db.query(func.sum(models.TrialBalanceEntry.balance)).join(
+def query_history(db: Session, company_id: str, through: Optional[date]) -> tuple:
+    """
+    Monthly activity of every mapped master account in one grouped query.
+
+    Returns the period dates, the master accounts as (code, name, category,
+    sub_category, bucket) and a (periods × accounts) matrix of cents.
+    """
+    from sqlalchemy.sql import func
+
+    master = models.MasterChartOfAccount
+    query = db.query(
+        models.ReportingPeriod.period_date,
+        master.account_code,
+        master.name,
+        master.category,
+        master.sub_category,
+        master.cash_flow_category,
+        func.sum(models.TrialBalanceEntry.balance),
+    ).select_from(models.TrialBalanceEntry).join(
         models.CompanyAccount,
         models.TrialBalanceEntry.company_account_id == models.CompanyAccount.id
+    ).join(
+        models.ReportingPeriod,
+        models.TrialBalanceEntry.reporting_period_id == models.ReportingPeriod.id
     ).join(
         models.AccountMapping,
         models.CompanyAccount.id == models.AccountMapping.company_account_id
     ).join(
-        models.MasterChartOfAccount,
-        models.AccountMapping.master_account_id == models.MasterChartOfAccount.id
-    ).join(
-        models.ReportingPeriod,
-        models.TrialBalanceEntry.reporting_period_id == models.ReportingPeriod.id
-    ).filter(
-        models.CompanyAccount.company_id == company_id,
-        models.ReportingPeriod.period_date == period,
-        models.MasterChartOfAccount.cash_flow_category == models.CashFlowCategory.OPERATING,
-        models.MasterChartOfAccount.category.in_([models.AccountCategory.ASSET, models.AccountCategory.LIABILITY]),
-        models.MasterChartOfAccount.account_code != "1000"
-    ).scalar() or 0
-    net_wc = wc_assets * -1
+        master,
+        models.AccountMapping.master_account_id == master.id
+    ).filter(models.CompanyAccount.company_id == company_id)
+    if through:
+        query = query.filter(models.ReportingPeriod.period_date <= through)
+    rows = query.group_by(models.ReportingPeriod.period_date, master.id).all()
+
+    periods = sorted({row[0] for row in rows})
+    period_index = {d: i for i, d in enumerate(periods)}
+    accounts = []
+    account_index = {}
+    history = np.zeros((len(periods), 0))
+    cells = []
+    for period_date, code, name, category, sub_category, cf_category, total in rows:
+        if code not in account_index:
+            account_index[code] = len(accounts)
+            accounts.append((code, name, category, sub_category, projection.balance_bucket(code, category, cf_category)))
+        cells.append((period_index[period_date], account_index[code], total or 0))
+    if cells:
+        i, j, values = np.array(cells, dtype=np.int64).T
+        history = np.zeros((len(periods), len(accounts)))
+        history[i, j] = values
+    return periods, accounts, history
+
+def _load_config(db: Session, company_id: str, scenario: str):
+    return db.query(models.ForecastConfig).filter(
+        models.ForecastConfig.company_id == company_id,
+        models.ForecastConfig.scenario_name == scenario
+    ).first()
+
+def _require_projection_inputs(db: Session, company_id: str, scenario: str):
+    """Load a scenario and its base-period actuals, or raise if it cannot be projected."""
+    config = _load_config(db, company_id, scenario)
+    if not config or not config.base_period:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No forecast configured for the '{scenario}' scenario."
+        )
+    period_exists = db.query(models.ReportingPeriod.id).filter(
+        models.ReportingPeriod.company_id == company_id,
+        models.ReportingPeriod.period_date == config.base_period
+    ).first()
+    if not period_exists:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Base period {config.base_period} has no uploaded trial balance."
+        )
+    return config, _get_actuals(db, company_id, config.base_period)
+
+def _projection_rows(base: date, series: dict, path: int = 0) -> list:
+    """Turn one path of projection.project() output into /statements period rows."""
+    rows = []
+    num_periods = series["revenue_cents"].shape[1]
+    for n in range(num_periods):
+        v = {key: int(values[path, n]) for key, values in series.items()}
+        v["circularity_converged"] = bool(v["circularity_converged"])
+        rows.append({
+            "period":           str(base + relativedelta(months=n + 1)),
+            "is_forecast":      True,
+
+            # IS, CF and BS series straight from the engine
+            **v,
+
+            # Aliases kept for existing consumers
+            "net_income_cf_cents":           v["net_income_cents"],
+            "cash_cents":                    v["ending_cash_cents"],
+            "retained_earnings_delta_cents": v["net_income_cents"],
+            "is_balanced":                   v["balance_check_cents"] == 0,
+        })
+    return rows
+
+# Display names for balance sheet lines that have no master account behind them
+BUCKET_LABELS = {
+    "cash": "Cash and Cash Equivalents",
+    "working_capital_assets": "Operating Current Assets",
+    "working_capital_liabilities": "Operating Current Liabilities",
+    "fixed_assets": "Property, Plant & Equipment",
+    "accumulated_depreciation": "Accumulated Depreciation",
+    "other_assets": "Other Assets",
+    "term_debt": "Long-Term Debt",
+    "revolver": "Revolving Credit Facility",
+    "other_liabilities": "Other Liabilities",
+    "contributed_equity": "Contributed Equity",
+    "retained_earnings": "Retained Earnings",
+}
+ASSET_BUCKETS = ("cash", "working_capital_assets", "fixed_assets", "accumulated_depreciation", "other_assets")
+LIABILITY_BUCKETS = ("working_capital_liabilities", "term_debt", "revolver", "other_liabilities")
+
+def _bucket_series(series: dict, path: int = 0) -> dict:
+    """Projected bucket totals for one path, debit-positive like the trial balance."""
+    return {
+        "cash": series["ending_cash_cents"][path],
+        "working_capital_assets": series["working_capital_assets_cents"][path],
+        "working_capital_liabilities": -series["working_capital_liabilities_cents"][path],
+        "fixed_assets": series["fixed_assets_cents"][path],
+        "accumulated_depreciation": series["accumulated_depreciation_cents"][path],
+        "other_assets": series["other_assets_cents"][path],
+        "term_debt": -series["term_debt_cents"][path],
+        "revolver": -series["revolver_cents"][path],
+        "other_liabilities": -series["other_liabilities_cents"][path],
+        "contributed_equity": -series["contributed_equity_cents"][path],
+        "retained_earnings": -series["retained_earnings_cents"][path],
+    }
+
+def _balance_sheet_lines(actuals: dict, series: dict, path: int = 0) -> list:
+    """
+    Project every balance sheet account line.
+
+    Each bucket's movement is spread over its accounts in proportion to their
+    base balances, with the rounding remainder on the largest, so the lines
+    always add up to the bucket totals. Retained earnings (including un-closed
+    P&L) and the revolver are single lines.
+    """
+    by_bucket = {}
+    for line in actuals["lines"]:
+        if line["bucket"] != "retained_earnings":
+            by_bucket.setdefault(line["bucket"], []).append(line)
+    balances = dict(actuals["balances"], revolver=0)
+
+    lines = []
+    for bucket, totals in _bucket_series(series, path).items():
+        sign = 1 if bucket in ASSET_BUCKETS else -1
+        section = "assets" if bucket in ASSET_BUCKETS else "liabilities" if bucket in LIABILITY_BUCKETS else "equity"
+        accounts = by_bucket.get(bucket, [])
+        movement = totals - balances[bucket]
+
+        if not accounts:
+            if bucket == "retained_earnings":
+                code = next((l["account_code"] for l in actuals["lines"] if l["bucket"] == bucket), None)
+            elif balances[bucket] == 0 and not movement.any():
+                continue
+            else:
+                code = None
+            lines.append({
+                "account_code": code,
+                "name": BUCKET_LABELS[bucket],
+                "section": section,
+                "base_cents": sign * balances[bucket],
+                "projected_cents": [sign * int(t) for t in totals],
+            })
+            continue
+
+        base = np.array([a["balance"] for a in accounts], dtype=np.float64)
+        weights = np.abs(base)
+        weights = weights / weights.sum() if weights.sum() else np.full(len(accounts), 1 / len(accounts))
+        shares = np.trunc(np.outer(weights, movement))
+        shares[int(np.argmax(weights))] += movement - shares.sum(axis=0)
+        for account, account_base, share in zip(accounts, base, shares):
+            lines.append({
+                "account_code": account["account_code"],
+                "name": account["name"],
+                "section": section,
+                "base_cents": sign * account["balance"],
+                "projected_cents": [sign * int(v) for v in account_base + share],
+            })
+
+    order = {"assets": 0, "liabilities": 1, "equity": 2}
+    lines.sort(key=lambda l: (order[l["section"]], l["account_code"] or "~"))
+    return lines
+
+def _opening_balance_sheet(balances: dict) -> dict:
+    """Base-period balance sheet totals, presented with assets, liabilities and equity positive."""
+    total_assets = sum(balances[b] for b in ASSET_BUCKETS if b in balances)
+    total_liabilities = -sum(balances[b] for b in LIABILITY_BUCKETS if b in balances)
+    total_equity = -(balances["contributed_equity"] + balances["retained_earnings"])
+    return {
+        "total_assets_cents": total_assets,
+        "total_liabilities_cents": total_liabilities,
+        "total_equity_cents": total_equity,
+        "unmapped_balance_cents": balances["unmapped"],
+        "is_balanced": total_assets + balances["unmapped"] - total_liabilities - total_equity == 0,
+    }
+
+def _solver_summary(iterations: np.ndarray, converged: np.ndarray) -> dict:
+    """Revolver circularity stats for one path's (periods,) iteration counts and converged flags."""
+    return {
+        "tolerance_cents": projection.CIRCULARITY_TOLERANCE,
+        "max_iterations": projection.CIRCULARITY_MAX_ITERATIONS,
+        "total_iterations": int(iterations.sum()),
+        "worst_period_iterations": int(iterations.max()) if len(iterations) else 0,
+        "converged": bool(converged.all()),
+    }
+
+def _empty_statements(base_period) -> dict:
+    """/statements response for a scenario with nothing to project, with the same keys as a full one."""
+    return {
+        "base_period": str(base_period) if base_period else None,
+        "actuals": {"revenue_cents": 0, "expenses_cents": 0, "net_income_cents": 0, "cash_cents": 0, "net_wc_cents": 0},
+        "projections": [],
+        "balance_sheet_lines": [],
+        "solver": _solver_summary(np.zeros(0), np.ones(0, dtype=bool)),
+        "config": None
+    }
+
+def _statements_payload(config, actuals: dict, series: dict = None) -> dict:
+    """The /statements response for one scenario projected from its base-period actuals."""
+    if series is None:
+        series = projection.project(actuals, projection.config_drivers(config), config.num_periods)
+    iterations = series["circularity_iterations"][0]
+    converged = series["circularity_converged"][0]
 
     return {
-        "revenue": revenue,
-        "expenses": expenses,
-        "net_wc": net_wc,
-        "cash": cash_result,
+        "base_period": str(config.base_period),
+        "actuals": {
+            "revenue_cents":  actuals["revenue"],
+            "expenses_cents": actuals["expenses"],
+            "net_income_cents": (actuals["revenue"] + actuals["expenses"] * -1),
+            "cash_cents":     actuals["cash"],
+            "net_wc_cents":   actuals["net_wc"],
+            **_opening_balance_sheet(actuals["balances"]),
+        },
+        "projections": _projection_rows(config.base_period, series),
+        "balance_sheet_lines": _balance_sheet_lines(actuals, series),
+        "solver": _solver_summary(iterations, converged),
+        "config": {
+            **{field: getattr(config, field) for field in projection.DRIVER_FIELDS},
+            "driver_curves": {
+                field: values.tolist() for field, values in projection.unpack_curves(config.driver_curves).items()
+            },
+            "rolling_mode": config.rolling_mode,
+        },
     }
 
+def config_fingerprint(config) -> tuple:
+    """Everything a scenario's projection depends on besides the ledger."""
+    return (config.base_period, config.num_periods, config.driver_curves, config.rolling_mode) + tuple(
+        getattr(config, field) for field in projection.DRIVER_FIELDS
+    )
+
+def _rolling_horizon(config, base: date, fiscal_year_end: int) -> int:
+    """Projection length for a rolling scenario rebased onto `base`."""
+    if config.rolling_mode == "fiscal_year":
+        # Months left to the fiscal year end; a full year once base is the year end
+        return (fiscal_year_end - base.month) % 12 or 12
+    return config.num_periods
+
+def roll_forecasts(company_id: str) -> None:
+    """
+    Rebase every rolling scenario onto the company's latest uploaded month.
+
+    Curves shift so each month keeps its driver value, then the scenarios are
+    projected so the next /statements read is served from cache. Runs as a
+    background task after a TB upload, with its own session.
+    """
+    from sqlalchemy.sql import func
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        configs = db.query(models.ForecastConfig).filter(
+            models.ForecastConfig.company_id == company_id,
+            models.ForecastConfig.rolling_mode.isnot(None)
+        ).all()
+        if not configs:
+            return
+        latest = db.query(func.max(models.ReportingPeriod.period_date)).filter(
+            models.ReportingPeriod.company_id == company_id
+        ).scalar()
+        company = db.get(models.Company, company_id)
+        if latest is None or company is None:
+            return
+
+        for config in configs:
+            if config.base_period is not None and config.base_period >= latest:
+                continue
+            if config.base_period is not None:
+                delta = relativedelta(latest, config.base_period)
+                elapsed = delta.years * 12 + delta.months
+                config.driver_curves = projection.pack_curves({
+                    field: values[elapsed:]
+                    for field, values in projection.unpack_curves(config.driver_curves).items()
+                })
+            config.num_periods = _rolling_horizon(config, latest, company.fiscal_year_end)
+            config.base_period = latest
+            events.queue_event(db, company_id, "forecast_updated", scenario=config.scenario_name)
+        db.commit()
+
+        for config in configs:
+            get_forecast_statements(company_id, config.scenario_name, db)
+    finally:
+        db.close()
+
+def _sample_driver(rng, spec: DriverDistribution, default, paths: int, periods: int) -> np.ndarray:
+    """Draw a sample for one driver that broadcasts to (paths, periods).
+
+    `default` is the saved value: a scalar, or a (periods,) row for a driver
+    with a per-period curve, in which case a normal draw perturbs the curve.
+    """
+    size = (paths, periods if spec.per_period else 1)
+    centre = np.asarray(default if spec.mean is None else spec.mean, dtype=np.float64)
+    if spec.distribution == "fixed":
+        return np.broadcast_to(centre, (paths, periods))
+    if spec.distribution == "normal":
+        return centre + rng.normal(0.0, spec.std, size)
+    if spec.distribution == "uniform":
+        return rng.uniform(spec.low, spec.high, size)
+    mode = default if spec.mode is None else spec.mode
+    if np.ndim(mode):
+        raise HTTPException(status_code=400, detail="Triangular mode is required for a driver with a per-period curve.")
+    if not spec.low <= mode <= spec.high:
+        raise HTTPException(status_code=400, detail="Triangular mode must lie between low and high.")
+    if spec.low == spec.high:
+        return np.full(size, spec.low)
+    return rng.triangular(spec.low, mode, spec.high, size)
+
+def _driver_value(value):
+    """JSON form of a driver value: a number, or a list for a per-period curve."""
+    values = np.round(np.asarray(value, dtype=np.float64), 4)
+    if values.size == 1:
+        return float(values.reshape(-1)[0])
+    return values.tolist()
+
+def _check_drivers(names) -> None:
+    unknown = set(names) - set(projection.DRIVER_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown drivers: {', '.join(sorted(unknown))}")
+
+def _output_keys(output: str) -> tuple:
+    return ("ending_cash_cents",) if output == "ending_cash" else (f"{output.replace('cumulative_', '')}_cents",)
+
+def _output_matrix(series: dict, output: str) -> np.ndarray:
+    """(paths, periods) values of an output metric; cumulative metrics are running totals."""
+    values = series[_output_keys(output)[0]]
+    return values.cumsum(axis=1) if output.startswith("cumulative_") else values
+
+def _output_values(series: dict, output: str, period: int) -> np.ndarray:
+    """Read one output per path at a 1-based projected period."""
+    return _output_matrix(series, output)[:, period - 1]
+
+# Goal-seek: points evaluated per bisection pass, pass limit, and bracket width to stop at
+SEEK_POINTS = 33
+SEEK_MAX_PASSES = 12
+SEEK_TOLERANCE = 0.01
+
+def _default_bracket(field: str, current: float) -> tuple:
+    if field in projection.BASIS_POINT_DRIVERS:
+        return -10000.0, 10000.0
+    return 0.0, max(10.0 * abs(current), 1_000_000_00.0)
+
+# Paths evaluated per vectorized pass; bounds memory at ~SIM_CHUNK × periods × 8 bytes per series
+SIM_CHUNK = 10000
+SIM_SERIES = ("revenue_cents", "net_income_cents", "ending_cash_cents")
+
 # ── Endpoints ─────────────────────────────────────────────────────────────────
 
 @router.get("/config", response_model=ForecastConfigOut)
@@ -141,6 +604,13 @@ def get_forecast_config(company_id: str, scenario: str = "base", db: Session = D
             "capex_cents": 0,
             "da_cents": 0,
             "wc_pct_of_revenue": 0,
+            "interest_rate_pct": 0,
+            "debt_repayment_cents": 0,
+            "revolver_limit_cents": 0,
+            "revolver_rate_pct": 0,
+            "min_cash_cents": 0,
+            "driver_curves": {},
+            "rolling_mode": None,
         }
     return config
 
@@ -152,6 +622,7 @@ def delete_forecast_config(company_id: str, scenario: str = "base", db: Session
     ).first()
     if config:
         db.delete(config)
+        events.queue_event(db, company_id, "forecast_updated", scenario=scenario)
         db.commit()
     return {"status": "success", "message": f"{scenario} forecast cleared."}
 
@@ -161,12 +632,15 @@ def upsert_forecast_config(company_id: str, payload: ForecastConfigIn, db: Sessi
         models.ForecastConfig.company_id == company_id,
         models.ForecastConfig.scenario_name == payload.scenario_name
     ).first()
+    values = payload.model_dump()
+    values["driver_curves"] = projection.pack_curves(values["driver_curves"])
     if config:
-        for field, value in payload.model_dump().items():
+        for field, value in values.items():
             setattr(config, field, value)
     else:
-        config = models.ForecastConfig(company_id=company_id, **payload.model_dump())
+        config = models.ForecastConfig(company_id=company_id, **values)
         db.add(config)
+    events.queue_event(db, company_id, "forecast_updated", scenario=payload.scenario_name)
     db.commit()
     db.refresh(config)
     return config
@@ -181,12 +655,13 @@ def get_forecast_statements(company_id: str, scenario: str = "base", db: Session
     
     if not config or not config.base_period:
         # Return empty successful state instead of 400 to keep console clean
-        return {
-            "base_period": None,
-            "actuals": {"revenue_cents": 0, "expenses_cents": 0, "net_income_cents": 0, "cash_cents": 0, "net_wc_cents": 0},
-            "projections": [],
-            "config": None
-        }
+        return _empty_statements(None)
+
+    # Served from cache until the ledger or this scenario's config changes
+    key = (company_id, scenario, cache.get_data_version(db, company_id), config_fingerprint(config))
+    payload = cache.forecast_cache.get(key)
+    if payload is not None:
+        return payload
 
     # Validate base_period exists
     period_exists = db.query(models.ReportingPeriod).filter(
@@ -195,108 +670,457 @@ def get_forecast_statements(company_id: str, scenario: str = "base", db: Session
     ).first()
     if not period_exists:
         # Return empty state if period missing
-        return {
-            "base_period": str(config.base_period),
-            "actuals": {"revenue_cents": 0, "expenses_cents": 0, "net_income_cents": 0, "cash_cents": 0, "net_wc_cents": 0},
-            "projections": [],
-            "config": None
-        }
+        return _empty_statements(config.base_period)
 
     actuals = _get_actuals(db, company_id, config.base_period)
+    payload = _statements_payload(config, actuals)
+    cache.forecast_cache.put(key, payload)
+    return payload
 
-    revenue_growth = _bp(config.revenue_growth_pct)
-    cogs_pct      = _bp(config.cogs_pct_of_revenue)
-    opex_growth   = _bp(config.opex_growth_pct)
-    tax_rate      = _bp(config.tax_rate_pct)
-    wc_pct        = _bp(config.wc_pct_of_revenue)
-    capex         = config.capex_cents
-    da            = config.da_cents
-
-    projected_periods = []
-    prev_revenue  = actuals["revenue"]
-    prev_opex     = actuals["expenses"]
-    prev_wc       = actuals["net_wc"]
-    ending_cash   = actuals["cash"]
-
-    # Compute projected label dates (one calendar month forward each step)
-    base = config.base_period
-
-    for n in range(1, config.num_periods + 1):
-        period_label = base + relativedelta(months=n)
-
-        # ── Income Statement ──────────────────────────────────────────────────
-        revenue     = int(prev_revenue * (1 + revenue_growth))
-        cogs        = int(revenue * cogs_pct)
-        gross_profit = revenue - cogs
-        opex        = int(prev_opex * (1 + opex_growth))
-        ebitda      = gross_profit - opex
-        ebit        = ebitda - da
-        tax         = int(max(ebit, 0) * tax_rate)
-        net_income  = ebit - tax
-
-        # ── Cash Flow ─────────────────────────────────────────────────────────
-        net_wc       = int(revenue * wc_pct)
-        delta_wc     = net_wc - prev_wc            # positive = more WC tied up → cash outflow
-        cfo          = net_income + da - delta_wc
-        cfi          = -capex
-        cff          = 0
-        net_change   = cfo + cfi + cff
-        beginning_cash = ending_cash
-        ending_cash    = beginning_cash + net_change
-
-        projected_periods.append({
-            "period":           str(period_label),
-            "is_forecast":      True,
+@router.post("/simulate")
+def simulate_forecast(company_id: str, payload: SimulationIn, db: Session = Depends(get_db)):
+    """Monte Carlo run of the saved scenario with distributions on any of its drivers.
 
-            # IS
-            "revenue_cents":       revenue,
-            "cogs_cents":          cogs,
-            "gross_profit_cents":  gross_profit,
-            "opex_cents":          opex,
-            "ebitda_cents":        ebitda,
-            "ebit_cents":          ebit,
-            "tax_cents":           tax,
-            "net_income_cents":    net_income,
-
-            # CF
-            "net_income_cf_cents":        net_income,
-            "da_cents":                   da,
-            "delta_wc_cents":             -delta_wc,   # flip sign: WC increase = CF outflow
-            "net_cash_from_operations_cents": cfo,
-            "capex_cents":                -capex,
-            "net_cash_from_investing_cents":  cfi,
-            "net_cash_from_financing_cents":  cff,
-            "net_change_in_cash_cents":       net_change,
-            "beginning_cash_cents":           beginning_cash,
-            "ending_cash_cents":              ending_cash,
-
-            # BS (simplified: only tracking cash + retained earnings growth)
-            "cash_cents":              ending_cash,
-            "net_wc_cents":            net_wc,
-            "retained_earnings_delta_cents": net_income,
-        })
+    Returns P5/P50/P95 bands per projected period for revenue, net income and
+    ending cash, shaped like the dashboard's forecast rows.
+    """
+    _check_drivers(payload.drivers)
+    config, actuals = _require_projection_inputs(db, company_id, payload.scenario)
+    num_periods = payload.num_periods or config.num_periods
+    base_drivers = projection.config_drivers(config, num_periods)
+    rng = np.random.default_rng(payload.seed)
+
+    chunks = {key: [] for key in SIM_SERIES}
+    for start in range(0, payload.num_paths, SIM_CHUNK):
+        paths = min(SIM_CHUNK, payload.num_paths - start)
+        drivers = dict(base_drivers)
+        for field, spec in payload.drivers.items():
+            drivers[field] = _sample_driver(rng, spec, base_drivers[field], paths, num_periods)
+        series = projection.project(actuals, drivers, num_periods, paths=paths, keys=SIM_SERIES)
+        for key in SIM_SERIES:
+            chunks[key].append(series[key])
+
+    bands = {
+        key: np.percentile(np.concatenate(parts), [5, 50, 95], axis=0)
+        for key, parts in chunks.items()
+    }
+
+    results = []
+    for n in range(num_periods):
+        row = {
+            "period": str(config.base_period + relativedelta(months=n + 1)),
+            "type": "forecast",
+        }
+        for key, (p5, p50, p95) in bands.items():
+            metric = key[:-len("_cents")]
+            row[f"{metric}_p5_cents"] = int(p5[n])
+            row[f"{metric}_p50_cents"] = int(p50[n])
+            row[f"{metric}_p95_cents"] = int(p95[n])
+        results.append(row)
+
+    return {
+        "base_period": str(config.base_period),
+        "scenario": payload.scenario,
+        "num_paths": payload.num_paths,
+        "seed": payload.seed,
+        "bands": results,
+    }
+
+@router.post("/sensitivity")
+def forecast_sensitivity(company_id: str, payload: SensitivityIn, db: Session = Depends(get_db)):
+    """Data table of one output over a one- or two-driver grid, plus a tornado ranking.
 
-        prev_revenue = revenue
-        prev_opex    = opex
-        prev_wc      = net_wc
+    The grid and the tornado are each evaluated in a single vectorized pass
+    from one fetch of the base-period actuals; the tornado batch holds the
+    baseline plus two paths per entry in projection.DRIVER_FIELDS.
+    """
+    axes = [payload.x] + ([payload.y] if payload.y else [])
+    _check_drivers(axis.driver for axis in axes)
+    if payload.y and payload.y.driver == payload.x.driver:
+        raise HTTPException(status_code=400, detail="x and y must be different drivers.")
+
+    config, actuals = _require_projection_inputs(db, company_id, payload.scenario)
+    num_periods = config.num_periods
+    period = payload.period or num_periods
+    if not 1 <= period <= num_periods:
+        raise HTTPException(status_code=400, detail=f"period must be between 1 and {num_periods}.")
+    keys = _output_keys(payload.output)
+    base_drivers = projection.config_drivers(config)
+
+    # ── Grid: x varies down the rows, y across the columns ────────────────────
+    x_values = np.asarray(payload.x.values, dtype=np.float64)
+    y_values = np.asarray(payload.y.values if payload.y else [0.0], dtype=np.float64)
+    drivers = dict(base_drivers)
+    drivers[payload.x.driver] = np.repeat(x_values, len(y_values))[:, None]
+    if payload.y:
+        drivers[payload.y.driver] = np.tile(y_values, len(x_values))[:, None]
+    grid_paths = len(x_values) * len(y_values)
+    series = projection.project(actuals, drivers, num_periods, paths=grid_paths, keys=keys)
+    table = _output_values(series, payload.output, period).reshape(len(x_values), len(y_values))
+
+    # ── Tornado: baseline plus each driver at -X% and +X% ─────────────────────
+    shift = payload.tornado_pct / 100.0
+    fields = projection.DRIVER_FIELDS
+    tornado_paths = 1 + 2 * len(fields)
+    drivers = {}
+    for i, field in enumerate(fields):
+        scale = np.ones((tornado_paths, 1))
+        scale[1 + 2 * i] = 1 - shift
+        scale[2 + 2 * i] = 1 + shift
+        drivers[field] = scale * np.asarray(base_drivers[field], dtype=np.float64)
+    series = projection.project(actuals, drivers, num_periods, paths=tornado_paths, keys=keys)
+    outputs = _output_values(series, payload.output, period)
+    baseline = int(outputs[0])
+
+    tornado = []
+    for i, field in enumerate(fields):
+        low, high = int(outputs[1 + 2 * i]), int(outputs[2 + 2 * i])
+        tornado.append({
+            "driver": field,
+            "low_value": _driver_value(drivers[field][1 + 2 * i]),
+            "high_value": _driver_value(drivers[field][2 + 2 * i]),
+            "low_output_cents": low,
+            "high_output_cents": high,
+            "swing_cents": abs(high - low),
+        })
+    tornado.sort(key=lambda t: t["swing_cents"], reverse=True)
 
     return {
         "base_period": str(config.base_period),
-        "actuals": {
-            "revenue_cents":  actuals["revenue"],
-            "expenses_cents": actuals["expenses"],
-            "net_income_cents": (actuals["revenue"] + actuals["expenses"] * -1),
-            "cash_cents":     actuals["cash"],
-            "net_wc_cents":   actuals["net_wc"],
+        "scenario": payload.scenario,
+        "output": payload.output,
+        "period": str(config.base_period + relativedelta(months=period)),
+        "x": {"driver": payload.x.driver, "values": payload.x.values},
+        "y": {"driver": payload.y.driver, "values": payload.y.values} if payload.y else None,
+        "table_cents": [[int(v) for v in row] for row in table],
+        "baseline_cents": baseline,
+        "tornado_pct": payload.tornado_pct,
+        "tornado": tornado,
+    }
+
+@router.post("/goal-seek")
+def forecast_goal_seek(company_id: str, payload: GoalSeekIn, db: Session = Depends(get_db)):
+    """Solve for the value of one driver at which an output meets a target.
+
+    Each pass projects SEEK_POINTS evenly spaced driver values in one batch,
+    keeps the sub-interval containing the first crossing of the target and
+    repeats, so the bracket shrinks ~32x per pass over actuals fetched once.
+    """
+    _check_drivers([payload.driver])
+    config, actuals = _require_projection_inputs(db, company_id, payload.scenario)
+    num_periods = config.num_periods
+    period = payload.period or num_periods
+    if not 1 <= period <= num_periods:
+        raise HTTPException(status_code=400, detail=f"period must be between 1 and {num_periods}.")
+
+    base_drivers = projection.config_drivers(config)
+    current = base_drivers[payload.driver]
+    default_low, default_high = _default_bracket(payload.driver, float(np.max(np.abs(current))))
+    low = default_low if payload.low is None else payload.low
+    high = default_high if payload.high is None else payload.high
+    if low >= high:
+        raise HTTPException(status_code=400, detail="low must be less than high.")
+
+    keys = _output_keys(payload.output)
+    evaluations = 0
+
+    def achieved(values: np.ndarray) -> np.ndarray:
+        nonlocal evaluations
+        evaluations += len(values)
+        drivers = dict(base_drivers)
+        drivers[payload.driver] = values[:, None]
+        matrix = _output_matrix(
+            projection.project(actuals, drivers, num_periods, paths=len(values), keys=keys),
+            payload.output
+        )[:, :period]
+        if payload.aggregate == "min":
+            return matrix.min(axis=1)
+        if payload.aggregate == "max":
+            return matrix.max(axis=1)
+        return matrix[:, -1]
+
+    def satisfied(metric: np.ndarray) -> np.ndarray:
+        if payload.constraint == ">=":
+            return metric >= payload.target_cents
+        if payload.constraint == "<=":
+            return metric <= payload.target_cents
+        return metric == payload.target_cents
+
+    response = {
+        "scenario": payload.scenario,
+        "driver": payload.driver,
+        "current_value": _driver_value(current),
+        "output": payload.output,
+        "aggregate": payload.aggregate,
+        "period": str(config.base_period + relativedelta(months=period)),
+        "constraint": payload.constraint,
+        "target_cents": payload.target_cents,
+    }
+
+    # The crossing is where (metric - target) changes sign between neighbouring points
+    passes = 0
+    while True:
+        passes += 1
+        grid = np.linspace(low, high, SEEK_POINTS)
+        gap = achieved(grid) - payload.target_cents
+        sign = np.sign(gap)
+        crossings = np.nonzero(sign[:-1] * sign[1:] <= 0)[0]
+        if len(crossings) == 0:
+            break
+        i = crossings[0]
+        low, high = grid[i], grid[i + 1]
+        if high - low <= SEEK_TOLERANCE or passes >= SEEK_MAX_PASSES:
+            break
+
+    if passes == 1 and len(crossings) == 0:
+        everywhere = bool(satisfied(gap + payload.target_cents).all())
+        response.update({
+            "status": "satisfied_everywhere" if everywhere else "infeasible",
+            "value": None,
+            "stored_value": None,
+            "achieved_cents": None,
+            "passes": passes,
+            "evaluations": evaluations,
+        })
+        return response
+
+    # Stored drivers are integers: pick the one on the satisfying side of the crossing
+    edges = np.array([np.floor(low), np.ceil(high)])
+    edge_metric = achieved(edges)
+    ok = satisfied(edge_metric)
+    if payload.constraint == "==":
+        pick = int(np.argmin(np.abs(edge_metric - payload.target_cents)))
+    else:
+        pick = int(np.argmax(ok)) if ok.any() else 0
+    solved = (low + high) / 2
+
+    response.update({
+        "status": "solved",
+        "value": round(float(solved), 4),
+        "stored_value": int(edges[pick]),
+        "achieved_cents": int(edge_metric[pick]),
+        "satisfied": bool(ok[pick]),
+        "feasible_side": "above" if bool(satisfied(achieved(np.array([high + 1.0])))[0]) else "below",
+        "passes": passes,
+        "evaluations": evaluations,
+    })
+    return response
+
+@router.get("/compare")
+def compare_forecast_scenarios(company_id: str, baseline: str = "base", db: Session = Depends(get_db)):
+    """Project every saved scenario in one round trip, aligned by period.
+
+    Scenarios are loaded in one query and grouped by base period so the
+    actuals for each base period are fetched once. `deltas` holds each
+    scenario minus the baseline scenario for every period both project.
+    """
+    configs = db.query(models.ForecastConfig).filter(
+        models.ForecastConfig.company_id == company_id
+    ).order_by(models.ForecastConfig.scenario_name).all()
+
+    base_periods = {c.base_period for c in configs if c.base_period}
+    uploaded = {
+        p for (p,) in db.query(models.ReportingPeriod.period_date).filter(
+            models.ReportingPeriod.company_id == company_id,
+            models.ReportingPeriod.period_date.in_(base_periods)
+        ).all()
+    } if base_periods else set()
+    actuals_by_period = {p: _get_actuals(db, company_id, p) for p in sorted(uploaded)}
+
+    scenarios = {}
+    skipped = []
+    for config in configs:
+        if config.base_period not in actuals_by_period:
+            skipped.append(config.scenario_name)
+            continue
+        payload = _statements_payload(config, actuals_by_period[config.base_period])
+        payload["scenario_name"] = config.scenario_name
+        scenarios[config.scenario_name] = payload
+
+    periods = sorted({row["period"] for s in scenarios.values() for row in s["projections"]})
+
+    deltas = {}
+    reference = scenarios.get(baseline)
+    if reference:
+        reference_rows = {row["period"]: row for row in reference["projections"]}
+        for name, scenario in scenarios.items():
+            if name == baseline:
+                continue
+            deltas[name] = [
+                {"period": row["period"], **{
+                    field: row[field] - reference_rows[row["period"]][field] for field in COMPARE_FIELDS
+                }}
+                for row in scenario["projections"] if row["period"] in reference_rows
+            ]
+
+    return {
+        "baseline": baseline if reference else None,
+        "periods": periods,
+        "scenarios": list(scenarios.values()),
+        "deltas": deltas,
+        "skipped_scenarios": skipped,
+    }
+
+@router.post("/preview")
+def preview_forecast(company_id: str, payload: PreviewIn, db: Session = Depends(get_db)):
+    """Project unsaved driver values for live what-if editing; nothing is written.
+
+    Actuals come from the memo cache. With a `session_id`, the previous
+    preview's per-period state is kept, and when only later months' drivers
+    changed the projection resumes from the first changed month.
+    """
+    started = time.perf_counter()
+    if not payload.base_period:
+        raise HTTPException(status_code=400, detail="A base period is required to preview a forecast.")
+    num_periods = payload.num_periods
+
+    version = cache.get_data_version(db, company_id)
+    if (company_id, payload.base_period, version) not in cache.actuals_cache:
+        period_exists = db.query(models.ReportingPeriod.id).filter(
+            models.ReportingPeriod.company_id == company_id,
+            models.ReportingPeriod.period_date == payload.base_period
+        ).first()
+        if not period_exists:
+            raise HTTPException(status_code=400, detail=f"Base period {payload.base_period} has no uploaded trial balance.")
+    actuals = _get_actuals(db, company_id, payload.base_period)
+
+    config = SimpleNamespace(**payload.model_dump(exclude={"session_id", "driver_curves"}))
+    config.driver_curves = projection.pack_curves(payload.driver_curves)
+    drivers = {
+        field: projection.driver_matrix(value, 1, num_periods)
+        for field, value in projection.config_drivers(config).items()
+    }
+
+    # First month whose drivers differ from the session's last preview
+    inputs = (payload.base_period, num_periods, version)
+    session_key = (company_id, payload.session_id)
+    session = cache.preview_sessions.get(session_key) if payload.session_id else None
+    start = 0
+    if session and session["inputs"] == inputs:
+        start = num_periods
+        for field, row in drivers.items():
+            changed = np.nonzero(row[0] != session["drivers"][field][0])[0]
+            if len(changed):
+                start = min(start, int(changed[0]))
+
+    if start:
+        states = session["states"][:start]
+        series = {key: values.copy() for key, values in session["series"].items()}
+        projection.project(
+            actuals, drivers, num_periods, start=start, state=states[-1], states=states, out=series
+        )
+    else:
+        states = []
+        series = projection.project(actuals, drivers, num_periods, states=states)
+
+    if payload.session_id:
+        cache.preview_sessions.put(session_key, {
+            "inputs": inputs, "drivers": drivers, "series": series, "states": states,
+        })
+
+    response = _statements_payload(config, actuals, series)
+    response["preview"] = {
+        "session_id": payload.session_id,
+        "recomputed_from_period": start + 1 if start < num_periods else None,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+    return response
+
+@router.get("/baseline")
+def forecast_baseline(
+    company_id: str,
+    num_periods: int = Query(12, ge=1, le=projection.MAX_CURVE_PERIODS),
+    through: Optional[date] = None,
+    include_accounts: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Propose drivers from a trend + seasonal fit of the full uploaded history.
+
+    Every master account is fitted at once; the fitted revenue, cost and
+    balance sheet movements are turned into per-period driver curves that can
+    be saved as-is with PUT /config. Tax rate and financing are not fitted.
+    """
+    started = time.perf_counter()
+    periods, accounts, history = query_history(db, company_id, through)
+    if not periods:
+        raise HTTPException(status_code=400, detail="No mapped trial balance history to fit a baseline from.")
+
+    months = np.array([baseline.month_index(d) for d in periods])
+    result = baseline.fit(history, months, num_periods)
+    forecast, fitted = result["forecast"], result["fitted"]
+
+    def columns(predicate):
+        return np.array([predicate(a) for a in accounts], dtype=bool)
+
+    revenue_cols = columns(lambda a: a[2] == models.AccountCategory.REVENUE)
+    expense_cols = columns(lambda a: a[2] == models.AccountCategory.EXPENSE)
+    cogs_cols = expense_cols & columns(lambda a: a[3] == "COGS")
+    wc_cols = columns(lambda a: a[4] in ("working_capital_assets", "working_capital_liabilities"))
+    fixed_cols = columns(lambda a: a[4] == "fixed_assets")
+    dep_cols = columns(lambda a: a[4] == "accumulated_depreciation")
+
+    # Revenue credits are negative in TB; flip to positive like the actuals
+    history_revenue = -history[:, revenue_cols].sum(axis=1)
+    history_expenses = history[:, expense_cols].sum(axis=1)
+    revenue = -forecast[:, revenue_cols].sum(axis=1)
+    cogs = forecast[:, cogs_cols].sum(axis=1)
+    expenses = forecast[:, expense_cols].sum(axis=1)
+
+    # The engine grows opex from total base-period expenses, so the curve
+    # tracks the fitted total expense line
+    curves = {
+        "revenue_growth_pct": baseline.growth_curve(history_revenue[-1], revenue),
+        "cogs_pct_of_revenue": np.divide(cogs, revenue, out=np.zeros(num_periods), where=revenue != 0) * 10000,
+        "opex_growth_pct": baseline.growth_curve(history_expenses[-1], expenses),
+        "capex_cents": np.maximum(forecast[:, fixed_cols].sum(axis=1), 0),
+        "da_cents": np.maximum(-forecast[:, dep_cols].sum(axis=1), 0),
+    }
+    curves = {field: np.round(values).astype(np.int64) for field, values in curves.items()}
+
+    # Working capital is a balance: its inception-to-date level against the month's revenue
+    wc_level = history[:, wc_cols].sum(axis=1).cumsum()[-12:]
+    recent_revenue = history_revenue[-12:]
+    wc_ratio = wc_level[recent_revenue != 0] / recent_revenue[recent_revenue != 0]
+
+    defaults = ForecastConfigIn()
+    proposed = ForecastConfigIn(
+        scenario_name="baseline",
+        base_period=periods[-1],
+        num_periods=num_periods,
+        revenue_growth_pct=int(np.round(curves["revenue_growth_pct"].mean())),
+        cogs_pct_of_revenue=int(np.round(curves["cogs_pct_of_revenue"].mean())),
+        opex_growth_pct=int(np.round(curves["opex_growth_pct"].mean())),
+        tax_rate_pct=defaults.tax_rate_pct,
+        capex_cents=int(np.round(curves["capex_cents"].mean())),
+        da_cents=int(np.round(curves["da_cents"].mean())),
+        wc_pct_of_revenue=int(np.round(np.median(wc_ratio) * 10000)) if len(wc_ratio) else defaults.wc_pct_of_revenue,
+        driver_curves={field: values.tolist() for field, values in curves.items()},
+    )
+
+    response = {
+        "method": result["method"],
+        "history_periods": len(periods),
+        "accounts_fitted": len(accounts),
+        "base_period": str(periods[-1]),
+        "proposed_config": proposed.model_dump(mode="json"),
+        "fit": {
+            "revenue_r2": round(baseline.r_squared(history_revenue, -fitted[:, revenue_cols].sum(axis=1)), 4),
+            "expenses_r2": round(baseline.r_squared(history_expenses, fitted[:, expense_cols].sum(axis=1)), 4),
         },
-        "projections": projected_periods,
-        "config": {
-            "revenue_growth_pct":   config.revenue_growth_pct,
-            "cogs_pct_of_revenue":  config.cogs_pct_of_revenue,
-            "opex_growth_pct":      config.opex_growth_pct,
-            "tax_rate_pct":         config.tax_rate_pct,
-            "capex_cents":          config.capex_cents,
-            "da_cents":             config.da_cents,
-            "wc_pct_of_revenue":    config.wc_pct_of_revenue,
-        }
+        "fitted_periods": [
+            {
+                "period": str(periods[-1] + relativedelta(months=n + 1)),
+                "revenue_cents": int(round(revenue[n])),
+                "cogs_cents": int(round(cogs[n])),
+                "expenses_cents": int(round(expenses[n])),
+            }
+            for n in range(num_periods)
+        ],
     }
+    if include_accounts:
+        response["accounts"] = [
+            {"account_code": code, "name": name, "forecast_cents": np.round(forecast[:, j]).astype(np.int64).tolist()}
+            for j, (code, name, *_rest) in enumerate(accounts)
+        ]
+    response["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return response
@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+
+from .. import fx, models
+from ..database import get_db
+
+router = APIRouter(
+    prefix="/api/v1/fx-rates",
+    tags=["FX Rates"]
+)
+
+# ── Pydantic schemas (local, lightweight) ─────────────────────────────────────
+
+class FxRateIn(BaseModel):
+    base_currency: str
+    quote_currency: str
+    period_date: date
+    closing_rate: float = Field(..., gt=0)   # 1 base = rate quote, at period end
+    average_rate: float = Field(..., gt=0)   # over the period
+
+    @field_validator("base_currency", "quote_currency")
+    @classmethod
+    def normalize_currency(cls, value: str) -> str:
+        value = value.strip().upper()
+        if len(value) != 3 or not value.isalpha():
+            raise ValueError("Currency must be a 3-letter ISO code")
+        return value
+
+class FxRateOut(FxRateIn):
+    id: str
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _rate_out(row: models.FxRate) -> FxRateOut:
+    return FxRateOut(
+        id=row.id,
+        base_currency=row.base_currency,
+        quote_currency=row.quote_currency,
+        period_date=row.period_date,
+        closing_rate=fx.from_scaled(row.closing_rate),
+        average_rate=fx.from_scaled(row.average_rate),
+    )
+
+# ── Endpoints ─────────────────────────────────────────────────────────────────
+
+@router.get("", response_model=List[FxRateOut])
+def list_fx_rates(
+    base_currency: Optional[str] = None,
+    quote_currency: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    query = db.query(models.FxRate)
+    if base_currency:
+        query = query.filter(models.FxRate.base_currency == base_currency.upper())
+    if quote_currency:
+        query = query.filter(models.FxRate.quote_currency == quote_currency.upper())
+    if start:
+        query = query.filter(models.FxRate.period_date >= start)
+    if end:
+        query = query.filter(models.FxRate.period_date <= end)
+    rows = query.order_by(models.FxRate.base_currency, models.FxRate.quote_currency, models.FxRate.period_date)
+    return [_rate_out(row) for row in rows]
+
+@router.put("", response_model=List[FxRateOut])
+def upsert_fx_rates(rates: List[FxRateIn], db: Session = Depends(get_db)):
+    """Insert or replace rates by (base, quote, period)."""
+    for rate in rates:
+        if rate.base_currency == rate.quote_currency:
+            raise HTTPException(status_code=400, detail=f"{rate.base_currency}/{rate.quote_currency} is not a currency pair.")
+    keys = {(r.base_currency, r.quote_currency, r.period_date) for r in rates}
+    if len(keys) != len(rates):
+        raise HTTPException(status_code=400, detail="Each pair and period can only appear once.")
+
+    existing = {
+        (row.base_currency, row.quote_currency, row.period_date): row
+        for row in db.query(models.FxRate).filter(
+            models.FxRate.base_currency.in_({r.base_currency for r in rates}),
+            models.FxRate.quote_currency.in_({r.quote_currency for r in rates}),
+            models.FxRate.period_date.in_({r.period_date for r in rates}),
+        )
+    }
+    saved = []
+    for rate in rates:
+        row = existing.get((rate.base_currency, rate.quote_currency, rate.period_date))
+        if row is None:
+            row = models.FxRate(
+                base_currency=rate.base_currency,
+                quote_currency=rate.quote_currency,
+                period_date=rate.period_date,
+            )
+            db.add(row)
+        row.closing_rate = fx.to_scaled(rate.closing_rate)
+        row.average_rate = fx.to_scaled(rate.average_rate)
+        saved.append(row)
+    # Serialize before commit expires the rows (which would reload each one)
+    db.flush()
+    response = [_rate_out(row) for row in saved]
+    db.commit()
+    return response
+
+@router.delete("/{rate_id}")
+def delete_fx_rate(rate_id: str, db: Session = Depends(get_db)):
+    row = db.get(models.FxRate, rate_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="FX rate not found")
+    db.delete(row)
+    db.commit()
+    return {"status": "success", "message": "FX rate deleted."}
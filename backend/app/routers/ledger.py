@@ -0,0 +1,155 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, cast, select
+from datetime import date
+from io import StringIO
+from typing import List, Literal, Optional
+import csv
+import json
+import tempfile
+
+from .. import excel, models
+from ..database import SessionLocal
+
+router = APIRouter(
+    prefix="/api/v1/ledger",
+    tags=["Ledger"]
+)
+
+# Rows fetched per round trip from the server-side cursor
+LEDGER_BATCH_ROWS = 5000
+
+LEDGER_COLUMNS = (
+    "company_id", "company_name", "period_date",
+    "account_number", "account_name",
+    "master_account_code", "master_account_name", "category", "sub_category", "cash_flow_category",
+    "balance_cents",
+)
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+def _ledger_query(company_ids: List[str], start: Optional[date], end: Optional[date]):
+    """Account-level trial balance rows joined to company, period and master account."""
+    master = models.MasterChartOfAccount
+    # Enums and dates come back as their stored strings; no per-row type conversion
+    stmt = select(
+        models.Company.id,
+        models.Company.name,
+        cast(models.ReportingPeriod.period_date, String),
+        models.CompanyAccount.import_account_number,
+        models.CompanyAccount.import_account_name,
+        master.account_code,
+        master.name,
+        cast(master.category, String),
+        master.sub_category,
+        cast(master.cash_flow_category, String),
+        models.TrialBalanceEntry.balance,
+    ).select_from(models.TrialBalanceEntry).join(
+        models.CompanyAccount,
+        models.TrialBalanceEntry.company_account_id == models.CompanyAccount.id
+    ).join(
+        models.ReportingPeriod,
+        models.TrialBalanceEntry.reporting_period_id == models.ReportingPeriod.id
+    ).join(
+        models.Company,
+        models.CompanyAccount.company_id == models.Company.id
+    ).outerjoin(
+        models.AccountMapping,
+        models.CompanyAccount.id == models.AccountMapping.company_account_id
+    ).outerjoin(
+        master,
+        models.AccountMapping.master_account_id == master.id
+    )
+    if company_ids:
+        stmt = stmt.where(models.Company.id.in_(company_ids))
+    if start:
+        stmt = stmt.where(models.ReportingPeriod.period_date >= start)
+    if end:
+        stmt = stmt.where(models.ReportingPeriod.period_date <= end)
+    return stmt.order_by(
+        models.Company.name, models.Company.id,
+        models.ReportingPeriod.period_date, models.CompanyAccount.import_account_number
+    ).execution_options(yield_per=LEDGER_BATCH_ROWS)
+
+def _batches(stmt):
+    """Row batches from a server-side cursor; owns its session so it outlives the request handler."""
+    db = SessionLocal()
+    try:
+        for partition in db.execute(stmt).partitions():
+            yield partition
+    finally:
+        db.close()
+
+def _csv_chunks(stmt):
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(LEDGER_COLUMNS)
+    for rows in _batches(stmt):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def _jsonl_chunks(stmt):
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for rows in _batches(stmt):
+        yield "".join(dumps(dict(zip(LEDGER_COLUMNS, row))) + "\n" for row in rows).encode()
+
+def _parquet_file(stmt, pa, pq):
+    """Write one row group per batch into a spooled temp file (Parquet needs a footer, so it cannot be streamed as rows arrive)."""
+    schema = pa.schema(
+        [(name, pa.string()) for name in LEDGER_COLUMNS[:-1]] + [("balance_cents", pa.int64())]
+    )
+    spooled = tempfile.SpooledTemporaryFile(max_size=excel.SPOOL_MAX_BYTES)
+    with pq.ParquetWriter(spooled, schema, compression="zstd") as writer:
+        for rows in _batches(stmt):
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+    spooled.seek(0)
+    return spooled
+
+@router.get("/export")
+def export_ledger(
+    fmt: Literal["csv", "jsonl", "parquet"] = Query("csv", alias="format"),
+    company_id: List[str] = Query([]),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+):
+    """Stream account-level trial balance rows for one, several or all companies.
+
+    Rows are read in batches from a server-side cursor and written out as they
+    arrive, so memory stays flat for a full ledger dump. Parquet is written
+    with `pyarrow`, which requirements.txt pins; an install without it
+    answers 501.
+    """
+    stmt = _ledger_query(company_id, start, end)
+    if fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Parquet export requires the 'pyarrow' package; reinstall from requirements.txt."
+            )
+        body = excel.iter_chunks(_parquet_file(stmt, pa, pq))
+    elif fmt == "jsonl":
+        body = _jsonl_chunks(stmt)
+    else:
+        body = _csv_chunks(stmt)
+
+    filename = f"ledger_{date.today().isoformat()}.{fmt}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
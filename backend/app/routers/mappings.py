@@ -4,7 +4,7 @@ from sqlalchemy import or_
 from sqlalchemy.sql import func
 from typing import List
 
-from .. import models, schemas
+from .. import cache, events, kpi, models, schemas
 from ..database import get_db
 
 router = APIRouter(
@@ -53,12 +53,16 @@ def batch_update_mappings(
     """Batch updates mappings between Company Accounts and Master CoA."""
     
     # We should normally enforce user_id, omitting here for simplicity
+    # Existing mappings for the whole batch in one lookup
+    existing = {
+        mapping.company_account_id: mapping
+        for mapping in db.query(models.AccountMapping).filter(
+            models.AccountMapping.company_account_id.in_({m.company_account_id for m in mappings})
+        )
+    }
     mapped_count = 0
     for map_req in mappings:
-        # Check if the mapping already exists
-        existing_mapping = db.query(models.AccountMapping).filter(
-            models.AccountMapping.company_account_id == map_req.company_account_id
-        ).first()
+        existing_mapping = existing.get(map_req.company_account_id)
 
         if existing_mapping:
             existing_mapping.master_account_id = map_req.master_account_id
@@ -68,8 +72,13 @@ def batch_update_mappings(
                 master_account_id=map_req.master_account_id
             )
             db.add(new_mapping)
+            # A repeat of the same account later in the batch updates this one
+            existing[map_req.company_account_id] = new_mapping
         mapped_count += 1
 
+    affected = kpi.refresh(db, company_id)
+    cache.bump_data_version(db, company_id)
+    events.queue_event(db, company_id, "mappings_changed", affected)
     db.commit()
     return {"status": "success", "mapped_count": mapped_count}
 
@@ -92,5 +101,8 @@ def delete_mappings(company_id: str, db: Session = Depends(get_db)):
         models.AccountMapping.company_account_id.in_(ids)
     ).delete(synchronize_session=False)
 
+    affected = kpi.refresh(db, company_id)
+    cache.bump_data_version(db, company_id)
+    events.queue_event(db, company_id, "mappings_changed", affected)
     db.commit()
     return {"status": "success", "deleted_count": deleted_count}
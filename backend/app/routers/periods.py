@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 from datetime import date
 
-from .. import models, schemas
+from .. import cache, events, kpi, models, schemas
 from ..database import get_db
 
 router = APIRouter(
@@ -63,5 +63,8 @@ def delete_period(company_id: str, period_date: date, db: Session = Depends(get_
             models.CompanyAccount.id.in_(orphan_ids)
         ).delete(synchronize_session=False)
 
+    affected = kpi.refresh(db, company_id, since=period_date)
+    cache.bump_data_version(db, company_id)
+    events.queue_event(db, company_id, "period_deleted", affected)
     db.commit()
     return {"status": "success", "message": f"Period {period_date} and all associated entries deleted.", "orphaned_accounts_removed": len(orphan_ids)}
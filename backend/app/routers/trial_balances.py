@@ -2,13 +2,14 @@ import csv
 import re
 from datetime import date
 from io import StringIO
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from typing import List, Dict, Optional
 
-from .. import models, schemas
+from .. import cache, events, kpi, models, schemas
 from ..database import get_db
+from .forecast import roll_forecasts
 
 router = APIRouter(
     prefix="/api/v1/companies/{company_id}/trial-balances",
@@ -53,6 +54,7 @@ def find_column(headers: List[str], aliases: List[str]) -> Optional[str]:
 async def upload_trial_balance(
     company_id: str,
     period_date: date,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
@@ -143,30 +145,39 @@ async def upload_trial_balance(
     ).delete(synchronize_session=False)
     db.flush()
 
-    # 2. Process each entry
-    for entry_data in entries:
-        company_account = db.query(models.CompanyAccount).filter(
+    # 2. Resolve accounts with one lookup; new account numbers are inserted together
+    accounts = {
+        account.import_account_number: account
+        for account in db.query(models.CompanyAccount).filter(
             models.CompanyAccount.company_id == company_id,
-            models.CompanyAccount.import_account_number == entry_data["account_number"]
-        ).first()
-        
-        if not company_account:
-            company_account = models.CompanyAccount(
+            models.CompanyAccount.import_account_number.in_({e["account_number"] for e in entries})
+        )
+    }
+    for entry_data in entries:
+        if entry_data["account_number"] not in accounts:
+            accounts[entry_data["account_number"]] = models.CompanyAccount(
                 company_id=company_id,
                 import_account_number=entry_data["account_number"],
                 import_account_name=entry_data["account_name"]
             )
-            db.add(company_account)
-            db.flush()
-            
-        tb_entry = models.TrialBalanceEntry(
+            db.add(accounts[entry_data["account_number"]])
+    db.flush()
+
+    db.add_all(
+        models.TrialBalanceEntry(
             reporting_period_id=period.id,
-            company_account_id=company_account.id,
+            company_account_id=accounts[entry_data["account_number"]].id,
             balance=entry_data["balance"]
         )
-        db.add(tb_entry)
+        for entry_data in entries
+    )
 
+    affected = kpi.refresh(db, company_id, since=period_date)
+    cache.bump_data_version(db, company_id)
+    events.queue_event(db, company_id, "period_uploaded", affected)
     db.commit()
+    # Rebase rolling forecast scenarios and warm their projections
+    background_tasks.add_task(roll_forecasts, company_id)
     return {
         "status": "success", 
         "message": f"Successfully imported {len(entries)} accounts for {period_date}.",
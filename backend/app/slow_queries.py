@@ -0,0 +1,189 @@
+"""
+Slow-query log.
+
+Off unless SLOW_QUERY_MS is set to a threshold in milliseconds. Every
+statement that takes longer is:
+
+- written as one JSON line to a rotating log (SLOW_QUERY_LOG, default
+  <data dir>/slow_queries.log; SLOW_QUERY_LOG_MB per file, 3 backups) with
+  its SQL, duration, redacted parameters, the app function that issued it and
+  the database's plan for it
+- folded into in-process totals per statement shape, served worst first by
+  GET /debug/slow-queries
+
+Plans come from `EXPLAIN QUERY PLAN` on SQLite and plain `EXPLAIN` on
+PostgreSQL (EXPLAIN ANALYZE would run the statement a second time, writes
+included). They are read on a raw DBAPI cursor so they never show up in the
+request metrics or trip this log themselves. Parameters are reduced to their
+types, so the log holds no ledger data.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import event
+
+from .database import get_data_dir
+
+THRESHOLD_MS = float(os.getenv("SLOW_QUERY_MS", "0") or 0)
+ENABLED = THRESHOLD_MS > 0
+LOG_PATH = Path(os.getenv("SLOW_QUERY_LOG", get_data_dir() / "slow_queries.log"))
+LOG_MAX_BYTES = int(float(os.getenv("SLOW_QUERY_LOG_MB", "5")) * 1024 * 1024)
+LOG_BACKUPS = 3
+
+EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+
+# Expanded IN lists differ only in their number of placeholders
+_IN_LIST = re.compile(r"\((?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))+\)")
+_APP_DIR = str(Path(__file__).resolve().parent)
+
+_logger = None
+_logger_lock = threading.Lock()
+_aggregates: dict = {}   # statement shape -> totals
+_aggregates_lock = threading.Lock()
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _log():
+    """The rotating file logger, opened on the first slow statement."""
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger("tsm.slow_queries")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            _logger = logger
+    return _logger
+
+
+def shape(statement: str) -> str:
+    """Statement text with whitespace and IN-list lengths normalized."""
+    return _IN_LIST.sub("(?, ...)", " ".join(statement.split()))
+
+
+def redact(parameters):
+    """Parameter values replaced by their type names; lists and mappings keep their shape."""
+    if isinstance(parameters, dict):
+        return {key: redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact(value) for value in parameters]
+    if parameters is None:
+        return None
+    if isinstance(parameters, str):
+        return f"<str:{len(parameters)}>"
+    return f"<{type(parameters).__name__}>"
+
+
+def _source() -> str:
+    """The innermost app frame outside this module, e.g. 'routers/statements.py:23 get_statement_balance'."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and filename != __file__:
+            return f"{os.path.relpath(filename, _APP_DIR)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _plan(conn, statement: str, parameters, executemany: bool) -> list:
+    prefix = EXPLAIN_PREFIX.get(conn.dialect.name)
+    if prefix is None:
+        return None
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    try:
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    except Exception as exc:
+        return [f"EXPLAIN failed: {exc}"]
+    if conn.dialect.name == "sqlite":
+        # (id, parent, notused, detail); indent by depth like the sqlite3 shell
+        depth = {0: -1}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node] + detail)
+        return lines
+    return [row[0] for row in rows]
+
+
+def record(statement: str, parameters, executemany: bool, elapsed_ms: float, plan: list, source: str) -> None:
+    entry = {
+        "at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "ms": round(elapsed_ms, 3),
+        "source": source,
+        "sql": statement,
+        "parameters": redact(parameters[0] if executemany and parameters else parameters),
+        "executemany": len(parameters) if executemany else None,
+        "plan": plan,
+    }
+    _log().info(json.dumps(entry))
+
+    key = shape(statement)
+    with _aggregates_lock:
+        totals = _aggregates.get(key)
+        if totals is None:
+            totals = _aggregates[key] = {"sql": key, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "sources": set()}
+        totals["count"] += 1
+        totals["total_ms"] += elapsed_ms
+        totals["max_ms"] = max(totals["max_ms"], elapsed_ms)
+        totals["last_seen"] = entry["at"]
+        totals["last_plan"] = plan
+        if source:
+            totals["sources"].add(source)
+
+
+def worst(order_by: str = "total_ms", limit: int = 20) -> list:
+    """Aggregated slow statements, largest `order_by` (total_ms, max_ms or count) first."""
+    with _aggregates_lock:
+        rows = [{**totals, "sources": sorted(totals["sources"])} for totals in _aggregates.values()]
+    for row in rows:
+        row["total_ms"] = round(row["total_ms"], 3)
+        row["max_ms"] = round(row["max_ms"], 3)
+        row["mean_ms"] = round(row["total_ms"] / row["count"], 3)
+    return sorted(rows, key=lambda row: row[order_by], reverse=True)[:limit]
+
+
+def reset() -> None:
+    with _aggregates_lock:
+        _aggregates.clear()
+
+
+# ── SQLAlchemy hooks ──────────────────────────────────────────────────────────
+
+# Timed on the execution context, like instrumentation, so a failing statement leaves nothing behind
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._slow_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._slow_query_start) * 1000
+    if elapsed_ms < THRESHOLD_MS:
+        return
+    plan = _plan(conn, statement, parameters, executemany)
+    record(statement, parameters, executemany, elapsed_ms, plan, _source())
+
+
+def install(engine) -> None:
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1 @@
+"""Synthetic data and endpoint benchmarks; see bench.run."""
@@ -0,0 +1,272 @@
+"""
+Endpoint benchmarks at several data scales.
+
+    cd backend
+    python -m bench.run                                   # DEFAULT_SCALES
+    python -m bench.run --scale small large --output before.json
+    python -m bench.run --companies 2 --periods 48 --accounts 200 --coverage 0.8
+    python -m bench.run --compare before.json after.json
+
+Every scale starts from an empty temporary SQLite database, never the app's
+own. The synthetic ledgers (bench.synthetic) are ingested through the upload
+endpoint and mapped through the mappings endpoint, both timed. Each read
+endpoint is then called against the first company once cold, right after a
+data version bump has invalidated its caches, and `--repeat` times warm.
+Request metrics are switched on so every timing carries its SQL statement
+count from the Server-Timing header.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from bench.synthetic import Spec
+
+SCALES = {
+    "small": Spec(companies=1, periods=12, accounts=30, coverage=1.0),
+    "medium": Spec(companies=3, periods=36, accounts=120, coverage=0.95),
+    "large": Spec(companies=5, periods=60, accounts=400, coverage=0.9),
+}
+# `large` takes minutes against per-period statement queries; run it on request
+DEFAULT_SCALES = ("small", "medium")
+
+# name -> (path under /api/v1/companies/{id}, query params for the period list)
+ENDPOINTS = {
+    "income_statement": ("/statements/income-statement", lambda periods: [("periods", p) for p in periods]),
+    "balance_sheet": ("/statements/balance-sheet", lambda periods: [("periods", p) for p in periods]),
+    "cash_flow": ("/statements/cash-flow", lambda periods: [("periods", p) for p in periods]),
+    "dashboard_summary": ("/dashboard/summary", lambda periods: []),
+    "dashboard_ratios": ("/dashboard/ratios", lambda periods: []),
+    "forecast_statements": ("/forecast/statements", lambda periods: []),
+    "export_actuals_excel": ("/export/actuals/excel", lambda periods: [("periods", ",".join(periods))]),
+    "export_actuals_pdf": ("/export/actuals/pdf", lambda periods: [("periods", ",".join(periods))]),
+    "export_forecast_excel": ("/export/excel", lambda periods: []),
+    "export_forecast_pdf": ("/export/pdf", lambda periods: []),
+}
+
+FORECAST_CONFIG = {
+    "scenario_name": "base", "num_periods": 12, "revenue_growth_pct": 200, "cogs_pct_of_revenue": 5500,
+    "opex_growth_pct": 100, "tax_rate_pct": 2100, "capex_cents": 200000, "da_cents": 100000, "wc_pct_of_revenue": 1000,
+}
+
+_QUERIES = re.compile(r'desc="(\d+) queries')
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _start_app(workdir: str):
+    """Point the app at a scratch database and return a client; must run before any app import."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["EXPORT_CACHE_DIR"] = os.path.join(workdir, "export_cache")
+    os.environ["METRICS_ENABLED"] = "1"
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+
+def _reset_database() -> None:
+    from app import models
+    from app.database import engine
+    from app.main import init_db
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    init_db()
+
+
+def _invalidate(company_id: str) -> None:
+    """Bump the company's data version so the next request sees cold caches."""
+    from app import cache
+    from app.database import SessionLocal
+    with SessionLocal() as db:
+        cache.bump_data_version(db, company_id)
+        db.commit()
+
+
+def _ok(response):
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code}: {response.text[:500]}")
+    return response
+
+
+def _timed(call) -> tuple:
+    started = time.perf_counter()
+    response = _ok(call())
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    match = _QUERIES.search(response.headers.get("server-timing", ""))
+    return elapsed_ms, int(match.group(1)) if match else None, response
+
+
+def _summary(values: list) -> dict:
+    ordered = sorted(values)
+    return {
+        "min": round(ordered[0], 2),
+        "median": round(statistics.median(ordered), 2),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def _git_revision():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(__file__), timeout=10
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+# ── Benchmarks ────────────────────────────────────────────────────────────────
+
+def _ingest(client, companies: list) -> tuple:
+    """Upload and map every company through the API; returns (company ids, ingest results)."""
+    from bench import synthetic
+
+    master_ids = {a["account_code"]: a["id"] for a in _ok(client.get("/api/v1/master-coa/")).json()}
+    upload_ms, mapping_ms, company_ids = [], [], []
+    started = time.perf_counter()
+    for company in companies:
+        company_id = _ok(client.post("/api/v1/companies/", json={"name": company.name, "fiscal_year_end": 12})).json()["id"]
+        base = f"/api/v1/companies/{company_id}"
+        for period in company.trial_balances:
+            body = synthetic.tb_csv(company, period)
+            elapsed_ms, _, _ = _timed(lambda: client.post(
+                f"{base}/trial-balances/upload",
+                params={"period_date": str(period)},
+                files={"file": ("tb.csv", body, "text/csv")}
+            ))
+            upload_ms.append(elapsed_ms)
+        account_ids = {a["import_account_number"]: a["id"] for a in _ok(client.get(
+            f"{base}/mappings/unmapped", params={"limit": len(company.accounts)}
+        )).json()}
+        payload = synthetic.mapping_payload(company, account_ids, master_ids)
+        elapsed_ms, _, _ = _timed(lambda: client.put(f"{base}/mappings/", json=payload))
+        mapping_ms.append(elapsed_ms)
+        company_ids.append(company_id)
+    total = time.perf_counter() - started
+
+    rows = sum(len(balances) for company in companies for balances in company.trial_balances.values())
+    return company_ids, {
+        "uploads": len(upload_ms),
+        "rows": rows,
+        "total_s": round(total, 3),
+        "rows_per_s": round(rows / total, 1),
+        "upload_ms": _summary(upload_ms),
+        "mapping_ms": _summary(mapping_ms),
+    }
+
+
+def run_scale(client, name: str, spec: Spec, repeat: int) -> dict:
+    from bench import synthetic
+
+    _log(f"[{name}] {spec}")
+    _reset_database()
+    companies = synthetic.generate(spec)
+    company_ids, ingest = _ingest(client, companies)
+    _log(f"[{name}] ingested {ingest['rows']} rows in {ingest['total_s']}s")
+
+    company_id = company_ids[0]
+    periods = [str(p) for p in synthetic.period_dates(spec.periods)]
+    base = f"/api/v1/companies/{company_id}"
+    _ok(client.put(f"{base}/forecast/config", json={**FORECAST_CONFIG, "base_period": periods[-1]}))
+
+    endpoints = {}
+    for endpoint, (path, params) in ENDPOINTS.items():
+        _invalidate(company_id)
+        call = lambda: client.get(f"{base}{path}", params=params(periods))
+        cold_ms, cold_queries, response = _timed(call)
+        warm = [_timed(call) for _ in range(repeat)]
+        endpoints[endpoint] = {
+            "cold_ms": round(cold_ms, 2),
+            "cold_queries": cold_queries,
+            "warm_ms": _summary([ms for ms, _, _ in warm]),
+            "warm_queries": warm[-1][1],
+            "bytes": len(response.content),
+        }
+        _log(f"[{name}] {endpoint}: cold {cold_ms:.1f}ms, warm {endpoints[endpoint]['warm_ms']['median']}ms")
+    return {"name": name, "spec": vars(spec), "ingest": ingest, "endpoints": endpoints}
+
+
+def run(scales: dict, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="tsm-bench-") as workdir:
+        with _start_app(workdir) as client:
+            results = [run_scale(client, name, spec, repeat) for name, spec in scales.items()]
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "scales": results,
+    }
+
+
+def compare(before: dict, after: dict) -> str:
+    """Side-by-side ingest and median warm / cold timings for scales present in both runs."""
+    lines = [f"{'scale':<8} {'metric':<34} {'before':>10} {'after':>10} {'change':>8}"]
+
+    def row(scale, metric, old, new):
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        lines.append(f"{scale:<8} {metric:<34} {old:>10.2f} {new:>10.2f} {change:>8}")
+
+    previous = {scale["name"]: scale for scale in before["scales"]}
+    for scale in after["scales"]:
+        old = previous.get(scale["name"])
+        if old is None or old["spec"] != scale["spec"]:
+            continue
+        row(scale["name"], "ingest total_s", old["ingest"]["total_s"], scale["ingest"]["total_s"])
+        for endpoint, result in scale["endpoints"].items():
+            if endpoint not in old["endpoints"]:
+                continue
+            row(scale["name"], f"{endpoint} cold_ms", old["endpoints"][endpoint]["cold_ms"], result["cold_ms"])
+            row(scale["name"], f"{endpoint} warm_ms", old["endpoints"][endpoint]["warm_ms"]["median"], result["warm_ms"]["median"])
+    return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", nargs="+", choices=sorted(SCALES), help=f"named scales to run (default: {' '.join(DEFAULT_SCALES)})")
+    parser.add_argument("--companies", type=int)
+    parser.add_argument("--periods", type=int)
+    parser.add_argument("--accounts", type=int)
+    parser.add_argument("--coverage", type=float)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5, help="warm calls per endpoint")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as before, open(args.compare[1]) as after:
+            print(compare(json.load(before), json.load(after)))
+        return
+
+    custom = {k: v for k, v in vars(args).items() if k in ("companies", "periods", "accounts", "coverage") and v is not None}
+    if custom:
+        scales = {"custom": Spec(**{**vars(Spec()), **custom, "seed": args.seed})}
+    else:
+        scales = {name: Spec(**{**vars(SCALES[name]), "seed": args.seed}) for name in args.scale or DEFAULT_SCALES}
+
+    results = json.dumps(run(scales, max(args.repeat, 1)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(results + "\n")
+        _log(f"Wrote {args.output}")
+    else:
+        print(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Deterministic synthetic ledgers for benchmarks, tests and local seeding.
+
+A Spec fixes companies × periods × accounts × mapping coverage and a seed;
+the same Spec always produces the same data. For every company:
+
+- `accounts` raw accounts are spread over the master CoA codes (each code
+  gets at least one), numbered like an imported chart ("4000-003")
+- each period's trial balance is that month's activity in cents, debits
+  positive, with cash absorbing the difference so every TB sums to exactly 0
+- round(coverage × accounts) raw accounts are mapped to their master code;
+  the rest stay unmapped, as after a partial mapping session
+
+Generation needs no database. `tb_csv` renders a period as an upload file;
+`load` writes a dataset straight to a session for fixtures that do not need
+to time ingest.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+
+# Master code -> (name stem, relative share of a company's raw accounts)
+MASTER_CODES = {
+    "1000": ("Cash", 1),
+    "1100": ("Receivables", 1),
+    "1200": ("Inventory", 1),
+    "1500": ("Fixed Assets", 1),
+    "1600": ("Accumulated Depreciation", 1),
+    "2000": ("Payables", 1),
+    "2500": ("Term Loan", 1),
+    "3000": ("Share Capital", 1),
+    "3500": ("Retained Earnings", 1),
+    "4000": ("Sales", 3),
+    "5000": ("Cost of Sales", 2),
+    "6000": ("Operating Expense", 5),
+    "6500": ("Depreciation", 1),
+}
+
+FIRST_PERIOD = date(2021, 1, 31)
+
+
+@dataclass(frozen=True)
+class Spec:
+    companies: int = 1
+    periods: int = 12
+    accounts: int = 30
+    coverage: float = 1.0
+    seed: int = 1
+
+    def __post_init__(self):
+        if self.companies < 1 or self.periods < 1:
+            raise ValueError("Need at least one company and one period.")
+        if self.accounts < len(MASTER_CODES):
+            raise ValueError(f"Need at least {len(MASTER_CODES)} accounts, one per master code.")
+        if not 0 <= self.coverage <= 1:
+            raise ValueError("Mapping coverage must be between 0 and 1.")
+
+
+@dataclass
+class Account:
+    number: str
+    name: str
+    master_code: str
+    mapped: bool
+
+
+@dataclass
+class Company:
+    name: str
+    accounts: list
+    # period_date -> {account number: cents}
+    trial_balances: dict
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def period_dates(count: int) -> list:
+    return [FIRST_PERIOD + relativedelta(months=n, day=31) for n in range(count)]
+
+
+def _accounts_per_code(total: int) -> dict:
+    """One account per code, the rest shared by weight (largest remainder first)."""
+    weights = {code: weight for code, (_, weight) in MASTER_CODES.items()}
+    extra = total - len(weights)
+    whole = sum(weights.values())
+    counts = {code: 1 + extra * w // whole for code, w in weights.items()}
+    by_remainder = sorted(weights, key=lambda code: (-(extra * weights[code] % whole), code))
+    for code in by_remainder[:total - sum(counts.values())]:
+        counts[code] += 1
+    return counts
+
+
+def _split(amount: int, weights: list) -> list:
+    """Integer split of `amount` by `weights` that sums back to `amount` exactly."""
+    whole = sum(weights)
+    parts = [amount * w // whole for w in weights[:-1]]
+    return parts + [amount - sum(parts)]
+
+
+def _chart(rnd: random.Random, spec: Spec) -> list:
+    accounts = []
+    for code, count in _accounts_per_code(spec.accounts).items():
+        stem = MASTER_CODES[code][0]
+        accounts += [
+            Account(f"{code}-{n:03d}", f"{stem} {n}" if count > 1 else stem, code, True)
+            for n in range(1, count + 1)
+        ]
+    for account in rnd.sample(accounts, len(accounts) - round(spec.coverage * len(accounts))):
+        account.mapped = False
+    return accounts
+
+
+def _monthly_lines(rnd: random.Random, month: int, size: float) -> dict:
+    """One month's activity per master code, debit-positive cents; cash balances it."""
+    def scaled(cents):
+        return int(cents * size)
+
+    revenue = scaled(rnd.randint(90_000, 120_000) * 100 * 1.01 ** month)
+    depreciation = scaled(1_000_00)
+    lines = {
+        "4000": -revenue,
+        "5000": revenue * rnd.randint(50, 60) // 100,
+        "6000": scaled(30_000_00 * 1.005 ** month),
+        "6500": depreciation,
+        "1100": scaled(rnd.randint(-5_000, 5_000) * 100),
+        "1200": scaled(rnd.randint(-2_000, 2_000) * 100),
+        "2000": scaled(rnd.randint(-3_000, 3_000) * 100),
+        "1500": scaled(2_000_00) if month % 3 == 0 else 0,
+        "1600": -depreciation,
+        "2500": scaled(-50_000_00) if month == 0 else scaled(1_000_00),
+        "3000": scaled(-100_000_00) if month == 0 else 0,
+        "3500": 0,
+    }
+    lines["1000"] = -sum(lines.values())
+    return lines
+
+
+# ── Generation ────────────────────────────────────────────────────────────────
+
+def generate(spec: Spec) -> list:
+    """The Spec's companies, in order; identical on every call."""
+    rnd = random.Random(spec.seed)
+    periods = period_dates(spec.periods)
+    companies = []
+    for index in range(spec.companies):
+        accounts = _chart(rnd, spec)
+        by_code = {}
+        for account in accounts:
+            by_code.setdefault(account.master_code, []).append(account)
+        # Fixed split of each line over the code's raw accounts
+        weights = {code: [rnd.randint(1, 9) for _ in members] for code, members in by_code.items()}
+        size = rnd.uniform(0.5, 2.0)
+
+        trial_balances = {}
+        for month, period in enumerate(periods):
+            balances = {}
+            for code, amount in _monthly_lines(rnd, month, size).items():
+                for account, cents in zip(by_code[code], _split(amount, weights[code])):
+                    balances[account.number] = cents
+            trial_balances[period] = balances
+        companies.append(Company(f"Synthetic {spec.seed}-{index + 1:03d}", accounts, trial_balances))
+    return companies
+
+
+def tb_csv(company: Company, period: date) -> str:
+    """A period's trial balance as an upload CSV, amounts in dollars."""
+    names = {account.number: account.name for account in company.accounts}
+    lines = ["Account Number,Account Name,Balance"]
+    lines += [
+        f"{number},{names[number]},{cents / 100:.2f}"
+        for number, cents in company.trial_balances[period].items()
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def mapping_payload(company: Company, account_ids: dict, master_ids: dict) -> list:
+    """Body for PUT /mappings/ given {account number: id} and {master code: id}."""
+    return [
+        {"company_account_id": account_ids[account.number], "master_account_id": master_ids[account.master_code]}
+        for account in company.accounts if account.mapped
+    ]
+
+
+def load(db, companies: list) -> list:
+    """Insert companies, charts, mappings and TBs directly; returns the company ids."""
+    # Imported here so generating data never opens the app's database
+    from app import cache, kpi, models
+
+    master_ids = dict(db.query(models.MasterChartOfAccount.account_code, models.MasterChartOfAccount.id))
+    company_ids = []
+    for company in companies:
+        row = models.Company(name=company.name, fiscal_year_end=12, currency="USD")
+        db.add(row)
+        db.flush()
+        accounts = {
+            account.number: models.CompanyAccount(
+                company_id=row.id,
+                import_account_number=account.number,
+                import_account_name=account.name
+            )
+            for account in company.accounts
+        }
+        db.add_all(accounts.values())
+        db.flush()
+        db.add_all(
+            models.AccountMapping(company_account_id=accounts[account.number].id, master_account_id=master_ids[account.master_code])
+            for account in company.accounts if account.mapped
+        )
+        for period_date, balances in company.trial_balances.items():
+            period = models.ReportingPeriod(company_id=row.id, period_date=period_date)
+            db.add(period)
+            db.flush()
+            db.add_all(
+                models.TrialBalanceEntry(reporting_period_id=period.id, company_account_id=accounts[number].id, balance=cents)
+                for number, cents in balances.items()
+            )
+        kpi.refresh(db, row.id)
+        cache.bump_data_version(db, row.id)
+        company_ids.append(row.id)
+    db.commit()
+    return company_ids
@@ -44,8 +44,14 @@ def main() -> None:
         host="127.0.0.1",
         port=8000,
         log_level="warning",   # Keep stdout clean; Electron will discard it anyway
+        # Open /events streams never finish on their own; don't let them hold up shutdown
+        timeout_graceful_shutdown=2,
     )
 
 
 if __name__ == "__main__":
+    # Batch exports render in a process pool; frozen builds must let
+    # worker processes start here instead of re-running the server
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
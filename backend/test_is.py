@@ -1,41 +1,40 @@
 from app.database import SessionLocal
 from app.routers.statements import get_income_statement
-from datetime import date
 
 db = SessionLocal()
 
 try:
-    # 1. Fetch Acme Corp to get the ID
-    from app.models import Company
-    company = db.query(Company).filter_by(name="Acme Corp").first()
-    
+    # 1. Find a company with uploaded periods (run seed.py first)
+    from app.models import Company, ReportingPeriod
+    company = db.query(Company).join(
+        ReportingPeriod, ReportingPeriod.company_id == Company.id
+    ).order_by(Company.name).first()
+
     if not company:
-        print("Company not found. Did you run the seed script?")
+        print("No company with trial balances found. Did you run the seed script?")
         exit(1)
-        
+
+    periods = [
+        p for (p,) in db.query(ReportingPeriod.period_date).filter(
+            ReportingPeriod.company_id == company.id
+        ).order_by(ReportingPeriod.period_date)
+    ]
     print(f"Testing Income Statement for {company.name}...")
-    
-    # 2. Call the logical endpoint function directly
-    # We seeded a period at 2024-01-31
-    result = get_income_statement(
-        company_id=company.id,
-        period_start=date(2024, 1, 1),
-        period_end=date(2024, 12, 31),
-        db=db
-    )
-    
+
+    # 2. Call the logical endpoint function directly; it returns one entry per period
+    results = get_income_statement(company_id=company.id, periods=periods, db=db)
+
     # 3. Print the results beautifully
-    print("\n--- INCOME STATEMENT (Jan - Dec 2024) ---")
-    
-    rev = result['total_revenues_cents'] / 100
-    exp = result['total_expenses_cents'] / 100
-    ni = result['net_income_cents'] / 100
-    
-    print(f"Total Revenues: ${rev:,.2f}")
-    print(f"Total Expenses: ${exp:,.2f}")
-    print("-" * 40)
-    print(f"Net Income:     ${ni:,.2f}")
-    print("-----------------------------------------")
+    print(f"\n--- INCOME STATEMENT ({periods[0]} - {periods[-1]}) ---")
+    print(f"{'Period':<12} {'Revenues':>16} {'Expenses':>16} {'Net Income':>16}")
+    for result in results:
+        rev = result['total_revenues_cents'] / 100
+        exp = result['total_expenses_cents'] / 100
+        ni = result['net_income_cents'] / 100
+        print(f"{result['period']:<12} ${rev:>15,.2f} ${exp:>15,.2f} ${ni:>15,.2f}")
+    print("-" * 63)
+    total = sum(r['net_income_cents'] for r in results) / 100
+    print(f"{'Total':<12} {'':>16} {'':>16} ${total:>15,.2f}")
 
 finally:
     db.close()
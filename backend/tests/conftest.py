@@ -0,0 +1,201 @@
+"""
+Shared fixtures for the backend test suite.
+
+Tests run against a scratch SQLite database in a temporary directory, never
+the app's own; the environment below is set before the app is imported.
+Datasets come from bench.synthetic, so every run sees the same ledgers.
+"""
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+_WORKDIR = tempfile.mkdtemp(prefix="tsm-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_WORKDIR}/tests.db"
+os.environ["EXPORT_CACHE_DIR"] = os.path.join(_WORKDIR, "export_cache")
+# Opt-in instrumentation stays off so statement counts match production defaults
+for _name in ("METRICS_ENABLED", "PROFILING_ENABLED", "SLOW_QUERY_MS"):
+    os.environ.pop(_name, None)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import cache, models, slow_queries  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from bench import synthetic  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_name("query_baseline.json")
+# Stretch every wall-clock budget on slow machines, e.g. QUERY_BUDGET_TIME_SCALE=3
+TIME_SCALE = float(os.getenv("QUERY_BUDGET_TIME_SCALE", "1"))
+
+# Fixed datasets the budgets are written against
+SCALES = {
+    "small": synthetic.Spec(companies=2, periods=6, accounts=20, coverage=0.9, seed=7),
+    "large": synthetic.Spec(companies=2, periods=24, accounts=80, coverage=0.9, seed=7),
+}
+
+FORECAST_CONFIG = {
+    "scenario_name": "base", "num_periods": 12, "revenue_growth_pct": 200, "cogs_pct_of_revenue": 5500,
+    "opex_growth_pct": 100, "tax_rate_pct": 2100, "capex_cents": 200000, "da_cents": 100000, "wc_pct_of_revenue": 1000,
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-query-baseline", action="store_true",
+        help="record the statements each budgeted call issues into tests/query_baseline.json"
+    )
+
+
+# ── SQL capture ───────────────────────────────────────────────────────────────
+
+@contextmanager
+def capture_sql():
+    """Collect every statement sent to the database inside the block, from any thread."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def statement_counts(statements: list) -> Counter:
+    return Counter(slow_queries.shape(s) for s in statements)
+
+
+def describe_added(key: str, statements: list, baseline: dict) -> str:
+    """What a call issued compared with its recorded baseline, for failure messages."""
+    actual = statement_counts(statements)
+
+    def listing(counter, sign):
+        return "\n".join(f"  {sign}{n} x {sql[:300]}" for sql, n in counter.most_common())
+
+    recorded = baseline.get(key)
+    if recorded is None:
+        return f"No recorded baseline for {key}; statements issued:\n{listing(actual, '')}"
+    recorded = Counter(recorded)
+    added, removed = actual - recorded, recorded - actual
+    parts = [f"Added since the baseline:\n{listing(added, '+')}" if added else "Nothing added since the baseline."]
+    if removed:
+        parts.append(f"Removed since the baseline:\n{listing(removed, '-')}")
+    return "\n".join(parts)
+
+
+@pytest.fixture(scope="session")
+def query_baseline(request):
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    recorded = {}
+    yield baseline, recorded
+    if recorded:
+        merged = {**baseline, **{key: dict(sorted(counts.items())) for key, counts in recorded.items()}}
+        BASELINE_PATH.write_text(json.dumps(dict(sorted(merged.items())), indent=2) + "\n")
+
+
+@pytest.fixture
+def within_budget(query_baseline, request):
+    """
+    Make one call and check it against a statement and wall-clock budget.
+
+    `key` names the call in failures and in the baseline file. Returns the
+    response; 4xx/5xx responses fail the test.
+    """
+    baseline, recorded = query_baseline
+    updating = request.config.getoption("--update-query-baseline")
+
+    def check(key: str, call, max_statements: int, max_ms: float):
+        with capture_sql() as statements:
+            started = time.perf_counter()
+            response = call()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        assert response.status_code < 400, f"{key}: {response.status_code} {response.text[:500]}"
+        if updating:
+            recorded[key] = statement_counts(statements)
+        assert len(statements) <= max_statements, (
+            f"{key}: {len(statements)} SQL statements, budget {max_statements}.\n"
+            + describe_added(key, statements, baseline)
+        )
+        assert elapsed_ms <= max_ms * TIME_SCALE, f"{key}: took {elapsed_ms:.0f} ms, budget {max_ms * TIME_SCALE:.0f} ms."
+        return response
+    return check
+
+
+# ── App and datasets ──────────────────────────────────────────────────────────
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class Dataset:
+    """Seeded companies for one scale, plus the objects built on them."""
+
+    def __init__(self, scale: str, spec: synthetic.Spec, companies: list, company_ids: list):
+        self.scale = scale
+        self.spec = spec
+        self.companies = companies
+        self.company_ids = company_ids
+        self.company_id = company_ids[0]
+        self.periods = [str(p) for p in synthetic.period_dates(spec.periods)]
+        self.group_id = None
+
+
+@pytest.fixture(scope="session")
+def datasets(client):
+    loaded = {}
+    for scale, spec in SCALES.items():
+        companies = synthetic.generate(spec)
+        with SessionLocal() as db:
+            company_ids = synthetic.load(db, companies)
+        data = Dataset(scale, spec, companies, company_ids)
+        response = client.put(
+            f"/api/v1/companies/{data.company_id}/forecast/config",
+            json={**FORECAST_CONFIG, "base_period": data.periods[-1]}
+        )
+        assert response.status_code == 200, response.text
+        response = client.post("/api/v1/consolidation-groups", json={
+            "name": f"Group {scale}",
+            "parent_company_id": company_ids[0],
+            "members": [{"company_id": cid, "ownership_pct": 8000} for cid in company_ids[1:]],
+        })
+        assert response.status_code == 201, response.text
+        data.group_id = response.json()["id"]
+        loaded[scale] = data
+    return loaded
+
+
+@pytest.fixture
+def scratch_company():
+    """A fresh single company at a scale's size, for tests that write to the ledger."""
+    def make(scale: str):
+        """(company id, synthetic.Company, {account number: company account id})"""
+        spec = SCALES[scale]
+        companies = synthetic.generate(synthetic.Spec(1, spec.periods, spec.accounts, spec.coverage, spec.seed + 100))
+        with SessionLocal() as db:
+            company_id = synthetic.load(db, companies)[0]
+            account_ids = dict(db.query(models.CompanyAccount.import_account_number, models.CompanyAccount.id).filter(
+                models.CompanyAccount.company_id == company_id
+            ))
+        return company_id, companies[0], account_ids
+    return make
+
+
+@pytest.fixture
+def invalidate():
+    """Bump a company's data version so its next read starts with cold caches."""
+    def bump(company_id: str) -> None:
+        with SessionLocal() as db:
+            cache.bump_data_version(db, company_id)
+            db.commit()
+    return bump
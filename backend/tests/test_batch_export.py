@@ -0,0 +1,37 @@
+"""Batch export job lifecycle."""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.routers import batch_export
+
+
+def _start(client, company_id):
+    response = client.post("/api/v1/exports/batch", json={"company_ids": [company_id], "include_actuals": False})
+    assert response.status_code == 202, response.text
+    return response.json()["job_id"]
+
+
+def test_batch_recovers_from_broken_pool(client, datasets, monkeypatch):
+    broken = ProcessPoolExecutor(max_workers=1)
+    broken.submit(os._exit, 1).exception()
+    monkeypatch.setattr(batch_export, "BATCH_WORKERS", 1)
+    monkeypatch.setattr(batch_export, "_pool", broken)
+
+    job_id = _start(client, datasets["small"].company_id)
+    job = client.get(f"/api/v1/exports/batch/{job_id}").json()
+    assert job["status"] == "completed" and not job["errors"], job
+    assert batch_export._pool is not broken
+    assert client.get(f"/api/v1/exports/batch/{job_id}/download").status_code == 200
+
+
+def test_job_records_expire_with_archives(client, datasets, monkeypatch):
+    monkeypatch.setattr(batch_export, "BATCH_WORKERS", 0)
+    old_id = _start(client, datasets["small"].company_id)
+    expired = time.time() - batch_export.BATCH_RETENTION_SECONDS - 1
+    batch_export.export_jobs[old_id]["_finished"] = expired
+
+    for _ in range(40):
+        _start(client, datasets["small"].company_id)
+    assert old_id not in batch_export.export_jobs
+    assert len(batch_export.export_jobs) >= 40
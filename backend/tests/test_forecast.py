@@ -0,0 +1,95 @@
+"""Forecast endpoint behaviour beyond the query budgets."""
+import pytest
+
+from app import models, projection
+from app.database import SessionLocal
+
+
+@pytest.mark.parametrize("spec", [
+    {"distribution": "normal", "std": -1},
+    {"distribution": "uniform", "low": 10, "high": 0},
+    {"distribution": "uniform", "low": 0},
+    {"distribution": "triangular", "low": 0, "high": 10, "mode": 20},
+])
+def test_simulate_rejects_invalid_distribution(client, datasets, spec):
+    company_id = datasets["small"].company_id
+    response = client.post(
+        f"/api/v1/companies/{company_id}/forecast/simulate",
+        json={"num_paths": 100, "drivers": {"revenue_growth_pct": spec}}
+    )
+    assert response.status_code == 422, response.text
+
+
+def test_simulate_rejects_non_finite_bounds(client, datasets):
+    company_id = datasets["small"].company_id
+    response = client.post(
+        f"/api/v1/companies/{company_id}/forecast/simulate",
+        content='{"num_paths": 100, "drivers": {"revenue_growth_pct": {"distribution": "uniform", "low": 0, "high": Infinity}}}',
+        headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 422, response.text
+
+
+def test_statements_empty_state_has_full_shape(client, scratch_company):
+    company_id, _, _ = scratch_company("small")
+    body = client.get(f"/api/v1/companies/{company_id}/forecast/statements").json()
+    assert body["projections"] == [] and body["balance_sheet_lines"] == []
+    assert body["solver"]["converged"] is True
+
+
+def test_solver_converged_on_last_allowed_iteration(client, scratch_company, invalidate, monkeypatch):
+    company_id, company, _ = scratch_company("small")
+    client.put(f"/api/v1/companies/{company_id}/forecast/config", json={
+        "base_period": str(max(company.trial_balances)), "num_periods": 6, "revenue_growth_pct": -2000,
+        "revolver_limit_cents": 10**12, "revolver_rate_pct": 90000, "min_cash_cents": 10**9,
+    }).raise_for_status()
+    solver = client.get(f"/api/v1/companies/{company_id}/forecast/statements").json()["solver"]
+    assert solver["converged"] and solver["worst_period_iterations"] > 1
+
+    monkeypatch.setattr(projection, "CIRCULARITY_MAX_ITERATIONS", solver["worst_period_iterations"])
+    invalidate(company_id)
+    body = client.get(f"/api/v1/companies/{company_id}/forecast/statements").json()
+    assert body["solver"]["converged"] is True
+    assert all(row["circularity_converged"] for row in body["projections"])
+
+    monkeypatch.setattr(projection, "CIRCULARITY_MAX_ITERATIONS", solver["worst_period_iterations"] - 1)
+    invalidate(company_id)
+    assert client.get(f"/api/v1/companies/{company_id}/forecast/statements").json()["solver"]["converged"] is False
+
+
+def test_statements_refresh_when_only_rolling_mode_changes(client, scratch_company):
+    company_id, company, _ = scratch_company("small")
+    config = {"base_period": str(max(company.trial_balances)), "num_periods": 6}
+    url = f"/api/v1/companies/{company_id}/forecast"
+    client.put(f"{url}/config", json=config).raise_for_status()
+    assert client.get(f"{url}/statements").json()["config"]["rolling_mode"] is None
+
+    client.put(f"{url}/config", json={**config, "rolling_mode": "window"}).raise_for_status()
+    assert client.get(f"{url}/statements").json()["config"]["rolling_mode"] == "window"
+
+
+@pytest.mark.parametrize("num_periods", [0, -3, 121])
+def test_config_rejects_out_of_range_horizon(client, datasets, num_periods):
+    data = datasets["small"]
+    response = client.put(
+        f"/api/v1/companies/{data.company_id}/forecast/config",
+        json={"scenario_name": "bad_horizon", "base_period": data.periods[-1], "num_periods": num_periods}
+    )
+    assert response.status_code == 422, response.text
+
+
+@pytest.mark.parametrize("endpoint, body", [
+    ("goal-seek", {"driver": "revenue_growth_pct"}),
+    ("sensitivity", {"x": {"driver": "revenue_growth_pct", "values": [0, 100]}}),
+])
+def test_solvers_reject_period_outside_saved_horizon(client, scratch_company, endpoint, body):
+    company_id, company, _ = scratch_company("small")
+    url = f"/api/v1/companies/{company_id}/forecast"
+    client.put(f"{url}/config", json={"base_period": str(max(company.trial_balances))}).raise_for_status()
+    # A horizon saved before num_periods was bounded
+    with SessionLocal() as db:
+        db.query(models.ForecastConfig).filter(models.ForecastConfig.company_id == company_id).update({"num_periods": 0})
+        db.commit()
+
+    assert client.post(f"{url}/{endpoint}", json=body).status_code == 400
+    assert client.post(f"{url}/{endpoint}", json={**body, "period": 5}).status_code == 400
@@ -0,0 +1,29 @@
+"""SQL timing hooks."""
+import copy
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from app import instrumentation, slow_queries
+
+
+@pytest.fixture(params=[instrumentation, slow_queries], ids=lambda module: module.__name__)
+def hooked_engine(request, monkeypatch):
+    monkeypatch.setattr(slow_queries, "THRESHOLD_MS", float("inf"))
+    engine = create_engine("sqlite://")
+    event.listen(engine, "before_cursor_execute", request.param._before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", request.param._after_cursor_execute)
+    yield engine
+    engine.dispose()
+
+
+def test_failed_statements_leave_no_connection_state(hooked_engine):
+    with hooked_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        info = copy.deepcopy(dict(conn.info))
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info == info
@@ -0,0 +1,48 @@
+"""Ledger export formats read back."""
+import csv
+import io
+import json
+
+import pytest
+
+from app import models
+from app.database import SessionLocal
+from app.routers.ledger import LEDGER_COLUMNS
+
+
+def _export(client, company_id, fmt):
+    response = client.get("/api/v1/ledger/export", params={"format": fmt, "company_id": company_id})
+    assert response.status_code == 200, response.text
+    return response.content
+
+
+def _entry_count(company_id):
+    with SessionLocal() as db:
+        return db.query(models.TrialBalanceEntry).join(models.CompanyAccount).filter(
+            models.CompanyAccount.company_id == company_id
+        ).count()
+
+
+def test_csv_export(client, datasets):
+    company_id = datasets["small"].company_id
+    rows = list(csv.reader(io.StringIO(_export(client, company_id, "csv").decode())))
+    assert tuple(rows[0]) == LEDGER_COLUMNS
+    assert len(rows) - 1 == _entry_count(company_id)
+    assert {row[0] for row in rows[1:]} == {company_id}
+
+
+def test_jsonl_export(client, datasets):
+    company_id = datasets["small"].company_id
+    rows = [json.loads(line) for line in _export(client, company_id, "jsonl").decode().splitlines()]
+    assert len(rows) == _entry_count(company_id)
+    assert all(tuple(row) == LEDGER_COLUMNS for row in rows)
+    assert all(isinstance(row["balance_cents"], int) for row in rows)
+
+
+def test_parquet_export(client, datasets):
+    pq = pytest.importorskip("pyarrow.parquet")
+    company_id = datasets["small"].company_id
+    table = pq.read_table(io.BytesIO(_export(client, company_id, "parquet")))
+    assert tuple(table.column_names) == LEDGER_COLUMNS
+    assert table.num_rows == _entry_count(company_id)
+    assert str(table.schema.field("balance_cents").type) == "int64"
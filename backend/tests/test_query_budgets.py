@@ -0,0 +1,209 @@
+"""
+SQL statement and wall-clock budgets per endpoint and dataset scale.
+
+Reads are made cold (the company's caches invalidated first), then warm
+again right after. Writes run against a fresh company.
+Statement budgets are what each call issues today, so a change that adds a
+query fails here with the added statements listed against
+tests/query_baseline.json. After an intended change, update the numbers
+below and re-record the baseline:
+
+    pytest --update-query-baseline
+
+The three statement endpoints still query per period, so their budgets grow
+with the scale; no other budget should. Wall-clock budgets are loose
+ceilings against gross regressions (QUERY_BUDGET_TIME_SCALE stretches them).
+"""
+import pytest
+
+from bench import synthetic
+
+SCALES = ["small", "large"]
+
+
+def _periods(d):
+    return {"params": [("periods", p) for p in d.periods]}
+
+
+# name -> (method, path, request kwargs) for a seeded dataset
+READS = {
+    "list_companies": lambda d: ("GET", "/api/v1/companies/", {}),
+    "get_company": lambda d: ("GET", f"/api/v1/companies/{d.company_id}", {}),
+    "master_coa": lambda d: ("GET", "/api/v1/master-coa/", {}),
+    "periods": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/periods", {}),
+    "unmapped_accounts": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/mappings/unmapped", {}),
+    "income_statement": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/statements/income-statement", _periods(d)),
+    "balance_sheet": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/statements/balance-sheet", _periods(d)),
+    "cash_flow": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/statements/cash-flow", _periods(d)),
+    "dashboard_summary": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/dashboard/summary", {}),
+    "dashboard_ratios": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/dashboard/ratios", {}),
+    "forecast_config": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/forecast/config", {}),
+    "forecast_statements": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/forecast/statements", {}),
+    "forecast_compare": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/forecast/compare", {}),
+    "forecast_baseline": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/forecast/baseline", {}),
+    "forecast_preview": lambda d: ("POST", f"/api/v1/companies/{d.company_id}/forecast/preview", {
+        "json": {"base_period": d.periods[-1], "num_periods": 12, "revenue_growth_pct": 300},
+    }),
+    "forecast_simulate": lambda d: ("POST", f"/api/v1/companies/{d.company_id}/forecast/simulate", {
+        "json": {"num_paths": 200, "seed": 1, "drivers": {"revenue_growth_pct": {"std": 100}}},
+    }),
+    "forecast_sensitivity": lambda d: ("POST", f"/api/v1/companies/{d.company_id}/forecast/sensitivity", {
+        "json": {"x": {"driver": "revenue_growth_pct", "values": [0, 200, 400]}},
+    }),
+    "forecast_goal_seek": lambda d: ("POST", f"/api/v1/companies/{d.company_id}/forecast/goal-seek", {
+        "json": {"driver": "revenue_growth_pct", "target_cents": 0},
+    }),
+    "export_actuals_excel": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/export/actuals/excel", {
+        "params": {"periods": ",".join(d.periods)},
+    }),
+    "export_actuals_pdf": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/export/actuals/pdf", {
+        "params": {"periods": ",".join(d.periods)},
+    }),
+    "export_forecast_excel": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/export/excel", {}),
+    "export_forecast_pdf": lambda d: ("GET", f"/api/v1/companies/{d.company_id}/export/pdf", {}),
+    "ledger_export": lambda d: ("GET", "/api/v1/ledger/export", {"params": {"company_id": d.company_id}}),
+    "consolidation_groups": lambda d: ("GET", "/api/v1/consolidation-groups", {}),
+    "consolidation_statements": lambda d: ("GET", f"/api/v1/consolidation-groups/{d.group_id}/statements", {}),
+    "fx_rates": lambda d: ("GET", "/api/v1/fx-rates", {}),
+}
+
+# name -> {scale: (cold statements, warm statements, ms)}
+READ_BUDGETS = {
+    "list_companies": {"small": (1, 1, 500), "large": (1, 1, 500)},
+    "get_company": {"small": (1, 1, 500), "large": (1, 1, 500)},
+    "master_coa": {"small": (1, 1, 500), "large": (1, 1, 500)},
+    "periods": {"small": (1, 1, 500), "large": (1, 1, 500)},
+    "unmapped_accounts": {"small": (1, 1, 500), "large": (1, 1, 500)},
+    "income_statement": {"small": (12, 12, 500), "large": (48, 48, 600)},
+    "balance_sheet": {"small": (36, 36, 500), "large": (144, 144, 2750)},
+    "cash_flow": {"small": (42, 42, 550), "large": (168, 168, 2200)},
+    "dashboard_summary": {"small": (4, 2, 500), "large": (4, 2, 500)},
+    "dashboard_ratios": {"small": (1, 1, 500), "large": (1, 1, 500)},
+    "forecast_config": {"small": (1, 1, 500), "large": (1, 1, 500)},
+    "forecast_statements": {"small": (3, 1, 500), "large": (3, 1, 500)},
+    "forecast_compare": {"small": (3, 2, 500), "large": (3, 2, 500)},
+    "forecast_baseline": {"small": (1, 1, 500), "large": (1, 1, 500)},
+    "forecast_preview": {"small": (2, 0, 500), "large": (2, 0, 500)},
+    "forecast_simulate": {"small": (3, 2, 500), "large": (3, 2, 500)},
+    "forecast_sensitivity": {"small": (3, 2, 500), "large": (3, 2, 500)},
+    "forecast_goal_seek": {"small": (3, 2, 500), "large": (3, 2, 500)},
+    "export_actuals_excel": {"small": (91, 1, 1300), "large": (361, 1, 5550)},
+    "export_actuals_pdf": {"small": (91, 1, 1200), "large": (361, 1, 5550)},
+    "export_forecast_excel": {"small": (5, 2, 500), "large": (5, 2, 500)},
+    "export_forecast_pdf": {"small": (5, 2, 500), "large": (5, 2, 500)},
+    "ledger_export": {"small": (1, 1, 500), "large": (1, 1, 500)},
+    "consolidation_groups": {"small": (3, 3, 500), "large": (3, 3, 500)},
+    "consolidation_statements": {"small": (5, 4, 500), "large": (5, 4, 500)},
+    "fx_rates": {"small": (1, 1, 500), "large": (1, 1, 500)},
+}
+
+# name -> {scale: (statements, ms)}
+WRITE_BUDGETS = {
+    "upload": {"small": (14, 500), "large": (14, 500)},
+    "reupload": {"small": (11, 500), "large": (11, 500)},
+    "remap": {"small": (8, 500), "large": (8, 500)},
+    "delete_period": {"small": (12, 500), "large": (12, 500)},
+    "forecast_config_save": {"small": (3, 500), "large": (3, 500)},
+    "fx_rates_save": {"small": (2, 500), "large": (2, 500)},
+}
+
+
+@pytest.mark.parametrize("scale", SCALES)
+@pytest.mark.parametrize("name", READS)
+def test_read_budget(client, datasets, invalidate, within_budget, name, scale):
+    data = datasets[scale]
+    method, path, kwargs = READS[name](data)
+    cold, warm, max_ms = READ_BUDGETS[name][scale]
+
+    def call():
+        return client.request(method, path, **kwargs)
+
+    invalidate(data.company_id)
+    within_budget(f"{name}[{scale}]", call, cold, max_ms)
+    within_budget(f"{name}[{scale}, warm]", call, warm, max_ms)
+
+
+# ── Writes ────────────────────────────────────────────────────────────────────
+
+def _upload(client, company_id, period, csv):
+    return client.post(
+        f"/api/v1/companies/{company_id}/trial-balances/upload",
+        params={"period_date": str(period)},
+        files={"file": ("tb.csv", csv, "text/csv")}
+    )
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_upload_budget(client, scratch_company, within_budget, scale):
+    """A new month with every existing account plus a few new ones."""
+    company_id, company, _ = scratch_company(scale)
+    last = max(company.trial_balances)
+    next_period = synthetic.period_dates(len(company.trial_balances) + 1)[-1]
+    csv = synthetic.tb_csv(company, last)
+    csv += "".join(f"9000-{n:03d},New Account {n},{n}.00\n9100-{n:03d},New Offset {n},-{n}.00\n" for n in range(1, 4))
+
+    statements, max_ms = WRITE_BUDGETS["upload"][scale]
+    within_budget(f"upload[{scale}]", lambda: _upload(client, company_id, next_period, csv), statements, max_ms)
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_reupload_budget(client, scratch_company, within_budget, scale):
+    company_id, company, _ = scratch_company(scale)
+    last = max(company.trial_balances)
+    csv = synthetic.tb_csv(company, last)
+
+    statements, max_ms = WRITE_BUDGETS["reupload"][scale]
+    within_budget(f"reupload[{scale}]", lambda: _upload(client, company_id, last, csv), statements, max_ms)
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_remap_budget(client, scratch_company, within_budget, scale):
+    """Re-point every account to a master account, existing mappings included."""
+    company_id, company, account_ids = scratch_company(scale)
+    master_id = client.get("/api/v1/master-coa/").json()[0]["id"]
+    payload = [{"company_account_id": a, "master_account_id": master_id} for a in account_ids.values()]
+
+    statements, max_ms = WRITE_BUDGETS["remap"][scale]
+    within_budget(
+        f"remap[{scale}]",
+        lambda: client.put(f"/api/v1/companies/{company_id}/mappings/", json=payload),
+        statements, max_ms
+    )
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_delete_period_budget(client, scratch_company, within_budget, scale):
+    company_id, company, _ = scratch_company(scale)
+    first = min(company.trial_balances)
+
+    statements, max_ms = WRITE_BUDGETS["delete_period"][scale]
+    within_budget(
+        f"delete_period[{scale}]",
+        lambda: client.delete(f"/api/v1/companies/{company_id}/periods/{first}"),
+        statements, max_ms
+    )
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_forecast_config_budget(client, scratch_company, within_budget, scale):
+    company_id, company, _ = scratch_company(scale)
+    payload = {"scenario_name": "upside", "base_period": str(max(company.trial_balances)), "num_periods": 12}
+
+    statements, max_ms = WRITE_BUDGETS["forecast_config_save"][scale]
+    within_budget(
+        f"forecast_config_save[{scale}]",
+        lambda: client.put(f"/api/v1/companies/{company_id}/forecast/config", json=payload),
+        statements, max_ms
+    )
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_fx_rates_budget(client, datasets, within_budget, scale):
+    """One bulk upsert of a rate per month."""
+    payload = [
+        {"base_currency": "EUR", "quote_currency": f"X{scale[0].upper()}Z", "period_date": p, "closing_rate": 1.1, "average_rate": 1.05}
+        for p in datasets[scale].periods
+    ]
+
+    statements, max_ms = WRITE_BUDGETS["fx_rates_save"][scale]
+    within_budget(f"fx_rates_save[{scale}]", lambda: client.put("/api/v1/fx-rates", json=payload), statements, max_ms)
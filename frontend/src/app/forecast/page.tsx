@@ -2,8 +2,6 @@
 
 import { useState, useEffect } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
-import jsPDF from "jspdf";
-import autoTable from "jspdf-autotable";
 import {
     getPeriods,
     getForecastConfig,
@@ -293,193 +291,30 @@ export default function ForecastPage() {
     };
 
     const handleExport = async (format: "excel" | "pdf", selection: { is: boolean; bs: boolean; cf: boolean }) => {
-        if (format === "excel") {
-            const params = new URLSearchParams({
-                scenario,
-                include_is: selection.is.toString(),
-                include_bs: selection.bs.toString(),
-                include_cf: selection.cf.toString(),
-            });
-            
-            try {
-                const response = await api.get(`/companies/${companyId}/export/excel?${params.toString()}`, {
-                    responseType: 'blob'
-                });
-                
-                await downloadFile(
-                    response.data, 
-                    `${scenario}_forecast.xlsx`, 
-                    "xlsx"
-                );
-            } catch (err) {
-                console.error("Excel export failed", err);
-                alert("Failed to export Excel. Please try again.");
-            }
-        } else {
-            await handleExportPDF(selection);
-        }
-        setIsExportModalOpen(false);
-    };
-
-    const handleExportPDF = async (selection: { is: boolean; bs: boolean; cf: boolean }) => {
-        if (!forecast || !actuals) return;
-        const doc = new jsPDF("landscape");
-
-        const getExportMetadata = () => {
-            const selectedBits: string[] = [];
-            if (selection.is) selectedBits.push("IS");
-            if (selection.bs) selectedBits.push("BS");
-            if (selection.cf) selectedBits.push("CF");
-
-            const mapping: Record<string, string> = {
-                "IS": "Income Statement",
-                "BS": "Balance Sheet",
-                "CF": "Cash Flow"
-            };
-            const names = selectedBits.map(b => mapping[b]);
-
-            if (selectedBits.length === 3) {
-                return { title: "Full Financial Forecast", filename: `Full_Forecast_${scenario.toUpperCase()}` };
-            }
-            if (selectedBits.length === 1) {
-                return { title: names[0] || "Forecast", filename: `${selectedBits[0]}_Forecast_${scenario.toUpperCase()}` };
-            }
-
-            return {
-                title: names.join(" & ") || "Financial Forecast",
-                filename: `${selectedBits.join("_")}_Forecast_${scenario.toUpperCase()}`
-            };
-        };
-
-        const metadata = getExportMetadata();
-
-        const formatMoney = (cents: number) => {
-            const val = cents / 100;
-            const formatted = new Intl.NumberFormat("en-US", {
-                style: "currency",
-                currency: currency,
-                minimumFractionDigits: 0,
-                maximumFractionDigits: 0,
-            }).format(Math.abs(val));
-
-            return val < 0 ? `(${formatted})` : formatted;
-        };
-
-        // Title
-        doc.setFontSize(20);
-        doc.setTextColor(50, 50, 50);
-        doc.text(`${metadata.title} (${scenario.toUpperCase()})`, 14, 22);
-
-        doc.setFontSize(10);
-        doc.setTextColor(100, 100, 100);
-        doc.text(`Generated on ${new Date().toLocaleString()}`, 14, 30);
-
-        const tableHeaders = ["Metric", `Actuals\n${forecast.base_period}`, ...projections.map((p: ForecastPeriod) => `Forecast\n${p.period}`)];
-
-        let lastY = 40;
-
-        // --- INCOME STATEMENT ---
-        if (selection.is) {
-            autoTable(doc, {
-                startY: lastY,
-                head: [tableHeaders],
-                body: [
-                    ["Revenue", formatMoney(actuals.revenue_cents), ...projections.map((p: ForecastPeriod) => formatMoney(p.revenue_cents))],
-                    ["COGS", formatMoney(0), ...projections.map((p: ForecastPeriod) => formatMoney(-p.cogs_cents))],
-                    [{ content: "Gross Profit", styles: { fontStyle: 'bold' as const } },
-                    { content: formatMoney(0), styles: { fontStyle: 'bold' as const } },
-                    ...projections.map((p: ForecastPeriod) => ({ content: formatMoney(p.gross_profit_cents), styles: { fontStyle: 'bold' as const } }))],
-                    ["Operating Expenses", formatMoney(-actuals.expenses_cents), ...projections.map((p: ForecastPeriod) => formatMoney(-p.opex_cents))],
-                    [{ content: "EBITDA", styles: { fontStyle: 'bold' as const } },
-                    { content: formatMoney(0), styles: { fontStyle: 'bold' as const } },
-                    ...projections.map((p: ForecastPeriod) => ({ content: formatMoney(p.ebitda_cents), styles: { fontStyle: 'bold' as const } }))],
-                    ["D&A", formatMoney(0), ...projections.map((p: ForecastPeriod) => formatMoney(-p.da_cents))],
-                    [{ content: "EBIT", styles: { fontStyle: 'bold' as const } },
-                    { content: formatMoney(0), styles: { fontStyle: 'bold' as const } },
-                    ...projections.map((p: ForecastPeriod) => ({ content: formatMoney(p.ebit_cents), styles: { fontStyle: 'bold' as const } }))],
-                    ["Tax", formatMoney(0), ...projections.map((p: ForecastPeriod) => formatMoney(-p.tax_cents))],
-                    [{ content: "Net Income", styles: { fontStyle: 'bold' as const } },
-                    { content: formatMoney(actuals.net_income_cents), styles: { fontStyle: 'bold' as const } },
-                    ...projections.map((p: ForecastPeriod) => ({ content: formatMoney(p.net_income_cents), styles: { fontStyle: 'bold' as const } }))],
-                ],
-                theme: 'grid',
-                headStyles: { fillColor: [30, 41, 59], textColor: 255, halign: 'center' },
-                columnStyles: { 0: { cellWidth: 50 } },
-                styles: { fontSize: 9, halign: 'right' },
-                didParseCell: (hookData) => {
-                    if (hookData.section === 'body' && hookData.column.index === 0) {
-                        hookData.cell.styles.halign = 'left';
-                    }
-                }
-            });
-            lastY = ((doc as unknown) as { lastAutoTable: { finalY: number } }).lastAutoTable.finalY + 15;
-        }
+        const params = new URLSearchParams({
+            scenario,
+            include_is: selection.is.toString(),
+            include_bs: selection.bs.toString(),
+            include_cf: selection.cf.toString(),
+        });
+        // Both formats are rendered by the backend from the same statement data
+        const extension = format === "excel" ? "xlsx" : "pdf";
 
-        // --- BALANCE SHEET ---
-        if (selection.bs) {
-            autoTable(doc, {
-                startY: lastY,
-                head: [tableHeaders],
-                body: [
-                    ["Total Assets", formatMoney(actuals.total_assets_cents || 0), ...projections.map(() => "—")],
-                    ["Total Liabilities", formatMoney(actuals.total_liabilities_cents || 0), ...projections.map(() => "—")],
-                    ["Total Equity", formatMoney(actuals.total_equity_cents || 0), ...projections.map(() => "—")],
-                ],
-                theme: 'grid',
-                headStyles: { fillColor: [15, 23, 42], textColor: 255, halign: 'center' },
-                columnStyles: { 0: { cellWidth: 50 } },
-                styles: { fontSize: 9, halign: 'right' },
-                didParseCell: (hookData) => {
-                    if (hookData.section === 'body' && hookData.column.index === 0) {
-                        hookData.cell.styles.halign = 'left';
-                    }
-                }
+        try {
+            const response = await api.get(`/companies/${companyId}/export/${format}?${params.toString()}`, {
+                responseType: 'blob'
             });
-            lastY = ((doc as unknown) as { lastAutoTable: { finalY: number } }).lastAutoTable.finalY + 15;
-        }
 
-        // --- CASH FLOW STATEMENT ---
-        if (selection.cf) {
-            autoTable(doc, {
-                startY: lastY,
-                head: [tableHeaders],
-                body: [
-                    ["Net Income", formatMoney(actuals.net_income_cents), ...projections.map((p: ForecastPeriod) => formatMoney(p.net_income_cf_cents))],
-                    ["D&A", formatMoney(0), ...projections.map((p: ForecastPeriod) => formatMoney(p.da_cents))],
-                    ["Δ Net Working Capital", formatMoney(0), ...projections.map((p: ForecastPeriod) => formatMoney(p.delta_wc_cents))],
-                    [{ content: "Cash from Operations", styles: { fontStyle: 'bold' } },
-                    { content: formatMoney(0), styles: { fontStyle: 'bold' } },
-                    ...projections.map((p: ForecastPeriod) => ({ content: formatMoney(p.net_cash_from_operations_cents), styles: { fontStyle: 'bold' } }))],
-                    ["CapEx", formatMoney(0), ...projections.map((p: ForecastPeriod) => formatMoney(-p.capex_cents))],
-                    [{ content: "Cash from Investing", styles: { fontStyle: 'bold' } },
-                    { content: formatMoney(0), styles: { fontStyle: 'bold' } },
-                    ...projections.map((p: ForecastPeriod) => ({ content: formatMoney(p.net_cash_from_investing_cents), styles: { fontStyle: 'bold' } }))],
-                    [{ content: "Cash from Financing", styles: { fontStyle: 'bold' } },
-                    { content: formatMoney(0), styles: { fontStyle: 'bold' } },
-                    ...projections.map((p: ForecastPeriod) => ({ content: formatMoney(p.net_cash_from_financing_cents), styles: { fontStyle: 'bold' } }))],
-                    ["Beginning Cash", formatMoney(actuals.cash_cents), ...projections.map((p: ForecastPeriod) => formatMoney(p.beginning_cash_cents))],
-                    [{ content: "Ending Cash", styles: { fontStyle: 'bold' } },
-                    { content: formatMoney(actuals.cash_cents), styles: { fontStyle: 'bold' } },
-                    ...projections.map((p: ForecastPeriod) => ({ content: formatMoney(p.ending_cash_cents), styles: { fontStyle: 'bold' } }))],
-                ],
-                theme: 'grid',
-                headStyles: { fillColor: [30, 41, 59], textColor: 255, halign: 'center' },
-                columnStyles: { 0: { cellWidth: 50 } },
-                styles: { fontSize: 9, halign: 'right' },
-                didParseCell: (hookData) => {
-                    if (hookData.section === 'body' && hookData.column.index === 0) {
-                        hookData.cell.styles.halign = 'left';
-                    }
-                }
-            });
+            await downloadFile(
+                response.data,
+                `${scenario}_forecast.${extension}`,
+                extension
+            );
+        } catch (err) {
+            console.error(`${format.toUpperCase()} export failed`, err);
+            alert(`Failed to export ${format === "excel" ? "Excel" : "PDF"}. Please try again.`);
         }
-
-        const pdfData = doc.output('arraybuffer');
-        await downloadFile(
-            new Uint8Array(pdfData), 
-            `${metadata.filename}.pdf`, 
-            "pdf"
-        );
+        setIsExportModalOpen(false);
     };
 
     const projections = forecast?.projections ?? [];
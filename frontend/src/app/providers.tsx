@@ -1,7 +1,51 @@
 "use client";
 
-import { QueryClient, QueryClientProvider } from "@tanstack/react-query";
-import { useState } from "react";
+import { QueryClient, QueryClientProvider, useQuery, useQueryClient } from "@tanstack/react-query";
+import { useEffect, useState } from "react";
+import { CompanyEvent, getCompanies, subscribeCompanyEvents } from "@/lib/api";
+
+// Statement queries keyed by a list of periods, refetched only when it overlaps the change
+const PERIOD_QUERIES = ["income-statement", "balance-sheet", "cash-flow"];
+
+function CompanyEventsListener() {
+    const queryClient = useQueryClient();
+    const { data: companies } = useQuery({
+        queryKey: ["companies"],
+        queryFn: getCompanies
+    });
+    const companyId: string | undefined = companies?.[0]?.id;
+
+    useEffect(() => {
+        if (!companyId) return;
+        return subscribeCompanyEvents(companyId, (event: CompanyEvent) => {
+            if (event.type === "resync") {
+                queryClient.invalidateQueries();
+                return;
+            }
+            if (event.type === "forecast_updated") {
+                queryClient.invalidateQueries({ queryKey: ["forecast-config", companyId, event.scenario] });
+                queryClient.invalidateQueries({ queryKey: ["forecast-statements", companyId, event.scenario] });
+                queryClient.invalidateQueries({ queryKey: ["dashboard-summary", companyId, event.scenario] });
+                return;
+            }
+
+            // Ledger changes: period list, mapping worklist, forecasts and the dashboard
+            const changed = new Set(event.periods);
+            queryClient.invalidateQueries({ queryKey: ["periods", companyId] });
+            queryClient.invalidateQueries({ queryKey: ["unmapped", companyId] });
+            queryClient.invalidateQueries({ queryKey: ["forecast-statements", companyId] });
+            queryClient.invalidateQueries({ queryKey: ["dashboard-summary", companyId] });
+            queryClient.invalidateQueries({
+                predicate: ({ queryKey }) =>
+                    PERIOD_QUERIES.includes(queryKey[0] as string)
+                    && queryKey[1] === companyId
+                    && ((queryKey[2] as string[] | undefined) ?? []).some(p => changed.has(p)),
+            });
+        });
+    }, [companyId, queryClient]);
+
+    return null;
+}
 
 export function Providers({ children }: { children: React.ReactNode }) {
     const [queryClient] = useState(
@@ -17,6 +61,7 @@ export function Providers({ children }: { children: React.ReactNode }) {
 
     return (
         <QueryClientProvider client={queryClient}>
+            <CompanyEventsListener />
             {children}
         </QueryClientProvider>
     );
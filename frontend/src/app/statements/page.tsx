@@ -6,8 +6,6 @@ import { getPeriods, getIncomeStatement, getBalanceSheet, getCashFlow, getCompan
 import { StatementResult, BalanceSheetResult, CashFlowResult } from "@/types";
 import { formatCurrency } from "@/lib/utils";
 import { Building2, Calendar as CalendarIcon, FileText, Scale, TrendingUp, AlertCircle, CheckSquare, Square, Share, Loader2 } from "lucide-react";
-import jsPDF from "jspdf";
-import autoTable from "jspdf-autotable";
 import ExportModal from "@/components/features/export/ExportModal";
 import { downloadFile } from "@/lib/download";
 
@@ -64,148 +62,30 @@ export default function StatementsPage() {
     });
 
     const handleExport = async (format: "excel" | "pdf", selection: { is: boolean; bs: boolean; cf: boolean }) => {
-        if (format === "excel") {
-            const params = new URLSearchParams({
-                periods: selectedPeriods.join(","),
-                include_is: selection.is.toString(),
-                include_bs: selection.bs.toString(),
-                include_cf: selection.cf.toString(),
+        const params = new URLSearchParams({
+            periods: selectedPeriods.join(","),
+            include_is: selection.is.toString(),
+            include_bs: selection.bs.toString(),
+            include_cf: selection.cf.toString(),
+        });
+        // Both formats are rendered by the backend from the same statement data
+        const extension = format === "excel" ? "xlsx" : "pdf";
+
+        try {
+            const response = await api.get(`/companies/${companyId}/export/actuals/${format}?${params.toString()}`, {
+                responseType: 'blob'
             });
-            
-            try {
-                const response = await api.get(`/companies/${companyId}/export/actuals/excel?${params.toString()}`, {
-                    responseType: 'blob'
-                });
-                
-                await downloadFile(
-                    response.data, 
-                    "financial_statements.xlsx", 
-                    "xlsx"
-                );
-            } catch (err) {
-                console.error("Excel export failed", err);
-                alert("Failed to export Excel. Please try again.");
-            }
-        } else {
-            await handleExportPDF(selection);
-        }
-        setIsExportModalOpen(false);
-    };
-
-    const handleExportPDF = async (selection: { is: boolean; bs: boolean; cf: boolean }) => {
-        const doc = new jsPDF("landscape");
-
-        const getExportMetadata = () => {
-            const selectedBits: string[] = [];
-            if (selection.is) selectedBits.push("IS");
-            if (selection.bs) selectedBits.push("BS");
-            if (selection.cf) selectedBits.push("CF");
-
-            const mapping: Record<string, string> = {
-                "IS": "Income Statement",
-                "BS": "Balance Sheet",
-                "CF": "Cash Flow"
-            };
-            const names = selectedBits.map(b => mapping[b]);
-
-            if (selectedBits.length === 3) {
-                return { title: "Full Financial Report (Actuals)", filename: "Full_Financial_Report_Actuals" };
-            }
-            if (selectedBits.length === 1) {
-                return { title: `${names[0] || "Financial Statement"} (Actuals)`, filename: `${selectedBits[0]}_Actuals` };
-            }
-
-            return {
-                title: `${names.join(" & ") || "Financial Report"} (Actuals)`,
-                filename: `${selectedBits.join("_")}_Actuals`
-            };
-        };
-
-        const metadata = getExportMetadata();
-
-        const formatMoney = (cents: number): string => {
-            const value = cents / 100;
-            const formatted = new Intl.NumberFormat('en-US', {
-                style: 'currency',
-                currency: currency,
-                minimumFractionDigits: 0,
-                maximumFractionDigits: 0,
-            }).format(Math.abs(value));
-
-            return value < 0 ? `(${formatted})` : formatted;
-        };
-
-        doc.setFontSize(20);
-        doc.text(metadata.title, 14, 22);
-        doc.setFontSize(10);
-        doc.setTextColor(100, 100, 100);
-        doc.text(`Generated on ${new Date().toLocaleString()}`, 14, 30);
 
-        const tableHeaders = ["Metric", ...selectedPeriods];
-        let lastY = 40;
-
-        if (selection.is) {
-            autoTable(doc, {
-                startY: lastY,
-                head: [tableHeaders],
-                body: [
-                    ["Total Revenues", ...incomeStatement.map(s => formatMoney(s.total_revenues_cents))],
-                    ["Total Expenses", ...incomeStatement.map(s => formatMoney(-s.total_expenses_cents))],
-                    [{ content: "Net Income", styles: { fontStyle: 'bold' as const } },
-                    ...incomeStatement.map(s => ({ content: formatMoney(s.net_income_cents), styles: { fontStyle: 'bold' as const } }))]
-                ],
-                theme: 'grid',
-                headStyles: { fillColor: [30, 41, 59] },
-                styles: { halign: 'right' },
-                didParseCell: (d) => { if (d.column.index === 0) d.cell.styles.halign = 'left'; }
-            });
-            lastY = ((doc as unknown) as { lastAutoTable: { finalY: number } }).lastAutoTable.finalY + 15;
-        }
-
-        if (selection.bs) {
-            autoTable(doc, {
-                startY: lastY,
-                head: [tableHeaders],
-                body: [
-                    ["Total Assets", ...balanceSheet.map(s => formatMoney(s.total_assets_cents))],
-                    ["Total Liabilities", ...balanceSheet.map(s => formatMoney(-s.total_liabilities_cents))],
-                    ["Total Equity", ...balanceSheet.map(s => formatMoney(-s.total_equity_cents))],
-                    [{ content: "Liab + Equity", styles: { fontStyle: 'bold' as const } },
-                    ...balanceSheet.map(s => ({ content: formatMoney(s.total_liabilities_cents + s.total_equity_cents), styles: { fontStyle: 'bold' as const } }))]
-                ],
-                theme: 'grid',
-                headStyles: { fillColor: [15, 23, 42] },
-                styles: { halign: 'right' },
-                didParseCell: (d) => { if (d.column.index === 0) d.cell.styles.halign = 'left'; }
-            });
-            lastY = ((doc as unknown) as { lastAutoTable: { finalY: number } }).lastAutoTable.finalY + 15;
+            await downloadFile(
+                response.data,
+                `financial_statements.${extension}`,
+                extension
+            );
+        } catch (err) {
+            console.error(`${format.toUpperCase()} export failed`, err);
+            alert(`Failed to export ${format === "excel" ? "Excel" : "PDF"}. Please try again.`);
         }
-
-        if (selection.cf) {
-            autoTable(doc, {
-                startY: lastY,
-                head: [tableHeaders],
-                body: [
-                    ["Net Income", ...cashFlow.map(s => formatMoney(s.net_income_cents))],
-                    ["Net Cash from Ops", ...cashFlow.map(s => formatMoney(s.net_cash_from_operations_cents))],
-                    ["Net Cash from Investing", ...cashFlow.map(s => formatMoney(s.net_cash_from_investing_cents))],
-                    ["Net Cash from Financing", ...cashFlow.map(s => formatMoney(s.net_cash_from_financing_cents))],
-                    [{ content: "Ending Cash", styles: { fontStyle: 'bold' as const } },
-                    ...cashFlow.map(s => ({ content: formatMoney(s.ending_cash_cents), styles: { fontStyle: 'bold' as const } }))]
-                ],
-                theme: 'grid',
-                headStyles: { fillColor: [5, 150, 105] },
-                styles: { halign: 'right' },
-                didParseCell: (d) => { if (d.column.index === 0) d.cell.styles.halign = 'left'; }
-            });
-        }
-
-        const pdfData = doc.output('arraybuffer');
-        await downloadFile(
-            new Uint8Array(pdfData), 
-            `${metadata.filename}.pdf`, 
-            "pdf"
-        );
+        setIsExportModalOpen(false);
     };
 
     const hasUnmapped = balanceSheet.some(bs => bs.unmapped_balance_cents !== 0);
@@ -101,6 +101,14 @@ export interface ForecastConfigPayload {
     capex_cents: number;
     da_cents: number;
     wc_pct_of_revenue: number;
+    interest_rate_pct?: number;
+    debt_repayment_cents?: number;
+    revolver_limit_cents?: number;
+    revolver_rate_pct?: number;
+    min_cash_cents?: number;
+    driver_curves?: Record<string, number[]>;
+    // Rebase onto each new TB upload: keep num_periods, or project to the fiscal year end
+    rolling_mode?: "window" | "fiscal_year" | null;
 }
 
 export const getForecastConfig = async (companyId: string, scenario: string = "base") => {
@@ -127,3 +135,197 @@ export const getDashboardSummary = async (companyId: string, scenario: string =
     const { data } = await api.get(`/companies/${companyId}/dashboard/summary?scenario=${scenario}`);
     return data;
 };
+
+export interface FinancialRatios {
+    periods: string[];
+    units: Record<string, "pct" | "x" | "days" | "months" | "cents">;
+    ratios: Record<string, (number | null)[]>;  // null = undefined for that period
+    elapsed_ms: number;
+}
+
+export const getFinancialRatios = async (companyId: string, range: { start?: string; end?: string } = {}) => {
+    const params = new URLSearchParams();
+    if (range.start) params.set("start", range.start);
+    if (range.end) params.set("end", range.end);
+    const { data } = await api.get(`/companies/${companyId}/dashboard/ratios?${params}`);
+    return data as FinancialRatios;
+};
+
+export interface DriverDistribution {
+    distribution: "fixed" | "normal" | "uniform" | "triangular";
+    mean?: number;
+    std?: number;
+    low?: number;
+    high?: number;
+    mode?: number;
+    per_period?: boolean;
+}
+
+export const simulateForecast = async (companyId: string, request: { scenario?: string, num_paths?: number, num_periods?: number, seed?: number, drivers: Record<string, DriverDistribution> }) => {
+    const { data } = await api.post(`/companies/${companyId}/forecast/simulate`, request);
+    return data;
+};
+
+export interface SensitivityAxis {
+    driver: string;
+    values: number[];
+}
+
+export const getForecastSensitivity = async (companyId: string, request: { scenario?: string, x: SensitivityAxis, y?: SensitivityAxis, output?: string, period?: number, tornado_pct?: number }) => {
+    const { data } = await api.post(`/companies/${companyId}/forecast/sensitivity`, request);
+    return data;
+};
+
+export const goalSeekForecast = async (companyId: string, request: { scenario?: string, driver: string, output?: string, aggregate?: "at" | "min" | "max", period?: number, constraint?: ">=" | "<=" | "==", target_cents?: number, low?: number, high?: number }) => {
+    const { data } = await api.post(`/companies/${companyId}/forecast/goal-seek`, request);
+    return data;
+};
+
+export const compareForecastScenarios = async (companyId: string, baseline: string = "base") => {
+    const { data } = await api.get(`/companies/${companyId}/forecast/compare?baseline=${baseline}`);
+    return data;
+};
+
+// Live what-if: projects unsaved drivers without persisting them. Reuse one sessionId per
+// editing session so the backend only recomputes from the first changed month.
+export const previewForecast = async (companyId: string, config: ForecastConfigPayload, sessionId?: string) => {
+    const { data } = await api.post(`/companies/${companyId}/forecast/preview`, { ...config, session_id: sessionId });
+    return data;
+};
+
+// Drivers proposed from a trend + seasonal fit of the uploaded history;
+// `proposed_config` can be saved directly with saveForecastConfig.
+export const getForecastBaseline = async (companyId: string, numPeriods: number = 12, through?: string) => {
+    const params = new URLSearchParams({ num_periods: String(numPeriods) });
+    if (through) params.set("through", through);
+    const { data } = await api.get(`/companies/${companyId}/forecast/baseline?${params}`);
+    return data;
+};
+
+// Month-end pack: every selected company's actuals and scenario forecasts in one ZIP.
+// Poll getBatchExport until status is "completed", then fetch its download_url.
+export interface BatchExportRequest {
+    company_ids?: string[];
+    scenarios?: string[] | null;
+    include_forecasts?: boolean;
+    include_actuals?: boolean;
+    periods?: string[] | null;
+    include_is?: boolean;
+    include_bs?: boolean;
+    include_cf?: boolean;
+}
+
+export const startBatchExport = async (request: BatchExportRequest) => {
+    const { data } = await api.post(`/exports/batch`, request);
+    return data;
+};
+
+export const getBatchExport = async (jobId: string) => {
+    const { data } = await api.get(`/exports/batch/${jobId}`);
+    return data;
+};
+
+export const downloadBatchExport = async (jobId: string) => {
+    const { data } = await api.get(`/exports/batch/${jobId}/download`, { responseType: "blob" });
+    return data as Blob;
+};
+
+// Account-level ledger dump (TB rows joined to accounts, mappings and periods).
+// Parquet is written with pyarrow (pinned in the backend requirements); a
+// backend installed without it answers 501.
+export const exportLedger = async (
+    format: "csv" | "jsonl" | "parquet" = "csv",
+    companyIds: string[] = [],
+    range: { start?: string; end?: string } = {}
+) => {
+    const params = new URLSearchParams({ format });
+    companyIds.forEach(id => params.append("company_id", id));
+    if (range.start) params.set("start", range.start);
+    if (range.end) params.set("end", range.end);
+    const { data } = await api.get(`/ledger/export?${params}`, { responseType: "blob" });
+    return data as Blob;
+};
+
+// Live change feed (Server-Sent Events). `periods` lists the months whose
+// statements changed; balances are cumulative, so uploads and deletions also
+// list every later month.
+export interface CompanyEvent {
+    id: number;
+    type: "period_uploaded" | "period_deleted" | "mappings_changed" | "forecast_updated" | "resync";
+    company_id: string;
+    periods: string[];
+    scenario?: string;
+}
+
+export const subscribeCompanyEvents = (companyId: string, onEvent: (event: CompanyEvent) => void) => {
+    // EventSource reconnects by itself after a dropped connection
+    const source = new EventSource(`${API_URL}/companies/${companyId}/events`);
+    const types: CompanyEvent["type"][] = ["period_uploaded", "period_deleted", "mappings_changed", "forecast_updated", "resync"];
+    types.forEach(type =>
+        source.addEventListener(type, (message) => onEvent(JSON.parse((message as MessageEvent).data)))
+    );
+    return () => source.close();
+};
+
+export interface ConsolidationGroupPayload {
+    name: string;
+    parent_company_id: string;
+    members: { company_id: string; ownership_pct: number }[];   // basis points: 10000 = wholly owned
+    intercompany_pairs: {
+        company_id: string;
+        account_number: string;
+        counterparty_company_id: string;
+        counterparty_account_number: string;
+    }[];
+}
+
+export const getConsolidationGroups = async () => {
+    const { data } = await api.get(`/consolidation-groups`);
+    return data;
+};
+
+export const saveConsolidationGroup = async (group: ConsolidationGroupPayload, groupId?: string) => {
+    const { data } = groupId
+        ? await api.put(`/consolidation-groups/${groupId}`, group)
+        : await api.post(`/consolidation-groups`, group);
+    return data;
+};
+
+export const deleteConsolidationGroup = async (groupId: string) => {
+    const { data } = await api.delete(`/consolidation-groups/${groupId}`);
+    return data;
+};
+
+// Amounts are in `currency` (default: the parent's); other members are translated with the stored FX rates
+export const getConsolidatedStatements = async (groupId: string, periods: string[] = [], includeMembers = false, currency?: string) => {
+    const params = new URLSearchParams({ include_members: String(includeMembers) });
+    periods.forEach(p => params.append("periods", p));
+    if (currency) params.set("currency", currency);
+    const { data } = await api.get(`/consolidation-groups/${groupId}/statements?${params}`);
+    return data;
+};
+
+// 1 base = rate quote; the inverse pair is derived, so store each pair once
+export interface FxRate {
+    base_currency: string;
+    quote_currency: string;
+    period_date: string;
+    closing_rate: number;
+    average_rate: number;
+}
+
+export const getFxRates = async (filter: { base_currency?: string; quote_currency?: string; start?: string; end?: string } = {}) => {
+    const params = new URLSearchParams(Object.entries(filter).filter(([, v]) => v) as [string, string][]);
+    const { data } = await api.get(`/fx-rates?${params}`);
+    return data as (FxRate & { id: string })[];
+};
+
+export const saveFxRates = async (rates: FxRate[]) => {
+    const { data } = await api.put(`/fx-rates`, rates);
+    return data as (FxRate & { id: string })[];
+};
+
+export const deleteFxRate = async (rateId: string) => {
+    const { data } = await api.delete(`/fx-rates/${rateId}`);
+    return data;
+};